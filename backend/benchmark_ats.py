@@ -0,0 +1,86 @@
+"""Benchmark ATS similarity: per-request TfidfVectorizer fit vs. pairwise IDF vs. pre-fitted corpus/hashing IDF"""
+
+import os
+import random
+import time
+import tracemalloc
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from services.ats_batch import top_k_jobs
+from services.ats_engine import _tfidf_similarity
+from services.ats_vectorizer import fit_idf_model, set_idf_model
+from services.resume_document import CRITICAL_KEYWORDS, build_document
+
+random.seed(7)
+FILLER = ("team project system data service platform users production design delivery "
+          "performance customers pipeline reliability features release quality").split()
+
+
+def make_text(words: int) -> str:
+    vocab = list(CRITICAL_KEYWORDS) + FILLER
+    return " ".join(random.choice(vocab) for _ in range(words))
+
+
+resumes = [make_text(500) for _ in range(200)]
+jobs = [make_text(150) for _ in range(20)]
+pairs = [(resumes[i], jobs[i % len(jobs)]) for i in range(len(resumes))]
+
+
+def per_request_fit(resume: str, job: str) -> float:
+    vectorizer = TfidfVectorizer(stop_words="english", ngram_range=(1, 2))
+    vectors = vectorizer.fit_transform([resume, job])
+    return float(cosine_similarity(vectors[0:1], vectors[1:2])[0][0])
+
+
+def timed(label: str, fn):
+    started = time.perf_counter()
+    for resume, job in pairs:
+        fn(resume, job)
+    ms = (time.perf_counter() - started) * 1000 / len(pairs)
+    print(f"   {label:<34} {ms:8.3f} ms/pair")
+    return ms
+
+
+# Documents are built once per request anyway (shared by every scorer), so only
+# the similarity itself is timed for the fit-free variants
+documents = {text: build_document(text, skills=[]) for text in resumes + jobs}
+
+
+def transform_only(resume: str, job: str) -> float:
+    return _tfidf_similarity(documents[resume], documents[job])
+
+
+print("=" * 60)
+print(f"ATS SIMILARITY BENCHMARK ({len(pairs)} resume/JD pairs)")
+print("=" * 60)
+
+baseline = timed("TfidfVectorizer fit per request", per_request_fit)
+timed("document build (tokens + terms)", lambda resume, job: build_document(resume, skills=[]))
+
+for label, model in (
+    ("pairwise IDF (no fit)", None),
+    ("corpus IDF (transform only)", fit_idf_model(resumes + jobs)),
+    ("hashing IDF (transform only)", fit_idf_model(resumes + jobs, hashing=True))
+):
+    set_idf_model(model)
+    ms = timed(label, transform_only)
+    print(f"   {'':<34} {baseline / ms:8.1f}x faster than per-request fit")
+
+set_idf_model(None)
+
+# Batch engine: N resumes x M job descriptions through sparse products
+size = int(os.getenv("BENCH_BATCH_SIZE", "2000"))
+batch_resumes = [build_document(make_text(random.randint(200, 800)), skills=[]) for _ in range(size)]
+batch_jobs = [build_document(make_text(random.randint(50, 200)), skills=[]) for _ in range(size)]
+
+print(f"\n   Batch top-10 for {size} x {size} pairs")
+tracemalloc.start()
+started = time.perf_counter()
+top_k_jobs(batch_resumes, batch_jobs, k=10)
+elapsed = time.perf_counter() - started
+peak = tracemalloc.get_traced_memory()[1]
+tracemalloc.stop()
+print(f"   {'sparse batch engine':<34} {elapsed * 1e6 / size ** 2:8.3f} us/pair "
+      f"({elapsed:.1f} s, peak {peak / 1024 / 1024:.0f} MB)")
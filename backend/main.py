@@ -1,21 +1,35 @@
-from fastapi import FastAPI, UploadFile, Form, File, Body, HTTPException
+from fastapi import FastAPI, UploadFile, Form, File, Body, HTTPException, WebSocket, WebSocketDisconnect, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Optional, Dict
-import pandas as pd
-
-from services.resume_parser import extract_text, extract_skills
-from services.ats_engine import calculate_ats
-from services.job_matcher import match_jobs
-from services.skill_gap import find_gap
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
+from typing import List, Optional, Dict, Union
+
+from services.resume_cache import parse_resume_async, cache_stats as resume_cache_stats
+from services.ats_engine import job_cache_stats, job_tfidf_weights, prepare_job_description, score_resume
+from services.ats_session import SessionNotFound, create_session, update_session, session_score, close_session
+from services.resume_document import tokenize
+from services.job_matcher import match_jobs, rank_jobs_page
+from services.job_catalog import get_catalog, reload_catalog, append_jobs, catalog_status
+from services.bulk_matcher import BULK_MATCH_CHUNK_CANDIDATES, BULK_MATCH_MAX_CANDIDATES, match_candidates, match_matrix
+from services.skill_gap import find_gap, gap_cache_stats
+from services.learning_planner import plan_learning
 from services.career_advisor import generate_feedback
+from services.batch_screening import spool_batch_uploads, screen_resumes
+from services.upload_ingest import UploadRejected, ingest_upload_async
+from services.execution import get_io_pool, run_cpu, run_io, execution_stats, shutdown as shutdown_executors
 from services.cover_letter_generator import generate_cover_letter, generate_custom_cover_letter
 from services.interview_prep import generate_interview_questions, generate_interview_tips, generate_answer_framework
 from services.salary_negotiator import get_salary_insights, generate_negotiation_email, compare_offers
 from services.job_search import search_jobs, search_internships, match_jobs_to_skills, get_application_tips
 from models.role_classifier import predict_role
 
-import os
+import itertools
+import json
+import numpy as np
+import pandas as pd
+import tempfile
+import threading
+import zipfile
 
 app = FastAPI(
     title="AI Job Application Assistant",
@@ -66,22 +80,55 @@ class JobSearchRequest(BaseModel):
     job_type: Optional[str] = ""
     experience_level: Optional[str] = ""
 
+class JobRankRequest(BaseModel):
+    skills: List[str]
+    experience_years: int = 0
+    min_salary: Optional[float] = None
+    max_salary: Optional[float] = None
+    min_experience: Optional[float] = None
+    max_experience: Optional[float] = None
+    role_families: Optional[List[str]] = None
+    locations: Optional[List[str]] = None
+    page: int = 1
+    page_size: int = 20
+
+class BulkCandidate(BaseModel):
+    id: Optional[str] = None
+    skills: List[str]
+    experience_years: int = 0
+
+class BulkMatchRequest(BaseModel):
+    candidates: Optional[List[BulkCandidate]] = None
+    # Matrix form: one row per candidate, one column per entry of skill_names
+    skill_names: Optional[List[str]] = None
+    matrix: Optional[List[List[float]]] = None
+    ids: Optional[List[str]] = None
+    experience_years: Optional[List[int]] = None
+    top_k: int = 10
+
+class CatalogJob(BaseModel):
+    role: str
+    skills: Union[List[str], str]
+    salary_lpa: float
+    experience_required: Optional[float] = None
+    role_family: Optional[str] = None
+    location: Optional[str] = None
+
+class CatalogAppendRequest(BaseModel):
+    jobs: List[CatalogJob]
+
+class LearningPlanRequest(BaseModel):
+    skills: List[str]
+    roles: List[str]
+    experience_years: int = 0
+    threshold: Optional[float] = None
+
 class NegotiationEmailRequest(BaseModel):
     current_offer: int
     desired_salary: int
     justification: str
 
 
-# Data
-BASE_DIR = os.path.dirname(__file__)
-DATA_PATH = os.path.join(BASE_DIR, "jobs_dataset.csv")
-
-try:
-    jobs_df = pd.read_csv(DATA_PATH)
-except:
-    jobs_df = pd.DataFrame()  # Empty dataframe if file not found
-
-
 # =============== API ENDPOINTS ===============
 
 @app.get("/")
@@ -91,15 +138,46 @@ async def root():
         "version": "2.0",
         "endpoints": {
             "resume_analysis": "/analyze",
+            "batch_screening": "/analyze/batch",
+            "ats_sessions": "/ats/sessions",
             "cover_letter": "/cover-letter",
             "interview_prep": "/interview-prep",
             "salary_insights": "/salary-insights",
             "job_search": "/jobs/search",
+            "bulk_job_matching": "/jobs/match/bulk",
+            "learning_plan": "/jobs/plan",
             "internships": "/internships/search"
         }
     }
 
 
+def _match_resume(parsed: Dict, resume_doc, detailed_ats: Dict) -> Dict:
+    """Role prediction, job matches and skill gap of /analyze"""
+    skills = parsed["skills"]
+
+    # Predict role
+    predicted_role = predict_role(skills)
+    print(f"Predicted role: {predicted_role}, ATS Score: {detailed_ats['overall_score']}")
+
+    # Match jobs
+    matches = match_jobs(skills, int(parsed["experience_years"]), top_k=5)
+    best = matches[0] if matches else {"role": predicted_role, "salary": 0, "match_score": 0}
+
+    # Get required skills for role
+    required = get_catalog().role_skills(best["role"])
+
+    # Find skill gap
+    gap = find_gap(resume_doc, required)
+    print(f"Skill gap: {gap}")
+
+    return {
+        "predicted_role": predicted_role,
+        "matches": matches,
+        "best": best,
+        "gap": gap
+    }
+
+
 @app.post("/analyze")
 async def analyze_resume(
     file: UploadFile = File(...),
@@ -107,16 +185,21 @@ async def analyze_resume(
 ):
     """Analyze resume against job description with comprehensive AI feedback"""
     try:
-        # Extract text from resume
-        text = extract_text(file.file)
+        # Spool and validate the upload before parsing (content-addressed, so
+        # re-uploads of the same PDF skip parsing)
+        try:
+            async with ingest_upload_async(file) as upload:
+                parsed = await parse_resume_async(upload.path)
+        except UploadRejected as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+        text = parsed["text"]
         if not text or len(text) < 50:
             return {
                 "error": "Unable to extract text from resume",
                 "suggestion": "Please ensure your PDF is readable and contains text (not just images)"
             }
         
-        # Extract skills
-        skills = extract_skills(text)
+        skills = parsed["skills"]
         print(f"Extracted {len(skills)} skills: {skills}")
 
         if not skills:
@@ -129,63 +212,165 @@ async def analyze_resume(
                 }
             }
 
-        # Predict role and calculate ATS score
-        predicted_role = predict_role(skills)
-        ats = calculate_ats(text, job_description)
-        print(f"Predicted role: {predicted_role}, ATS Score: {ats}")
-
-        # Match jobs
-        matches = match_jobs(skills)
-        best = matches[0] if matches else {"role": predicted_role, "salary": 0, "match_score": 0}
-
-        # Get required skills for role
-        required = []
-        if not jobs_df.empty and best["role"] in jobs_df["role"].values:
-            role_data = jobs_df[jobs_df["role"] == best["role"]]
-            if not role_data.empty and "skills" in role_data.columns:
-                skills_str = role_data["skills"].values[0]
-                if isinstance(skills_str, str):
-                    required = [s.strip() for s in skills_str.split(",")]
-        
-        # Find skill gap
-        gap = find_gap(skills, required)
-        print(f"Skill gap: {gap}")
+        # The job side comes from this process's JD cache, so a hot posting costs
+        # nothing; only the resume side is scored on the process pool. Matching
+        # reads this worker's job catalog snapshot, so it stays on a thread
+        job_doc = await run_io("score", prepare_job_description, job_description)
+        resume_doc, detailed_ats = await run_cpu(
+            "score", score_resume, text, skills, job_doc, job_tfidf_weights(job_doc)
+        )
+        scored = await run_io("score", _match_resume, parsed, resume_doc, detailed_ats)
+        best = scored["best"]
+        ats = detailed_ats["overall_score"]
         
         # Generate AI-powered comprehensive feedback
-        feedback = generate_feedback(
+        feedback = await run_io(
+            "llm",
+            generate_feedback,
             skills=skills,
             role=best["role"],
-            missing_skills=gap,
+            missing_skills=scored["gap"],
             ats_score=ats,
-            resume_text=text,
-            job_description=job_description
+            resume_text=resume_doc,
+            job_description=job_doc,
+            detailed_ats=detailed_ats
         )
 
         return {
             "skills": skills,
-            "predicted_role": predicted_role,
+            "predicted_role": scored["predicted_role"],
             "recommended_role": best["role"],
             "ats_score": ats,
-            "missing_skills": gap,
+            "missing_skills": scored["gap"],
             "salary_estimate_lpa": best.get("salary", 0),
-            "top_job_matches": matches[:5],
+            "top_job_matches": scored["matches"][:5],
             "feedback": feedback,
+            "contact_info": parsed["contact_info"],
             "resume_stats": {
-                "total_words": len(text.split()),
+                "total_words": resume_doc.signals.word_count,
                 "total_skills": len(skills),
+                "experience_years": parsed["experience_years"],
                 "experience_level": "Entry" if len(skills) < 5 else "Mid" if len(skills) < 10 else "Senior"
             }
         }
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error in analyze_resume: {type(e).__name__}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
 
+@app.post("/analyze/batch")
+async def analyze_resume_batch(
+    files: List[UploadFile] = File(...),
+    job_description: str = Form(...),
+    include_feedback: bool = Form(False),
+    feedback_limit: int = Form(5)
+):
+    """Screen many resumes (PDFs or zip archives of PDFs) against one job description"""
+    try:
+        with tempfile.TemporaryDirectory(prefix="resume_batch_") as workdir:
+            try:
+                spooled = await run_io("io", spool_batch_uploads, files, workdir)
+            except (ValueError, zipfile.BadZipFile) as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+            if not spooled:
+                raise HTTPException(status_code=400, detail="No PDF resumes found in upload")
+
+            # Parsing inside fans out to the process pool; the stage limit caps
+            # how many batches compete for it at once
+            return await run_io(
+                "batch",
+                screen_resumes,
+                spooled,
+                job_description,
+                include_feedback=include_feedback,
+                feedback_limit=feedback_limit
+            )
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error in analyze_resume_batch: {type(e).__name__}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Batch analysis failed: {str(e)}")
+
+
+def _start_session(resume_text: str, job_description: str) -> Dict:
+    return create_session(resume_text, job_description).score()
+
+
+@app.post("/ats/sessions")
+async def create_ats_session(
+    job_description: str = Form(...),
+    file: Optional[UploadFile] = File(None),
+    resume_text: Optional[str] = Form(None)
+):
+    """Start an editing session: the resume is scored once, later edits re-score incrementally"""
+    if file is not None:
+        try:
+            async with ingest_upload_async(file) as upload:
+                parsed = await parse_resume_async(upload.path)
+        except UploadRejected as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+        resume_text = parsed["text"]
+    if not resume_text or not resume_text.strip():
+        raise HTTPException(status_code=400, detail="Provide a resume file or resume_text")
+    return await run_io("score", _start_session, resume_text, job_description)
+
+
+@app.patch("/ats/sessions/{session_id}")
+async def edit_ats_session(session_id: str, data: Dict = Body(...)):
+    """Apply section edits and return the updated ATS result"""
+    try:
+        return await run_io("score", update_session, session_id, data.get("edits", []))
+    except SessionNotFound:
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/ats/sessions/{session_id}")
+async def get_ats_session(session_id: str):
+    """Current ATS result of a session"""
+    try:
+        return await run_io("score", session_score, session_id)
+    except SessionNotFound:
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+
+
+@app.delete("/ats/sessions/{session_id}")
+async def delete_ats_session(session_id: str):
+    if not close_session(session_id):
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+    return {"deleted": session_id}
+
+
+@app.websocket("/ats/sessions/{session_id}/ws")
+async def ats_session_socket(websocket: WebSocket, session_id: str):
+    """Live re-scoring: each message is {"edits": [...]}, each reply the updated result"""
+    await websocket.accept()
+    try:
+        await websocket.send_json(await run_io("score", session_score, session_id))
+        while True:
+            data = await websocket.receive_json()
+            try:
+                result = await run_io("score", update_session, session_id, data.get("edits", []))
+            except ValueError as e:
+                result = {"error": str(e)}
+            await websocket.send_json(result)
+    except SessionNotFound:
+        await websocket.close(code=4404, reason="Session not found or expired")
+    except WebSocketDisconnect:
+        pass
+
+
 @app.post("/cover-letter")
 async def create_cover_letter(request: CoverLetterRequest):
     """Generate AI-powered cover letter"""
     try:
-        cover_letter = generate_cover_letter(
+        cover_letter = await run_io(
+            "llm",
+            generate_cover_letter,
             job_title=request.job_title,
             company_name=request.company_name,
             job_description=request.job_description,
@@ -223,7 +408,9 @@ async def quick_cover_letter(request: Dict = Body(...)):
         else:
             skills_list = skills
         
-        cover_letter = generate_custom_cover_letter(
+        cover_letter = await run_io(
+            "llm",
+            generate_custom_cover_letter,
             user_name=user_name,
             job_title=job_title,
             company_name=company_name,
@@ -240,13 +427,15 @@ async def quick_cover_letter(request: Dict = Body(...)):
 async def interview_preparation(request: InterviewPrepRequest):
     """Get interview preparation materials"""
     try:
-        questions = generate_interview_questions(
+        questions = await run_io(
+            "llm",
+            generate_interview_questions,
             request.job_title,
             request.job_description,
             request.skills
         )
         
-        tips = generate_interview_tips(request.job_title, request.company_name)
+        tips = await run_io("llm", generate_interview_tips, request.job_title, request.company_name)
         
         return {
             "questions": questions,
@@ -270,7 +459,7 @@ async def get_answer_help(
 ):
     """Get help structuring an answer to a specific interview question"""
     try:
-        framework = generate_answer_framework(question, job_context)
+        framework = await run_io("llm", generate_answer_framework, question, job_context)
         return {"answer_framework": framework}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -280,7 +469,9 @@ async def get_answer_help(
 async def salary_negotiation(request: SalaryRequest):
     """Get salary insights and negotiation strategies"""
     try:
-        insights = get_salary_insights(
+        insights = await run_io(
+            "llm",
+            get_salary_insights,
             job_title=request.job_title,
             location=request.location,
             experience_years=request.experience_years,
@@ -296,7 +487,9 @@ async def salary_negotiation(request: SalaryRequest):
 async def create_negotiation_email(request: NegotiationEmailRequest):
     """Generate salary negotiation email"""
     try:
-        email = generate_negotiation_email(
+        email = await run_io(
+            "llm",
+            generate_negotiation_email,
             current_offer=request.current_offer,
             desired_salary=request.desired_salary,
             justification=request.justification
@@ -311,7 +504,9 @@ async def create_negotiation_email(request: NegotiationEmailRequest):
 async def find_jobs(request: JobSearchRequest):
     """Search for job opportunities"""
     try:
-        jobs = search_jobs(
+        jobs = await run_io(
+            "http",
+            search_jobs,
             keywords=request.keywords,
             location=request.location,
             job_type=request.job_type,
@@ -330,7 +525,7 @@ async def find_jobs(request: JobSearchRequest):
 async def match_jobs_endpoint(skills: List[str] = Body(...)):
     """Match jobs to user skills"""
     try:
-        jobs = search_jobs(keywords=" ".join(skills))
+        jobs = await run_io("http", search_jobs, keywords=" ".join(skills))
         matched_jobs = match_jobs_to_skills(skills, jobs)
         
         return {
@@ -341,6 +536,141 @@ async def match_jobs_endpoint(skills: List[str] = Body(...)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/jobs/rank")
+async def rank_jobs(request: JobRankRequest):
+    """Rank catalog roles for a skill set; filters are applied before scoring"""
+    if request.page < 1 or not 1 <= request.page_size <= 100:
+        raise HTTPException(status_code=400, detail="page must be >= 1 and page_size between 1 and 100")
+    filters = {
+        key: value for key, value in request.model_dump(exclude={"skills", "page", "page_size"}).items()
+        if value is not None
+    }
+    try:
+        ranked = await run_io(
+            "score", rank_jobs_page, request.skills, filters,
+            offset=(request.page - 1) * request.page_size, limit=request.page_size
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "total": ranked["total"],
+        "page": request.page,
+        "page_size": request.page_size,
+        "results": ranked["results"]
+    }
+
+
+@app.post("/jobs/match/bulk")
+async def bulk_match_jobs(request: BulkMatchRequest):
+    """Top-k catalog matches for many candidates, streamed as NDJSON (one line per candidate, in input order)"""
+    if not 1 <= request.top_k <= 100:
+        raise HTTPException(status_code=400, detail="top_k must be between 1 and 100")
+    try:
+        if request.candidates is not None:
+            count = len(request.candidates)
+            ids = [c.id if c.id is not None else str(i) for i, c in enumerate(request.candidates)]
+            if count > BULK_MATCH_MAX_CANDIDATES:
+                raise ValueError(f"Too many candidates in one request (limit {BULK_MATCH_MAX_CANDIDATES})")
+            results = match_candidates(
+                [c.skills for c in request.candidates], [c.experience_years for c in request.candidates], request.top_k
+            )
+        elif request.matrix is not None and request.skill_names is not None:
+            count = len(request.matrix)
+            ids = request.ids if request.ids is not None else [str(i) for i in range(count)]
+            experience = request.experience_years if request.experience_years is not None else [0] * count
+            if count > BULK_MATCH_MAX_CANDIDATES:
+                raise ValueError(f"Too many candidates in one request (limit {BULK_MATCH_MAX_CANDIDATES})")
+            if len(ids) != count or len(experience) != count:
+                raise ValueError("ids and experience_years need one entry per matrix row")
+            if any(len(row) != len(request.skill_names) for row in request.matrix):
+                raise ValueError("Every matrix row needs one value per skill name")
+            results = match_matrix(
+                np.array(request.matrix, dtype=np.float64).reshape(count, len(request.skill_names)),
+                request.skill_names, experience, request.top_k
+            )
+        else:
+            raise ValueError("Provide either candidates or skill_names with matrix")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # The results generator runs on I/O threads; the lock keeps close() from
+    # racing a chunk still being matched when the client goes away
+    results_lock = threading.Lock()
+
+    def next_chunk():
+        with results_lock:
+            return list(itertools.islice(results, BULK_MATCH_CHUNK_CANDIDATES))
+
+    def close_results():
+        with results_lock:
+            results.close()
+
+    async def lines():
+        position = 0
+        try:
+            while True:
+                # Matched a chunk at a time off the event loop; each line is sent as soon as its chunk is done
+                chunk = await run_io("batch", next_chunk)
+                if not chunk:
+                    break
+                for matches in chunk:
+                    yield json.dumps({"id": ids[position], "matches": matches}) + "\n"
+                    position += 1
+        finally:
+            # Also on disconnect: cancels queued chunks and removes the shared snapshot.
+            # Not awaited, since a cancelled stream cannot wait here.
+            get_io_pool().submit(close_results)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@app.post("/jobs/plan")
+async def plan_learning_endpoint(request: LearningPlanRequest):
+    """Fewest learning hours for the candidate to reach a match score threshold on a target role"""
+    if request.threshold is not None and not 0 <= request.threshold <= 100:
+        raise HTTPException(status_code=400, detail="threshold must be between 0 and 100")
+    try:
+        return await run_io(
+            "score", plan_learning, request.skills, request.roles, request.experience_years, request.threshold
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/jobs/catalog")
+async def job_catalog_status():
+    """Size, snapshot generation and build state of the job catalog"""
+    return catalog_status()
+
+
+@app.post("/jobs/catalog/reload", status_code=202)
+async def reload_job_catalog(background_tasks: BackgroundTasks):
+    """Rebuild the catalog from disk in the background; requests keep using the current snapshot until the swap"""
+    background_tasks.add_task(reload_catalog)
+    return {"status": "reloading", **catalog_status()}
+
+
+@app.post("/jobs/catalog/append")
+async def append_job_catalog(data: Dict = Body(...)):
+    """Add jobs ({"jobs": [{"role", "skills", "salary_lpa", "experience_required"?}]}) to the catalog"""
+    try:
+        jobs = CatalogAppendRequest.model_validate(data).jobs
+    except ValidationError as e:
+        error = e.errors()[0]
+        raise HTTPException(status_code=400, detail=f"{'.'.join(map(str, error['loc']))}: {error['msg']}")
+    if not jobs:
+        raise HTTPException(status_code=400, detail="No jobs provided")
+    frame = pd.DataFrame([
+        {**job.model_dump(exclude_none=True), "skills": job.skills if isinstance(job.skills, str) else ",".join(job.skills)}
+        for job in jobs
+    ])
+    try:
+        await run_io("batch", append_jobs, frame)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"status": "appended", "added": len(jobs), **catalog_status()}
+
+
 @app.post("/internships/search")
 async def find_internships(
     keywords: str = Body(...),
@@ -348,7 +678,7 @@ async def find_internships(
 ):
     """Search for internship opportunities"""
     try:
-        internships = search_internships(keywords, location)
+        internships = await run_io("http", search_internships, keywords, location)
         
         return {
             "total_results": len(internships),
@@ -389,7 +719,9 @@ Keep the response between 150-300 words. Use professional but friendly tone."""
         
         system_message = "You are a supportive and knowledgeable career coach. Provide practical advice that helps people succeed in their careers."
         
-        advice = ai_service.generate_completion(
+        advice = await run_io(
+            "llm",
+            ai_service.generate_completion,
             prompt=prompt,
             max_tokens=400,
             temperature=0.7,
@@ -430,22 +762,36 @@ async def career_chat_with_file(
         # Extract text from all files
         all_texts = []
         all_skills = set()
-        file_summaries = []
-        
+        processed_files = []
+
+        rejected = []
+
         for i, uploaded_file in enumerate(all_files):
             try:
-                text = extract_text(uploaded_file.file)
-                if text:
-                    all_texts.append(text)
-                    skills = extract_skills(text)
-                    all_skills.update(skills)
-                    file_summaries.append(f"📄 {uploaded_file.filename}: {len(text)} chars")
+                # Same cached, process-pool parse as /analyze
+                async with ingest_upload_async(uploaded_file) as upload:
+                    parsed = await parse_resume_async(upload.path)
+                if parsed["text"]:
+                    all_texts.append(parsed["text"])
+                    all_skills.update(parsed["skills"])
+                    processed_files.append(uploaded_file.filename)
+            except UploadRejected as e:
+                print(f"Rejected file {i}: {e}")
+                rejected.append(f"{uploaded_file.filename}: {e}")
             except Exception as e:
                 print(f"Error processing file {i}: {e}")
                 continue
 
         if not all_texts:
-            raise HTTPException(status_code=400, detail="Unable to read text from any uploaded files")
+            detail = "Unable to read text from any uploaded files"
+            if rejected:
+                detail += " (" + "; ".join(rejected) + ")"
+            raise HTTPException(status_code=400, detail=detail)
+
+        file_summaries = []
+        for filename, text in zip(processed_files, all_texts):
+            words = len(tokenize(text.lower()))
+            file_summaries.append(f"📄 {filename}: {len(text)} chars, {words} words")
 
         # Combine excerpts (max 2000 chars total for efficiency)
         combined_excerpt = " | ".join(all_texts)[:2500]
@@ -469,7 +815,9 @@ Combined File Content (excerpt):
 Provide a helpful, realistic response grounded in the uploaded files' content. Reference the files where relevant. Avoid placeholders.
 """
 
-        advice = ai_service.generate_completion(
+        advice = await run_io(
+            "llm",
+            ai_service.generate_completion,
             prompt=prompt,
             max_tokens=500,
             temperature=0.6,
@@ -481,7 +829,7 @@ Provide a helpful, realistic response grounded in the uploaded files' content. R
             "response": advice,
             "extracted_skills": list(all_skills)[:25],
             "files_processed": len(all_texts),
-            "file_names": [f.filename for f in all_files[:len(all_texts)]]
+            "file_names": processed_files
         }
     except HTTPException:
         raise
@@ -494,3 +842,20 @@ Provide a helpful, realistic response grounded in the uploaded files' content. R
 async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "service": "AI Job Application Assistant"}
+
+
+@app.get("/health/execution")
+async def execution_health():
+    """Per-stage concurrency limits and queue depth of the execution layer"""
+    return execution_stats()
+
+
+@app.get("/health/cache")
+async def cache_health():
+    """Hit/miss counters of the parsed resume, job description and skill gap caches"""
+    return {"resumes": resume_cache_stats(), "job_descriptions": job_cache_stats(), "skill_gaps": gap_cache_stats()}
+
+
+@app.on_event("shutdown")
+async def stop_executors():
+    shutdown_executors()
@@ -0,0 +1,24 @@
+import argparse
+import os
+import sys
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(script_dir, ".."))
+
+from services.job_catalog import DATA_PATH, JOB_CATALOG_PATH, JobCatalog
+
+# Compile the jobs CSV into the memory-mapped catalog the job matcher opens at startup
+parser = argparse.ArgumentParser(description="Compile jobs_dataset.csv into a memory-mapped job catalog")
+parser.add_argument("csv", nargs="?", default=DATA_PATH, help="Jobs CSV (role, skills, salary_lpa[, experience_required])")
+parser.add_argument("--output", default=JOB_CATALOG_PATH, help="Catalog directory")
+args = parser.parse_args()
+
+started = time.perf_counter()
+catalog = JobCatalog.from_csv(args.csv)
+catalog.save(args.output)
+
+# Reopen to check the written files map cleanly
+catalog = JobCatalog.open(args.output)
+print(f"✅ Compiled {catalog.size} jobs / {len(catalog.vocabulary)} skills into {args.output} "
+      f"in {time.perf_counter() - started:.1f}s")
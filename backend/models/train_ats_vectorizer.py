@@ -0,0 +1,41 @@
+import argparse
+import glob
+import os
+import sys
+
+import pandas as pd
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(script_dir, ".."))
+
+from services.ats_vectorizer import fit_idf_model, save_idf_model
+from services.resume_parser import extract_text
+
+# Fit the ATS IDF model on a corpus of resumes and job descriptions (.txt/.pdf files)
+parser = argparse.ArgumentParser(description="Fit the corpus IDF model used by the ATS engine")
+parser.add_argument("corpus_dirs", nargs="+", help="Directories of resumes / job descriptions")
+parser.add_argument("--hashing", action="store_true", help="Store document frequencies in hashed buckets")
+parser.add_argument("--output", default=os.path.join(script_dir, "ats_idf.pkl"))
+args = parser.parse_args()
+
+
+def iter_corpus():
+    for corpus_dir in args.corpus_dirs:
+        for path in sorted(glob.glob(os.path.join(corpus_dir, "**", "*"), recursive=True)):
+            if path.lower().endswith(".txt"):
+                with open(path, encoding="utf-8", errors="ignore") as f:
+                    yield f.read()
+            elif path.lower().endswith(".pdf"):
+                yield extract_text(path)
+
+    # Role skill lists from the jobs dataset count as short job descriptions
+    jobs_path = os.path.join(script_dir, "../jobs_dataset.csv")
+    if os.path.exists(jobs_path):
+        for skills in pd.read_csv(jobs_path)["skills"]:
+            yield str(skills).replace(",", " ")
+
+
+model = fit_idf_model(iter_corpus(), hashing=args.hashing)
+save_idf_model(model, args.output)
+
+print(f"✅ {model.mode} IDF model fitted on {model.n_docs} documents and saved as {os.path.basename(args.output)}")
@@ -0,0 +1,29 @@
+import argparse
+import os
+import sys
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(script_dir, ".."))
+
+from services.job_catalog import load_catalog
+from services.semantic_index import SKILL_EMBEDDINGS_PATH, fit_skill_embeddings, load_skill_embeddings, save_skill_embeddings
+
+# Fit LSA skill embeddings on the job catalog's skill co-occurrence (no network models)
+parser = argparse.ArgumentParser(description="Fit skill embeddings for semantic job matching")
+parser.add_argument("--dims", type=int, default=32, help="Embedding dimensions")
+parser.add_argument("--output", default=SKILL_EMBEDDINGS_PATH, help="Output .npz file")
+args = parser.parse_args()
+
+started = time.perf_counter()
+catalog = load_catalog()
+skill_lists = [
+    [catalog.vocabulary[column] for column in catalog.indices[catalog.indptr[row]:catalog.indptr[row + 1]].tolist()]
+    for row in range(catalog.size)
+]
+embeddings = fit_skill_embeddings(skill_lists, dims=args.dims)
+save_skill_embeddings(embeddings, args.output)
+
+embeddings = load_skill_embeddings(args.output)
+print(f"✅ Fitted {len(embeddings.names)} skill vectors ({embeddings.dims} dims) on {catalog.size} jobs "
+      f"into {args.output} in {time.perf_counter() - started:.1f}s")
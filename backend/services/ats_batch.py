@@ -0,0 +1,175 @@
+import os
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from .ats_engine import IDF_SINGLE, as_job_document, tfidf_weights
+from .ats_vectorizer import get_idf_model
+from .resume_document import CRITICAL_KEYWORDS, ResumeDocument, as_document
+
+# Resume rows scored per block; the dense block is rows x jobs, so this bounds
+# peak memory (512 x 10k float64 = 40 MB) regardless of the batch size.
+ATS_BATCH_BLOCK_ROWS = int(os.getenv("ATS_BATCH_BLOCK_ROWS", "512"))
+
+_KEYWORD_INDEX = {keyword: i for i, keyword in enumerate(CRITICAL_KEYWORDS)}
+
+
+def score_matrix(resumes: Sequence, jobs: Sequence) -> np.ndarray:
+    """Full N x M matrix of overall ATS scores (same values as calculate_ats per pair)"""
+    resume_docs, job_docs = _documents(resumes, jobs)
+    scores = np.zeros((len(resume_docs), len(job_docs)), dtype=np.float32)
+    for start, block in _score_blocks(resume_docs, job_docs):
+        scores[start:start + len(block)] = block
+    return scores
+
+
+def top_k_jobs(resumes: Sequence, jobs: Sequence, k: int = 10) -> List[List[Tuple[int, float]]]:
+    """For every resume, the k best-scoring (job index, score) pairs, best first"""
+    resume_docs, job_docs = _documents(resumes, jobs)
+    results = []
+    for _, block in _score_blocks(resume_docs, job_docs):
+        top = _top_k_columns(block, k)
+        for row, columns in enumerate(top):
+            results.append([(int(col), float(block[row, col])) for col in columns])
+    return results
+
+
+def top_k_resumes(resumes: Sequence, jobs: Sequence, k: int = 10) -> List[List[Tuple[int, float]]]:
+    """For every job description, the k best-scoring (resume index, score) pairs, best first"""
+    resume_docs, job_docs = _documents(resumes, jobs)
+    k = min(k, len(resume_docs))
+    # Running top-k per job, merged block by block so only k rows are ever kept
+    best_scores = np.full((len(job_docs), 0), -np.inf)
+    best_rows = np.zeros((len(job_docs), 0), dtype=np.int64)
+    for start, block in _score_blocks(resume_docs, job_docs):
+        block_rows = np.broadcast_to(np.arange(start, start + len(block)), block.T.shape)
+        scores = np.hstack([best_scores, block.T])
+        rows = np.hstack([best_rows, block_rows])
+        keep = _top_k_columns(scores, k)
+        best_scores = np.take_along_axis(scores, keep, axis=1)
+        best_rows = np.take_along_axis(rows, keep, axis=1)
+    return [
+        [(int(row), float(score)) for row, score in zip(rows, scores)]
+        for rows, scores in zip(best_rows, best_scores)
+    ]
+
+
+def _documents(resumes: Sequence, jobs: Sequence) -> Tuple[List[ResumeDocument], List[ResumeDocument]]:
+    return [as_document(resume) for resume in resumes], [as_job_document(job) for job in jobs]
+
+
+def _top_k_columns(block: np.ndarray, k: int) -> np.ndarray:
+    """Column indices of the k largest values per row, sorted descending"""
+    k = min(k, block.shape[1])
+    if k <= 0:
+        return np.zeros((block.shape[0], 0), dtype=np.int64)
+    candidates = np.argpartition(-block, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(block, candidates, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(candidates, order, axis=1)
+
+
+def _score_blocks(resume_docs: List[ResumeDocument], job_docs: List[ResumeDocument]) -> Iterator[Tuple[int, np.ndarray]]:
+    """Yield (first row, rows x jobs score block) covering every resume"""
+    if not resume_docs or not job_docs:
+        return
+    model = get_idf_model()
+    vocabulary: Dict[str, int] = {}
+    job_terms, _ = _term_matrix(job_docs, vocabulary, model)
+    job_keywords = _keyword_matrix(job_docs)
+    job_keyword_totals = job_keywords.sum(axis=1)
+
+    if model is None:
+        job_binary = job_terms.copy()
+        job_binary.data[:] = 1.0
+        job_squares = job_terms.multiply(job_terms).tocsr()
+        job_square_totals = np.asarray(job_squares.sum(axis=1)).ravel()
+
+    for start in range(0, len(resume_docs), ATS_BATCH_BLOCK_ROWS):
+        docs = resume_docs[start:start + ATS_BATCH_BLOCK_ROWS]
+        resume_terms, unshared = _term_matrix(docs, vocabulary, model, grow=False)
+
+        if model is not None:
+            # Rows are already L2-normalized TF-IDF vectors: cosine is one product
+            tfidf = (resume_terms @ job_terms.T).toarray()
+        else:
+            tfidf = _pairwise_cosine(resume_terms, unshared, job_terms, job_binary, job_squares, job_square_totals)
+
+        # Keyword ratio: |job keywords & resume keywords| / |job keywords|
+        shared = _keyword_matrix(docs) @ job_keywords.T
+        keyword = np.divide(shared, job_keyword_totals, out=np.zeros_like(shared), where=job_keyword_totals > 0)
+
+        overall = tfidf * 0.60 + keyword * 0.25 + _format_scores(docs)[:, None] * 0.15
+        yield start, np.round(overall * 100, 2)
+
+
+def _pairwise_cosine(resume_terms, resume_unshared, job_terms, job_binary, job_squares, job_square_totals) -> np.ndarray:
+    """
+    Two-document IDF cosine for every pair at once.
+
+    Each pair weighs shared terms by 1 and the rest by s = 1 + ln(1.5), so the
+    norms are s^2 * sum(c^2) - (s^2 - 1) * sum(c^2 over shared terms); the shared
+    sums and the dot product each come from one sparse product.
+    """
+    resume_binary = resume_terms.copy()
+    resume_binary.data[:] = 1.0
+    resume_squares = resume_terms.multiply(resume_terms).tocsr()
+    resume_square_totals = np.asarray(resume_squares.sum(axis=1)).ravel() + resume_unshared
+
+    single = IDF_SINGLE ** 2
+    dot = (resume_terms @ job_terms.T).toarray()
+    resume_norm = single * resume_square_totals[:, None] - (single - 1) * (resume_squares @ job_binary.T).toarray()
+    job_norm = single * job_square_totals[None, :] - (single - 1) * (resume_binary @ job_squares.T).toarray()
+    denominator = np.sqrt(resume_norm * job_norm)
+    return np.divide(dot, denominator, out=np.zeros_like(dot), where=denominator > 0)
+
+
+def _term_matrix(docs: List[ResumeDocument], vocabulary: Dict[str, int], model,
+                 grow: bool = True) -> Tuple[sparse.csr_matrix, np.ndarray]:
+    """
+    CSR matrix of term counts (or normalized TF-IDF weights under a corpus model).
+
+    The vocabulary is built from the job side. Resume terms outside it can never
+    be shared, so they are not given columns; only the sum of their squares is
+    returned, since it still counts towards the resume's norm.
+    """
+    indptr, indices, data = [0], [], []
+    unshared = np.zeros(len(docs))
+    for row, doc in enumerate(docs):
+        values = tfidf_weights(doc, model) if model is not None else doc.term_counts
+        for term, value in values.items():
+            column = vocabulary.get(term)
+            if column is None:
+                if not grow:
+                    unshared[row] += value * value
+                    continue
+                column = vocabulary[term] = len(vocabulary)
+            indices.append(column)
+            data.append(float(value))
+        indptr.append(len(indices))
+    matrix = sparse.csr_matrix((data, indices, indptr), shape=(len(docs), len(vocabulary)))
+    return matrix, unshared
+
+
+def _keyword_matrix(docs: List[ResumeDocument]) -> np.ndarray:
+    """Dense 0/1 critical-keyword membership, one row per document"""
+    matrix = np.zeros((len(docs), len(_KEYWORD_INDEX)), dtype=np.float64)
+    for row, doc in enumerate(docs):
+        matrix[row, [_KEYWORD_INDEX[keyword] for keyword in doc.keyword_list]] = 1.0
+    return matrix
+
+
+def _format_scores(docs: List[ResumeDocument]) -> np.ndarray:
+    """_evaluate_resume_format for a whole block of resumes at once"""
+    signals = [doc.signals for doc in docs]
+    has_email = np.array([s.has_email for s in signals], dtype=np.float64)
+    has_phone = np.array([s.has_phone for s in signals], dtype=np.float64)
+    sections = np.array([len(s.sections) for s in signals], dtype=np.float64)
+    metrics = np.array([s.has_metrics for s in signals], dtype=np.float64)
+    verbs = np.array([bool(s.action_verbs) for s in signals], dtype=np.float64)
+    words = np.array([s.word_count for s in signals])
+
+    word_score = np.where((words >= 400) & (words <= 800), 1.0,
+                          np.where((words >= 300) & (words <= 1000), 0.7, 0.4))
+    section_score = np.minimum(sections / 3, 1.0)
+    return (has_email + has_phone + section_score + metrics + verbs + word_score) / 6
@@ -1,51 +1,152 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import re
-from typing import Dict, List
+import hashlib
+import math
+import os
+from typing import Dict, List, Optional, Tuple, Union
 
-def calculate_ats(resume_text: str, job_desc: str) -> float:
+from .ats_vectorizer import get_idf_model
+from .lru_cache import LRUCache
+from .resume_document import ResumeDocument, as_document, build_document
+from .text_scanner import scan_text
+
+# Without a corpus IDF model the score falls back to what fitting a TfidfVectorizer on
+# exactly the two documents would give: with smooth_idf every term gets an IDF of 1
+# when it appears in both and 1 + ln(1.5) when it appears in one.
+IDF_SHARED = 1.0
+IDF_SINGLE = 1.0 + math.log(1.5)
+
+TextOrDocument = Union[str, ResumeDocument]
+
+# One posting is scored against many applicants, so preprocessed JDs are cached
+JD_CACHE_MAX_ENTRIES = int(os.getenv("JD_CACHE_MAX_ENTRIES", "1024"))
+JD_CACHE_TTL_SECONDS = float(os.getenv("JD_CACHE_TTL_SECONDS", "3600"))
+
+_job_cache = LRUCache(max_entries=JD_CACHE_MAX_ENTRIES, ttl_seconds=JD_CACHE_TTL_SECONDS)
+
+
+def normalize_job_description(job_desc: str) -> str:
+    """Collapse runs of spaces and drop blank lines so trivially different copies share a cache entry"""
+    lines = (" ".join(line.split()) for line in (job_desc or "").splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def prepare_job_description(job_desc: str) -> ResumeDocument:
+    """
+    Preprocess a job description once so it can be scored against many resumes.
+
+    Documents (terms, keywords, TF-IDF weights) are cached under the hash of
+    the normalized text with LRU eviction and a TTL, so scoring a hot posting
+    only costs the resume side.
+    """
+    normalized = normalize_job_description(job_desc)
+    key = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+    job = _job_cache.get(key)
+    if job is None:
+        job = build_document(normalized)
+        model = get_idf_model()
+        if model is not None:
+            tfidf_weights(job, model)
+        _job_cache.set(key, job)
+    return job
+
+
+def job_cache_stats() -> Dict:
+    """Hit/miss/eviction counters of the job description cache"""
+    return _job_cache.stats()
+
+
+def clear_job_cache():
+    _job_cache.clear()
+
+
+def as_job_document(job: TextOrDocument) -> ResumeDocument:
+    """Accept a prepared job document or raw text (prepared through the JD cache)"""
+    return job if isinstance(job, ResumeDocument) else prepare_job_description(job)
+
+
+def calculate_ats(resume: TextOrDocument, job: TextOrDocument) -> float:
     """Calculate ATS score with enhanced keyword matching and weighted analysis"""
+    return _score_components(as_document(resume), as_job_document(job))["overall_score"]
+
+
+def _score_components(resume: ResumeDocument, job: ResumeDocument) -> Dict:
+    """Weighted ATS score plus the intermediate values it was built from"""
     
     # Basic TF-IDF similarity (60% weight)
-    tfidf = TfidfVectorizer(stop_words="english", ngram_range=(1, 2))  # Include bigrams
-    try:
-        matrix = tfidf.fit_transform([resume_text, job_desc])
-        tfidf_score = cosine_similarity(matrix[0:1], matrix[1:2])[0][0]
-    except:
-        tfidf_score = 0.0
+    tfidf_score = _tfidf_similarity(resume, job)
     
     # Keyword match score (25% weight)
-    keyword_score = _calculate_keyword_match(resume_text, job_desc)
+    keyword_score = _keyword_match_ratio(resume.keywords, job.keywords)
     
     # Format and structure score (15% weight)
-    format_score = _evaluate_resume_format(resume_text)
+    format_score = _evaluate_resume_format(resume)
     
     # Weighted final score
     final_score = (tfidf_score * 0.60) + (keyword_score * 0.25) + (format_score * 0.15)
     
-    return round(final_score * 100, 2)
+    return {
+        "overall_score": round(final_score * 100, 2),
+        "tfidf_score": tfidf_score,
+        "keyword_score": keyword_score,
+        "format_score": format_score
+    }
 
 
-def calculate_detailed_ats(resume_text: str, job_desc: str) -> Dict:
-    """Calculate detailed ATS analysis with breakdown and recommendations"""
+def _tfidf_similarity(resume: ResumeDocument, job: ResumeDocument) -> float:
+    """Cosine similarity of the TF-IDF vectors, computed from term counts"""
+    resume_counts, job_counts = resume.term_counts, job.term_counts
+    if not resume_counts or not job_counts:
+        return 0.0
     
-    overall_score = calculate_ats(resume_text, job_desc)
+    model = get_idf_model()
+    if model is not None:
+        # Corpus IDF fitted offline: transform only, and each side at most once
+        resume_vector = tfidf_weights(resume, model)
+        job_vector = tfidf_weights(job, model)
+        if len(resume_vector) > len(job_vector):
+            resume_vector, job_vector = job_vector, resume_vector
+        return sum(w * job_vector.get(term, 0.0) for term, w in resume_vector.items())
+    
+    dot = sum(count * job_counts[term] for term, count in resume_counts.items() if term in job_counts)
+    resume_norm = math.sqrt(sum(
+        (count * (IDF_SHARED if term in job_counts else IDF_SINGLE)) ** 2
+        for term, count in resume_counts.items()
+    ))
+    job_norm = math.sqrt(sum(
+        (count * (IDF_SHARED if term in resume_counts else IDF_SINGLE)) ** 2
+        for term, count in job_counts.items()
+    ))
+    return (dot * IDF_SHARED ** 2) / (resume_norm * job_norm)
+
+
+def tfidf_weights(doc: ResumeDocument, model) -> Dict[str, float]:
+    """Normalized TF-IDF weights of a document, memoized on the document per model"""
+    key = ("tfidf", model)
+    weights = doc.derived.get(key)
+    if weights is None:
+        weights = doc.derived[key] = model.transform(doc.term_counts)
+    return weights
+
+
+def calculate_detailed_ats(resume: TextOrDocument, job: TextOrDocument) -> Dict:
+    """Calculate detailed ATS analysis with breakdown and recommendations"""
     
-    # Extract keywords from job description
-    job_keywords = _extract_critical_keywords(job_desc)
-    resume_keywords = _extract_critical_keywords(resume_text)
+    resume = as_document(resume)
+    job = as_job_document(job)
+    components = _score_components(resume, job)
+    overall_score = components["overall_score"]
     
-    # Find matches and gaps
-    matched_keywords = [kw for kw in job_keywords if kw in resume_keywords]
-    missing_keywords = [kw for kw in job_keywords if kw not in resume_keywords]
+    # Find matches and gaps among the job description's keywords
+    matched_keywords = [kw for kw in job.keyword_list if kw in resume.keywords]
+    missing_keywords = [kw for kw in job.keyword_list if kw not in resume.keywords]
     
-    # Analyze format quality
+    # Analyze format quality (shares the single regex scan with the overall score)
+    signals = resume.signals
     format_analysis = {
-        "has_contact_info": bool(re.search(r'\b[\w\.-]+@[\w\.-]+\.\w+\b', resume_text)),  # Email
-        "has_phone": bool(re.search(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', resume_text)),  # Phone
-        "has_sections": bool(re.search(r'(experience|education|skills|projects)', resume_text, re.IGNORECASE)),
-        "has_quantifiable_achievements": bool(re.search(r'\d+%|\$\d+|\d+\+|increased|improved|reduced', resume_text, re.IGNORECASE)),
-        "word_count": len(resume_text.split())
+        "has_contact_info": signals.has_email,
+        "has_phone": signals.has_phone,
+        "has_sections": bool(signals.sections - {"summary"}),
+        "has_quantifiable_achievements": signals.has_metrics,
+        "word_count": signals.word_count
     }
     
     # Generate recommendations
@@ -58,9 +159,9 @@ def calculate_detailed_ats(resume_text: str, job_desc: str) -> Dict:
     return {
         "overall_score": overall_score,
         "breakdown": {
-            "keyword_match": round(len(matched_keywords) / max(len(job_keywords), 1) * 100, 1),
+            "keyword_match": round(len(matched_keywords) / max(len(job.keyword_list), 1) * 100, 1),
             "format_quality": round(format_analysis["has_sections"] * 100, 1),
-            "content_relevance": round(_calculate_keyword_match(resume_text, job_desc) * 100, 1)
+            "content_relevance": round(components["keyword_score"] * 100, 1)
         },
         "matched_keywords": matched_keywords[:15],  # Show top 15 matches
         "missing_keywords": missing_keywords[:10],  # Show top 10 gaps
@@ -69,100 +170,64 @@ def calculate_detailed_ats(resume_text: str, job_desc: str) -> Dict:
     }
 
 
-def _calculate_keyword_match(resume_text: str, job_desc: str) -> float:
-    """Calculate keyword match score between resume and job description"""
-    
-    # Extract important keywords (skills, technologies, qualifications)
-    job_keywords = set(_extract_critical_keywords(job_desc))
-    resume_keywords = set(_extract_critical_keywords(resume_text))
-    
+def job_tfidf_weights(job: ResumeDocument) -> Optional[Dict[str, float]]:
+    """TF-IDF weights of a prepared job under the current IDF model (memoized), None without a model"""
+    model = get_idf_model()
+    return tfidf_weights(job, model) if model is not None else None
+
+
+def score_resume(text: str, skills: List[str], job: ResumeDocument,
+                 job_weights: Optional[Dict[str, float]] = None) -> Tuple[ResumeDocument, Dict]:
+    """
+    Build the resume document and its detailed ATS result against a job the
+    caller prepared through the JD cache. Arguments and results are
+    picklable, so this is the entry point for scoring on the process pool;
+    with the job's weights (job_tfidf_weights) passed along, a worker only
+    pays for the resume side.
+    """
+    model = get_idf_model()
+    if model is not None and job_weights is not None:
+        job.derived.setdefault(("tfidf", model), job_weights)
+    resume = build_document(text, skills=skills)
+    return resume, calculate_detailed_ats(resume, job)
+
+
+def _keyword_match_ratio(resume_keywords: frozenset, job_keywords: frozenset) -> float:
+    """Share of the job's critical keywords that also appear in the resume"""
     if not job_keywords:
         return 0.0
     
     # Calculate match percentage
     matched = job_keywords.intersection(resume_keywords)
-    match_ratio = len(matched) / len(job_keywords)
-    
-    return match_ratio
-
-
-def _extract_critical_keywords(text: str) -> List[str]:
-    """Extract critical keywords (skills, technologies, qualifications) from text"""
-    
-    keywords = []
-    text_lower = text.lower()
-    
-    # Common tech skills and tools
-    tech_keywords = [
-        'python', 'java', 'javascript', 'typescript', 'react', 'angular', 'vue',
-        'node.js', 'express', 'django', 'flask', 'fastapi', 'spring', 'sql',
-        'nosql', 'mongodb', 'postgresql', 'mysql', 'redis', 'aws', 'azure',
-        'gcp', 'docker', 'kubernetes', 'jenkins', 'git', 'ci/cd', 'rest api',
-        'graphql', 'microservices', 'machine learning', 'deep learning', 'nlp',
-        'tensorflow', 'pytorch', 'scikit-learn', 'pandas', 'numpy', 'data science',
-        'data analysis', 'statistics', 'a/b testing', 'tableau', 'power bi',
-        'agile', 'scrum', 'jira', 'linux', 'bash', 'system design', 'selenium',
-        'junit', 'pytest', 'html', 'css', 'sass', 'responsive design',
-        'devops', 'mlops', 'langchain', 'llm', 'gpt', 'bert', 'transformers',
-        'computer vision', 'opencv', 'data engineering', 'spark', 'hadoop',
-        'airflow', 'kafka', 'elasticsearch', 'grafana', 'prometheus'
-    ]
-    
-    # Find matching keywords
-    for keyword in tech_keywords:
-        if keyword in text_lower:
-            keywords.append(keyword)
-    
-    # Extract degree keywords
-    degree_keywords = ['bachelor', 'master', 'phd', 'mba', 'degree', 'diploma', 'certification']
-    for keyword in degree_keywords:
-        if keyword in text_lower:
-            keywords.append(keyword)
-    
-    # Extract action verbs (important for ATS)
-    action_verbs = [
-        'developed', 'built', 'created', 'designed', 'implemented', 'deployed',
-        'managed', 'led', 'optimized', 'improved', 'increased', 'reduced',
-        'architected', 'engineered', 'automated', 'scaled', 'mentored'
-    ]
-    for verb in action_verbs:
-        if verb in text_lower:
-            keywords.append(verb)
-    
-    return list(set(keywords))  # Remove duplicates
-
-
-def _evaluate_resume_format(resume_text: str) -> float:
+    return len(matched) / len(job_keywords)
+
+
+def _evaluate_resume_format(resume: TextOrDocument) -> float:
     """Evaluate resume formatting and structure quality"""
     
+    signals = resume.signals if isinstance(resume, ResumeDocument) else scan_text(resume)
     score = 0.0
     checks = 0
     
     # Check for contact information
-    has_email = bool(re.search(r'\b[\w\.-]+@[\w\.-]+\.\w+\b', resume_text))
-    has_phone = bool(re.search(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', resume_text))
     checks += 2
-    score += (1 if has_email else 0) + (1 if has_phone else 0)
+    score += (1 if signals.has_email else 0) + (1 if signals.has_phone else 0)
     
     # Check for standard sections
-    sections = ['experience', 'education', 'skills', 'projects', 'summary']
-    section_count = sum(1 for section in sections if section in resume_text.lower())
+    section_count = len(signals.sections)
     checks += 1
     score += 1 if section_count >= 3 else (section_count / 3)
     
     # Check for quantifiable achievements
-    has_metrics = bool(re.search(r'\d+%|\$\d+|\d+\+|increased|improved|reduced', resume_text, re.IGNORECASE))
     checks += 1
-    score += 1 if has_metrics else 0
+    score += 1 if signals.has_metrics else 0
     
     # Check for action verbs
-    action_verbs = ['developed', 'built', 'created', 'designed', 'implemented', 'led', 'managed']
-    has_action_verbs = any(verb in resume_text.lower() for verb in action_verbs)
     checks += 1
-    score += 1 if has_action_verbs else 0
+    score += 1 if signals.action_verbs else 0
     
     # Check word count (400-800 words is ideal)
-    word_count = len(resume_text.split())
+    word_count = signals.word_count
     checks += 1
     if 400 <= word_count <= 800:
         score += 1
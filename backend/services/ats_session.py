@@ -0,0 +1,225 @@
+import os
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, List, Tuple
+
+from .ats_engine import calculate_detailed_ats, prepare_job_description
+from .lru_cache import LRUCache
+from .resume_document import (
+    CRITICAL_KEYWORDS, HEADER_SECTION, ResumeDocument, content_tokens, extract_keywords, section_header, term_counts, tokenize
+)
+from .resume_parser import extract_skills
+from .text_scanner import TextSignals, merge_signals, scan_text
+
+ATS_SESSION_MAX = int(os.getenv("ATS_SESSION_MAX", "1000"))
+ATS_SESSION_TTL_SECONDS = float(os.getenv("ATS_SESSION_TTL_SECONDS", "1800"))
+
+_sessions = LRUCache(max_entries=ATS_SESSION_MAX, ttl_seconds=ATS_SESSION_TTL_SECONDS)
+
+
+class SessionNotFound(KeyError):
+    """Raised for unknown or expired session ids"""
+
+
+@dataclass(frozen=True)
+class _Section:
+    """Everything the ATS needs from one section, derived once when it changes"""
+    text: str
+    tokens: Tuple[str, ...]
+    content: Tuple[str, ...]
+    counts: Counter
+    keywords: Tuple[str, ...]
+    skills: Tuple[str, ...]
+    signals: TextSignals
+
+
+def _analyze_section(text: str) -> _Section:
+    text_lower = text.lower()
+    tokens = tokenize(text_lower)
+    return _Section(
+        text=text,
+        tokens=tokens,
+        content=tuple(content_tokens(tokens)),
+        counts=term_counts(tokens),
+        keywords=extract_keywords(text_lower),
+        skills=tuple(extract_skills(text)),
+        signals=scan_text(text)
+    )
+
+
+def split_resume_sections(text: str) -> List[Tuple[str, str]]:
+    """
+    Split a resume into (name, text) sections, keeping each header line with
+    its section so that joining the texts with newlines restores the resume.
+    Repeated headers get numbered names (projects, projects_2, ...).
+    """
+    sections: List[Tuple[str, List[str]]] = [(HEADER_SECTION, [])]
+    seen = Counter({HEADER_SECTION: 1})
+    for line in text.splitlines():
+        section = section_header(line)
+        if section:
+            seen[section] += 1
+            name = section if seen[section] == 1 else f"{section}_{seen[section]}"
+            sections.append((name, [line]))
+        else:
+            sections[-1][1].append(line)
+    return [(name, "\n".join(lines)) for name, lines in sections]
+
+
+class ATSSession:
+    """
+    A resume being edited against one job description.
+
+    Term counts, keyword hits, skills and format signals are kept per section;
+    an edit re-derives only the sections it touches, and the totals are
+    updated by subtracting the old section and adding the new one.
+    """
+
+    def __init__(self, resume_text: str, job_description: str):
+        self.id = uuid.uuid4().hex
+        self.job = prepare_job_description(job_description)
+        self.lock = threading.Lock()
+        self.revision = 0
+        self._order: List[str] = []
+        self._sections: Dict[str, _Section] = {}
+        self._counts = Counter()
+        self._keyword_hits = Counter()
+        for name, text in split_resume_sections(resume_text):
+            self._put(name, text)
+
+    @property
+    def section_names(self) -> List[str]:
+        return list(self._order)
+
+    def section_text(self, name: str) -> str:
+        return self._sections[name].text
+
+    def _put(self, name: str, text: str):
+        old = self._sections.get(name)
+        if old is not None:
+            self._subtract(old)
+        else:
+            self._order.append(name)
+        new = _analyze_section(text)
+        self._sections[name] = new
+        self._counts.update(new.counts)
+        self._keyword_hits.update(new.keywords)
+
+    def _remove(self, name: str):
+        self._subtract(self._sections.pop(name))
+        self._order.remove(name)
+
+    def _subtract(self, section: _Section):
+        for totals, values in ((self._counts, section.counts), (self._keyword_hits, section.keywords)):
+            totals.subtract(values)
+            for key in values:
+                if totals[key] <= 0:
+                    del totals[key]
+
+    def apply(self, edits: List[Dict]):
+        """
+        Apply section edits: {"section": name, "text": new text} replaces (or
+        appends) a section, and {"section": name, "delete": true} removes it.
+        """
+        # Validate everything first so a bad edit leaves the session untouched
+        present = set(self._sections)
+        for edit in edits:
+            name = edit.get("section") if isinstance(edit, dict) else None
+            if not name:
+                raise ValueError("Each edit needs a 'section' name")
+            if edit.get("delete"):
+                if name not in present:
+                    raise ValueError(f"Unknown section '{name}'")
+                present.discard(name)
+            else:
+                present.add(name)
+
+        for edit in edits:
+            name = edit["section"]
+            if edit.get("delete"):
+                self._remove(name)
+            else:
+                self._put(name, str(edit.get("text", "")))
+        self.revision += 1
+
+    def document(self) -> ResumeDocument:
+        """Assemble the current resume document from the per-section state"""
+        sections = [self._sections[name] for name in self._order]
+
+        # Bigrams across section boundaries are the only terms not owned by a section
+        counts = Counter(self._counts)
+        previous = None
+        for section in sections:
+            if section.content:
+                if previous is not None:
+                    counts[f"{previous} {section.content[0]}"] += 1
+                previous = section.content[-1]
+
+        text = "\n".join(section.text for section in sections)
+        keyword_list = tuple(k for k in CRITICAL_KEYWORDS if k in self._keyword_hits)
+        keywords = frozenset(keyword_list)
+        return ResumeDocument(
+            text=text,
+            text_lower=text.lower(),
+            tokens=tuple(token for section in sections for token in section.tokens),
+            term_counts=MappingProxyType(counts),
+            keywords=keywords,
+            keyword_list=keyword_list,
+            skills=tuple(sorted({skill for section in sections for skill in section.skills})),
+            sections=MappingProxyType({name: self._sections[name].text for name in self._order}),
+            signals=merge_signals(section.signals for section in sections)
+        )
+
+    def score(self) -> Dict:
+        """Detailed ATS result for the current revision"""
+        started = time.perf_counter()
+        resume = self.document()
+        result = calculate_detailed_ats(resume, self.job)
+        result.update({
+            "session_id": self.id,
+            "revision": self.revision,
+            "sections": self.section_names,
+            "skills": list(resume.skills),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
+        })
+        return result
+
+
+def create_session(resume_text: str, job_description: str) -> ATSSession:
+    session = ATSSession(resume_text, job_description)
+    _sessions.set(session.id, session)
+    return session
+
+
+def get_session(session_id: str) -> ATSSession:
+    session = _sessions.get(session_id)
+    if session is None:
+        raise SessionNotFound(session_id)
+    # Re-set so the TTL counts from the last activity
+    _sessions.set(session_id, session)
+    return session
+
+
+def update_session(session_id: str, edits: List[Dict]) -> Dict:
+    """Apply edits to a session and return the re-scored result"""
+    session = get_session(session_id)
+    with session.lock:
+        started = time.perf_counter()
+        session.apply(edits)
+        result = session.score()
+        result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return result
+
+
+def session_score(session_id: str) -> Dict:
+    session = get_session(session_id)
+    with session.lock:
+        return session.score()
+
+
+def close_session(session_id: str) -> bool:
+    return _sessions.pop(session_id) is not None
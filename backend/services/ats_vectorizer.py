@@ -0,0 +1,135 @@
+import math
+import os
+import pickle
+import threading
+from collections import Counter
+from typing import Dict, Iterable, Mapping, Optional
+
+import numpy as np
+from sklearn.utils import murmurhash3_32
+
+from .resume_document import term_counts, tokenize
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+
+# auto: use the fitted model when the file exists, otherwise the exact pairwise IDF
+# corpus / hashing: require a fitted model of that kind; pairwise: never load one
+ATS_IDF_MODE = os.getenv("ATS_IDF_MODE", "auto").lower()
+ATS_IDF_MODEL_PATH = os.getenv("ATS_IDF_MODEL_PATH", os.path.join(BASE_DIR, "models", "ats_idf.pkl"))
+ATS_HASH_FEATURES = int(os.getenv("ATS_HASH_FEATURES", str(2 ** 20)))
+
+MODEL_FORMAT_VERSION = 1
+
+_model = None
+_model_loaded = False
+_model_lock = threading.Lock()
+
+
+class IDFModel:
+    """
+    Corpus document frequencies fitted offline.
+
+    Uses TfidfVectorizer's smooth IDF, ln((1 + n) / (1 + df)) + 1, so terms the
+    corpus never saw get the maximum weight. In hashing mode document frequencies
+    live in a fixed-size bucket array and memory does not grow with the vocabulary.
+    """
+
+    def __init__(self, n_docs: int, df: Optional[Dict[str, int]] = None,
+                 hashed_df: Optional[np.ndarray] = None):
+        self.n_docs = n_docs
+        self.df = df
+        self.hashed_df = hashed_df
+        self.mode = "hashing" if hashed_df is not None else "corpus"
+
+        # IDF values are computed once at load; requests only look them up
+        self.unseen_idf = math.log(1 + n_docs) + 1.0
+        if hashed_df is not None:
+            # Kept as one float64 array (8 bytes per bucket), not a list of boxed floats
+            self._idf_buckets = np.log((1 + n_docs) / (1 + hashed_df.astype(np.float64))) + 1.0
+        else:
+            self._idf_terms = {
+                term: math.log((1 + n_docs) / (1 + count)) + 1.0 for term, count in df.items()
+            }
+
+    def idf(self, term: str) -> float:
+        if self.hashed_df is not None:
+            return float(self._idf_buckets[_bucket(term, len(self._idf_buckets))])
+        return self._idf_terms.get(term, self.unseen_idf)
+
+    def transform(self, counts: Mapping[str, int]) -> Dict[str, float]:
+        """L2-normalized TF-IDF weights for one document's term counts"""
+        idf = self.idf
+        weights = {term: count * idf(term) for term, count in counts.items()}
+        norm = math.sqrt(sum(w * w for w in weights.values()))
+        if not norm:
+            return {}
+        return {term: w / norm for term, w in weights.items()}
+
+    def to_dict(self) -> Dict:
+        return {
+            "version": MODEL_FORMAT_VERSION,
+            "n_docs": self.n_docs,
+            "df": self.df,
+            "hashed_df": self.hashed_df
+        }
+
+
+def _bucket(term: str, n_features: int) -> int:
+    return murmurhash3_32(term, positive=True) % n_features
+
+
+def fit_idf_model(texts: Iterable[str], hashing: bool = False,
+                  n_features: int = ATS_HASH_FEATURES) -> IDFModel:
+    """Count document frequencies of the ATS terms (unigrams + bigrams) over a corpus"""
+    n_docs = 0
+    df = Counter()
+    hashed_df = np.zeros(n_features, dtype=np.int32) if hashing else None
+    for text in texts:
+        n_docs += 1
+        terms = term_counts(tokenize((text or "").lower())).keys()
+        if hashing:
+            hashed_df[list({_bucket(term, n_features) for term in terms})] += 1
+        else:
+            df.update(terms)
+    return IDFModel(n_docs, df=None if hashing else dict(df), hashed_df=hashed_df)
+
+
+def save_idf_model(model: IDFModel, path: str = ATS_IDF_MODEL_PATH):
+    with open(path, "wb") as f:
+        pickle.dump(model.to_dict(), f)
+
+
+def load_idf_model(path: str = ATS_IDF_MODEL_PATH) -> IDFModel:
+    with open(path, "rb") as f:
+        data = pickle.load(f)
+    if data.get("version") != MODEL_FORMAT_VERSION:
+        raise ValueError(f"Unsupported ATS IDF model version {data.get('version')}")
+    return IDFModel(data["n_docs"], df=data["df"], hashed_df=data["hashed_df"])
+
+
+def get_idf_model() -> Optional[IDFModel]:
+    """The process-wide fitted model, loaded once; None means use the pairwise IDF"""
+    global _model, _model_loaded
+    if _model_loaded:
+        return _model
+    with _model_lock:
+        if not _model_loaded:
+            if ATS_IDF_MODE != "pairwise" and (ATS_IDF_MODE != "auto" or os.path.exists(ATS_IDF_MODEL_PATH)):
+                try:
+                    _model = load_idf_model(ATS_IDF_MODEL_PATH)
+                    print(f"[ATS] Loaded {_model.mode} IDF model fitted on {_model.n_docs} documents")
+                    if ATS_IDF_MODE in ("corpus", "hashing") and _model.mode != ATS_IDF_MODE:
+                        print(f"[Warning] ATS_IDF_MODE={ATS_IDF_MODE} but the model is {_model.mode}")
+                except Exception as e:
+                    print(f"[Warning] Could not load ATS IDF model ({e}). Using pairwise IDF.")
+                    _model = None
+            _model_loaded = True
+    return _model
+
+
+def set_idf_model(model: Optional[IDFModel]):
+    """Swap the active model (tests, benchmarks, hot reload)"""
+    global _model, _model_loaded
+    with _model_lock:
+        _model = model
+        _model_loaded = True
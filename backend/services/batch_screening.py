@@ -0,0 +1,160 @@
+import os
+import time
+import zipfile
+from typing import Dict, List, Tuple
+
+from models.role_classifier import predict_role
+
+from .ats_engine import calculate_ats, prepare_job_description
+from .career_advisor import generate_feedback
+from .resume_cache import parse_resumes
+from .resume_document import build_document
+from .skill_gap import find_gap
+from .upload_ingest import UPLOAD_MAX_BYTES, UploadRejected, probe_pdf, spool_upload
+
+MAX_BATCH_FILES = int(os.getenv("MAX_BATCH_FILES", "500"))
+MAX_ZIP_UNCOMPRESSED_BYTES = int(os.getenv("MAX_ZIP_UNCOMPRESSED_BYTES", str(500 * 1024 * 1024)))
+
+
+def spool_batch_uploads(uploads, workdir: str) -> List[Tuple[str, str]]:
+    """
+    Write uploaded PDFs (and the PDFs inside uploaded zip archives) to workdir.
+
+    Returns (filename, path) pairs in upload order. Pool workers reopen the
+    files by path, so nothing is held in memory between parsing stages.
+    """
+    spooled = []
+    for upload in uploads:
+        filename = upload.filename or f"resume_{len(spooled)}.pdf"
+        path = os.path.join(workdir, f"{len(spooled)}_{os.path.basename(filename)}")
+        archive = _is_zip_stream(upload.file)
+        if not archive and len(spooled) >= MAX_BATCH_FILES:
+            raise ValueError(f"Too many resumes in one batch (limit {MAX_BATCH_FILES})")
+        try:
+            # Archives get the archive budget; single resumes the per-file upload limit
+            spool_upload(upload.file, path, MAX_ZIP_UNCOMPRESSED_BYTES if archive else UPLOAD_MAX_BYTES)
+        except UploadRejected as e:
+            raise ValueError(f"{filename}: {e}")
+
+        if archive and zipfile.is_zipfile(path):
+            try:
+                spooled.extend(_expand_zip(path, workdir, len(spooled), MAX_BATCH_FILES - len(spooled)))
+            finally:
+                os.remove(path)
+        else:
+            spooled.append((filename, path))
+    return spooled
+
+
+def _is_zip_stream(source) -> bool:
+    """Whether an upload stream starts with a zip local file header; the position is restored"""
+    if not hasattr(source, "seek"):
+        return False
+    source.seek(0)
+    magic = source.read(4)
+    source.seek(0)
+    return magic == b"PK\x03\x04"
+
+
+def _expand_zip(zip_path: str, workdir: str, offset: int, max_files: int) -> List[Tuple[str, str]]:
+    """
+    Extract the PDF members of a zip archive, refusing archives that inflate
+    too far or hold more than max_files PDFs (checked before extracting).
+    """
+    extracted = []
+    with zipfile.ZipFile(zip_path) as archive:
+        members = [
+            info for info in archive.infolist()
+            if not info.is_dir() and info.filename.lower().endswith(".pdf")
+            and not os.path.basename(info.filename).startswith(".")
+        ]
+        if len(members) > max_files:
+            raise ValueError(f"Too many resumes in one batch (limit {MAX_BATCH_FILES})")
+        if sum(info.file_size for info in members) > MAX_ZIP_UNCOMPRESSED_BYTES:
+            raise ValueError("Zip archive is too large once uncompressed")
+
+        for info in members:
+            name = os.path.basename(info.filename)
+            path = os.path.join(workdir, f"{offset + len(extracted)}_{name}")
+            with archive.open(info) as src:
+                spool_upload(src, path, MAX_ZIP_UNCOMPRESSED_BYTES)
+            extracted.append((name, path))
+    return extracted
+
+
+def screen_resumes(
+    files: List[Tuple[str, str]],
+    job_description: str,
+    include_feedback: bool = False,
+    feedback_limit: int = 5
+) -> Dict:
+    """
+    Rank many resumes against a single job description.
+
+    The job description is turned into a document once (term counts, keywords,
+    skills) and reused for every resume; parsing is spread over the process pool.
+    LLM feedback is opt-in and limited to the top-ranked candidates.
+    """
+    started = time.perf_counter()
+    job = prepare_job_description(job_description)
+    job_skills = list(job.skills)
+
+    # Enforce the per-file limits before anything reaches pdfplumber
+    accepted = []
+    failed = []
+    for filename, path in files:
+        try:
+            probe_pdf(path)
+            accepted.append((filename, path))
+        except UploadRejected as e:
+            failed.append({"filename": filename, "error": str(e)})
+
+    parsed_resumes = parse_resumes([path for _, path in accepted])
+    parsed_at = time.perf_counter()
+
+    ranked = []
+    for (filename, _), parsed in zip(accepted, parsed_resumes):
+        text = parsed["text"]
+        if not text or len(text) < 50:
+            failed.append({"filename": filename, "error": "Unable to extract text from resume"})
+            continue
+
+        skills = parsed["skills"]
+        skill_set = set(skills)
+        resume = build_document(text, skills=skills)
+        ranked.append(({
+            "filename": filename,
+            "ats_score": calculate_ats(resume, job),
+            "predicted_role": predict_role(skills) if skills else "Professional",
+            "skills": skills,
+            "matched_skills": [s for s in job_skills if s in skill_set],
+            "missing_skills": find_gap(skills, job_skills) if job_skills else [],
+            "experience_years": parsed["experience_years"],
+            "cached": parsed["cache"] != "miss"
+        }, resume))
+
+    ranked.sort(key=lambda item: item[0]["ats_score"], reverse=True)
+    for rank, (result, resume) in enumerate(ranked, start=1):
+        result["rank"] = rank
+        if include_feedback and rank <= feedback_limit:
+            result["feedback"] = generate_feedback(
+                skills=result["skills"],
+                role=result["predicted_role"],
+                missing_skills=result["missing_skills"],
+                ats_score=result["ats_score"],
+                resume_text=resume,
+                job_description=job
+            )
+    results = [result for result, _ in ranked]
+
+    return {
+        "total_files": len(files),
+        "processed": len(results),
+        "failed": failed,
+        "job_description_skills": job_skills,
+        "results": results,
+        "timings_ms": {
+            "parse": round((parsed_at - started) * 1000, 2),
+            "total": round((time.perf_counter() - started) * 1000, 2)
+        }
+    }
@@ -0,0 +1,223 @@
+import os
+import shutil
+import tempfile
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+from scipy import sparse
+
+from . import resume_parser
+from .job_catalog import JobCatalog, get_catalog
+from .job_matcher import rank_matches
+from .semantic_index import semantic_query
+from .skill_ontology import ONTOLOGY
+
+# Largest batch accepted by the bulk endpoint
+BULK_MATCH_MAX_CANDIDATES = int(os.getenv("BULK_MATCH_MAX_CANDIDATES", "100000"))
+# Candidates handed to a worker process at a time
+BULK_MATCH_CHUNK_CANDIDATES = int(os.getenv("BULK_MATCH_CHUNK_CANDIDATES", "256"))
+# Smaller batches are matched in-process (worker start-up and catalog mapping would dominate)
+BULK_MATCH_PARALLEL_MIN_CANDIDATES = int(os.getenv("BULK_MATCH_PARALLEL_MIN_CANDIDATES", "1024"))
+# Upper bound on (candidate, job) pairs sharing a skill per sparse product block;
+# bounds peak memory, and blocks that stay cache-sized are also the fastest
+BULK_MATCH_BLOCK_ENTRIES = int(os.getenv("BULK_MATCH_BLOCK_ENTRIES", "250000"))
+# Where in-memory catalogs are written for the workers to map (tmpfs when available)
+BULK_MATCH_SHARED_DIR = os.getenv(
+    "BULK_MATCH_SHARED_DIR", "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+)
+
+# Counts packed into one float64 product stay below this (skills per candidate)
+_PACK = 1024
+
+# Per worker process: the catalog mapped from the directory of the current run
+_worker_catalog: Dict[str, JobCatalog] = {}
+
+
+def match_candidates(candidates: Sequence[Sequence[str]], experience_years: Union[int, Sequence[int]] = 0,
+                     top_k: int = 10, parallel: Optional[bool] = None) -> Iterator[List[Dict]]:
+    """match_jobs(skills, experience, top_k) for every candidate, yielded in input order"""
+    names = sorted({ONTOLOGY.canonical(skill) for skills in candidates for skill in skills})
+    columns = {name: i for i, name in enumerate(names)}
+    indptr, indices = [0], []
+    for skills in candidates:
+        indices.extend(sorted({columns[ONTOLOGY.canonical(skill)] for skill in skills}))
+        indptr.append(len(indices))
+    matrix = sparse.csr_matrix((np.ones(len(indices)), indices, indptr), shape=(len(candidates), len(names)))
+    return match_matrix(matrix, names, experience_years, top_k, parallel)
+
+
+def match_matrix(matrix, skill_names: Sequence[str], experience_years: Union[int, Sequence[int]] = 0,
+                 top_k: int = 10, parallel: Optional[bool] = None) -> Iterator[List[Dict]]:
+    """
+    Top-k job matches for every row of a candidate x skill matrix (nonzero =
+    has the skill; columns named by `skill_names`), yielded in row order.
+
+    The five match factors of all (candidate, job) pairs sharing a skill come
+    from sparse products of candidate blocks with the catalog's skill -> job
+    postings. Large batches are split into chunks matched by the shared
+    process pool; workers memory-map the same catalog snapshot.
+    """
+    catalog = get_catalog()
+    matrix = sparse.csr_matrix(matrix)
+    if matrix.shape[1] != len(skill_names):
+        raise ValueError(f"Matrix has {matrix.shape[1]} columns for {len(skill_names)} skill names")
+    if matrix.shape[0] and np.diff(matrix.indptr).max() >= _PACK:
+        raise ValueError(f"A candidate can have at most {_PACK - 1} skills")
+    experience = np.broadcast_to(np.asarray(experience_years), (matrix.shape[0],))
+    if parallel is None:
+        parallel = matrix.shape[0] >= BULK_MATCH_PARALLEL_MIN_CANDIDATES
+    # Validation above runs on the call; matching runs as the results are consumed
+    return _match_chunks(catalog, _chunks(catalog, matrix, list(skill_names), experience), top_k, parallel)
+
+
+def _match_chunks(catalog: JobCatalog, chunks, top_k: int, parallel: bool) -> Iterator[List[Dict]]:
+    if not parallel:
+        for chunk in chunks:
+            yield from _match_rows(catalog, *chunk, top_k)
+        return
+
+    with _shared_snapshot(catalog) as directory:
+        pool = resume_parser.get_pdf_pool()
+        window = deque()
+        # A bounded number of chunks in flight keeps results streaming in order
+        # without queueing the whole batch in memory
+        try:
+            for chunk in chunks:
+                window.append(pool.submit(_match_chunk, directory, *chunk, top_k))
+                if len(window) >= 2 * resume_parser.PDF_WORKERS:
+                    yield from window.popleft().result()
+            while window:
+                yield from window.popleft().result()
+        finally:
+            # Closed early (client gone): queued chunks never start
+            for future in window:
+                future.cancel()
+
+
+def _chunks(catalog: JobCatalog, matrix: sparse.csr_matrix, skill_names: List[str], experience: np.ndarray):
+    """(catalog-column CSR arrays, experience, canonical skill names) per chunk of candidates"""
+    canonical = [ONTOLOGY.canonical(name) for name in skill_names]
+    remap = np.array([catalog.columns.get(name, -1) for name in canonical], dtype=np.int64)
+    for start in range(0, matrix.shape[0], BULK_MATCH_CHUNK_CANDIDATES):
+        block = matrix[start:start + BULK_MATCH_CHUNK_CANDIDATES]
+        block.eliminate_zeros()
+        block.sort_indices()
+        names = [
+            [canonical[column] for column in block.indices[block.indptr[row]:block.indptr[row + 1]].tolist()]
+            for row in range(block.shape[0])
+        ]
+        # Keep only skills some job lists, deduplicated per row (synonyms share a column)
+        rows = np.repeat(np.arange(block.shape[0]), np.diff(block.indptr))
+        columns = remap[block.indices]
+        known = columns >= 0
+        pairs = np.unique(rows[known] * len(catalog.vocabulary) + columns[known])
+        indptr = np.zeros(block.shape[0] + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum(np.bincount(pairs // max(len(catalog.vocabulary), 1), minlength=block.shape[0]))
+        indices = (pairs % max(len(catalog.vocabulary), 1)).astype(np.int32)
+        yield indptr, indices, np.array(experience[start:start + block.shape[0]]), names
+
+
+def _match_chunk(directory: str, indptr, indices, experience, names, top_k) -> List[List[Dict]]:
+    """Runs inside a pool worker; the catalog is mapped once per run directory"""
+    catalog = _worker_catalog.get(directory)
+    if catalog is None:
+        _worker_catalog.clear()
+        catalog = _worker_catalog[directory] = JobCatalog.open(directory)
+    return list(_match_rows(catalog, indptr, indices, experience, names, top_k))
+
+
+def _match_rows(catalog: JobCatalog, indptr, indices, experience, names, top_k) -> Iterator[List[Dict]]:
+    vocabulary_size = len(catalog.vocabulary)
+    postings = catalog.skill_jobs
+    posting_lengths = np.diff(np.asarray(catalog.postings_indptr))
+    # Pairs produced per candidate: the summed posting lengths of its skills
+    entries = np.add.reduceat(np.append(posting_lengths[indices], 0), indptr[:-1]) * (np.diff(indptr) > 0)
+
+    start = 0
+    while start < len(names):
+        stop = start + 1
+        budget = int(entries[start])
+        while stop < len(names) and budget + entries[stop] <= BULK_MATCH_BLOCK_ENTRIES:
+            budget += int(entries[stop])
+            stop += 1
+        block_indptr = indptr[start:stop + 1] - indptr[start]
+        block = sparse.csr_matrix(
+            (np.ones(int(block_indptr[-1])), indices[indptr[start]:indptr[stop]], block_indptr),
+            shape=(stop - start, vocabulary_size)
+        )
+        yield from _match_block(catalog, block, postings, experience[start:stop], names[start:stop], top_k)
+        start = stop
+
+
+def _match_block(catalog: JobCatalog, block: sparse.csr_matrix, postings: sparse.csr_matrix,
+                 experience: np.ndarray, names: List[List[str]], top_k: int) -> Iterator[List[Dict]]:
+    # Candidates x jobs, one entry per pair sharing a skill. Shared, critical
+    # and rare skill counts are exact small integers, packed into one product
+    # as base-_PACK digits; the IDF sum is a second product. Products over the
+    # same operand patterns list entries in the same order, except that sums
+    # of exactly zero are dropped, so only the IDF product may need aligning.
+    packed_weights = 1.0 + catalog.critical * _PACK + catalog.rare * _PACK ** 2
+    packed = sparse.csr_matrix((packed_weights[block.indices], block.indices, block.indptr), shape=block.shape) @ postings
+    counts = packed.data.astype(np.int64)
+    idf = sparse.csr_matrix((catalog.idf[block.indices], block.indices, block.indptr), shape=block.shape) @ postings
+    sums = np.array([
+        counts % _PACK,
+        idf.data if idf.nnz == packed.nnz else _aligned(packed, idf),
+        counts // _PACK % _PACK,
+        counts // _PACK ** 2
+    ], dtype=np.float64).reshape(4, packed.nnz)
+
+    owners = np.repeat(np.arange(block.shape[0]), np.diff(packed.indptr))
+    factors = catalog.factors(packed.indices.astype(np.int64), sums, experience[owners])
+    for row in range(block.shape[0]):
+        start, end = packed.indptr[row], packed.indptr[row + 1]
+        scores = {name: values[start:end] for name, values in factors.items()}
+        candidate = np.zeros(block.shape[1])
+        candidate[block.indices[block.indptr[row]:block.indptr[row + 1]]] = 1.0
+        semantic = semantic_query(catalog, names[row])
+        yield rank_matches(catalog, candidate, int(experience[row]), scores, semantic, top_k)
+
+
+def _aligned(pattern: sparse.csr_matrix, product: sparse.csr_matrix) -> np.ndarray:
+    """Values of `product` at the entries of `pattern` (a superset of its entries), 0 elsewhere"""
+    keys = {key: i for i, key in enumerate(_entry_keys(pattern).tolist())}
+    values = np.zeros(pattern.nnz)
+    values[[keys[key] for key in _entry_keys(product).tolist()]] = product.data
+    return values
+
+
+def _entry_keys(matrix: sparse.csr_matrix) -> np.ndarray:
+    rows = np.repeat(np.arange(matrix.shape[0], dtype=np.int64), np.diff(matrix.indptr))
+    return rows * matrix.shape[1] + matrix.indices
+
+
+@contextmanager
+def _shared_snapshot(catalog: JobCatalog):
+    """
+    A directory holding exactly this snapshot, for the workers to map. Saved
+    snapshot directories are never rewritten, so a compiled catalog is
+    pinned with hard links (surviving the pruning of its snapshot); in-memory
+    snapshots are written out.
+    """
+    parent = os.path.dirname(os.path.abspath(catalog.path)) if catalog.path else BULK_MATCH_SHARED_DIR
+    directory = tempfile.mkdtemp(prefix="job_catalog_bulk_", dir=parent)
+    try:
+        if not (catalog.path and _link_snapshot(catalog, directory)):
+            catalog.save(directory)
+        yield directory
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def _link_snapshot(catalog: JobCatalog, directory: str) -> bool:
+    try:
+        for name in os.listdir(catalog.directory):
+            os.link(os.path.join(catalog.directory, name), os.path.join(directory, name))
+        # A flat-layout directory may have been rewritten since this snapshot was mapped
+        return JobCatalog.open(directory).meta == catalog.meta
+    except (OSError, ValueError):
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        return False
@@ -1,14 +1,24 @@
 from .ai_service import ai_service
 from .ats_engine import calculate_detailed_ats
+from .resume_document import as_document
 import json
 
-def generate_feedback(skills, role, missing_skills, ats_score, resume_text="", job_description=""):
-    """Generate comprehensive, AI-powered career feedback with detailed ATS analysis"""
+def generate_feedback(skills, role, missing_skills, ats_score, resume_text="", job_description="", detailed_ats=None):
+    """
+    Generate comprehensive, AI-powered career feedback with detailed ATS analysis.
+    
+    resume_text and job_description may be raw strings or ResumeDocuments; pass
+    detailed_ats when the caller already computed it to avoid scoring twice.
+    """
     
     # Get detailed ATS breakdown if resume and job description available
-    detailed_ats = None
     if resume_text and job_description:
-        detailed_ats = calculate_detailed_ats(resume_text, job_description)
+        resume_doc = as_document(resume_text)
+        job_doc = as_document(job_description)
+        resume_text, job_description = resume_doc.text, job_doc.text
+        if detailed_ats is None:
+            detailed_ats = calculate_detailed_ats(resume_doc, job_doc)
+    if detailed_ats:
         ats_score = detailed_ats["overall_score"]  # Use more accurate score
     
     # Create an enhanced, highly detailed prompt for AI
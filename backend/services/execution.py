@@ -0,0 +1,108 @@
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from . import resume_parser
+
+# Threads for blocking I/O (LLM calls, job APIs, file spooling)
+EXEC_IO_WORKERS = int(os.getenv("EXEC_IO_WORKERS", "32"))
+
+# Maximum concurrent calls per stage. A saturated stage queues its own callers
+# without holding up the event loop or any other stage.
+STAGE_LIMITS = {
+    "parse": int(os.getenv("EXEC_PARSE_CONCURRENCY", str(resume_parser.PDF_WORKERS))),
+    "score": int(os.getenv("EXEC_SCORE_CONCURRENCY", "8")),
+    "batch": int(os.getenv("EXEC_BATCH_CONCURRENCY", "2")),
+    "llm": int(os.getenv("EXEC_LLM_CONCURRENCY", "16")),
+    "http": int(os.getenv("EXEC_HTTP_CONCURRENCY", "16")),
+    "io": int(os.getenv("EXEC_IO_CONCURRENCY", str(EXEC_IO_WORKERS)))
+}
+
+_io_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+_semaphores: Dict[tuple, asyncio.Semaphore] = {}
+_stage_stats: Dict[str, Dict[str, int]] = {
+    stage: {"running": 0, "waiting": 0, "completed": 0, "failed": 0} for stage in STAGE_LIMITS
+}
+
+
+def get_io_pool() -> ThreadPoolExecutor:
+    """Lazily create the thread pool used for blocking I/O"""
+    global _io_pool
+    with _pool_lock:
+        if _io_pool is None:
+            _io_pool = ThreadPoolExecutor(max_workers=EXEC_IO_WORKERS, thread_name_prefix="exec-io")
+    return _io_pool
+
+
+def _stage_semaphore(stage: str) -> asyncio.Semaphore:
+    # Semaphores belong to a loop, so one is kept per (loop, stage)
+    loop = asyncio.get_running_loop()
+    key = (id(loop), stage)
+    semaphore = _semaphores.get(key)
+    if semaphore is None:
+        if stage not in STAGE_LIMITS:
+            raise KeyError(f"Unknown execution stage '{stage}'")
+        semaphore = _semaphores[key] = asyncio.Semaphore(STAGE_LIMITS[stage])
+    return semaphore
+
+
+async def _run(stage: str, executor, fn: Callable, args, kwargs):
+    semaphore = _stage_semaphore(stage)
+    stats = _stage_stats[stage]
+    stats["waiting"] += 1
+    try:
+        await semaphore.acquire()
+    finally:
+        stats["waiting"] -= 1
+
+    stats["running"] += 1
+    try:
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(executor, functools.partial(fn, *args, **kwargs))
+        stats["completed"] += 1
+        return result
+    except BaseException:
+        stats["failed"] += 1
+        raise
+    finally:
+        stats["running"] -= 1
+        semaphore.release()
+
+
+async def run_cpu(stage: str, fn: Callable, *args, **kwargs):
+    """
+    Run a CPU-bound function on the shared process pool.
+
+    fn and its arguments must be picklable; the pool is the same one used for
+    page-parallel PDF extraction, so total CPU parallelism stays bounded.
+    """
+    return await _run(stage, resume_parser.get_pdf_pool(), fn, args, kwargs)
+
+
+async def run_io(stage: str, fn: Callable, *args, **kwargs):
+    """Run a blocking call (network, disk, or work that needs in-process state) on the thread pool"""
+    return await _run(stage, get_io_pool(), fn, args, kwargs)
+
+
+def execution_stats() -> Dict:
+    """Per-stage limits and running/waiting/completed counters"""
+    return {
+        stage: {"limit": STAGE_LIMITS[stage], **_stage_stats[stage]}
+        for stage in STAGE_LIMITS
+    }
+
+
+def shutdown():
+    """Stop the worker pools (called on application shutdown)"""
+    global _io_pool
+    with _pool_lock:
+        if _io_pool is not None:
+            _io_pool.shutdown(wait=False, cancel_futures=True)
+            _io_pool = None
+    if resume_parser._pdf_pool is not None:
+        resume_parser._pdf_pool.shutdown(wait=False, cancel_futures=True)
+        resume_parser._pdf_pool = None
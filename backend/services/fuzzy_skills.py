@@ -0,0 +1,109 @@
+import os
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from .skill_ontology import ONTOLOGY
+
+# Minimum n-gram Jaccard similarity for two different skill names to count as the same skill
+SKILL_FUZZY_THRESHOLD = float(os.getenv("SKILL_FUZZY_THRESHOLD", "0.5"))
+SKILL_FUZZY_NGRAM = int(os.getenv("SKILL_FUZZY_NGRAM", "3"))
+# Memoized n-gram profiles of names outside the ontology
+SKILL_FUZZY_CACHE_SIZE = int(os.getenv("SKILL_FUZZY_CACHE_SIZE", "4096"))
+
+_neighbours: Optional[Dict[str, Dict[str, float]]] = None
+
+
+@lru_cache(maxsize=SKILL_FUZZY_CACHE_SIZE)
+def ngrams(name: str) -> FrozenSet[str]:
+    """
+    Character n-grams of a lowercased name padded with spaces (two in front,
+    one behind, as in pg_trgm), so word starts weigh more than word ends:
+    "java" shares only its first 4 of 11 trigrams with "javascript".
+    """
+    n = SKILL_FUZZY_NGRAM
+    padded = " " * (n - 1) + name.lower().strip() + " "
+    return frozenset(padded[i:i + n] for i in range(len(padded) - n + 1))
+
+
+def similarity(a: str, b: str) -> float:
+    """Jaccard similarity of the n-gram sets of two names (0-1)"""
+    if a == b:
+        return 1.0 if a else 0.0
+    known = ontology_neighbours()
+    if a in known and b in known:
+        return known[a].get(b, 0.0)
+    grams_a, grams_b = ngrams(a), ngrams(b)
+    shared = len(grams_a & grams_b)
+    return shared / (len(grams_a) + len(grams_b) - shared) if shared else 0.0
+
+
+class FuzzySkillIndex:
+    """
+    Inverted n-gram index over a list of skill names.
+
+    A query counts shared n-grams through the postings of its own n-grams,
+    so only names sharing at least one n-gram are looked at, and the exact
+    Jaccard similarity follows from the counts.
+    """
+
+    def __init__(self, names: Sequence[str]):
+        self.names: List[str] = list(dict.fromkeys(names))
+        self.positions = {name: i for i, name in enumerate(self.names)}
+        self.sizes = []
+        self._all_known: Optional[bool] = None
+        self.postings: Dict[str, List[int]] = {}
+        for i, name in enumerate(self.names):
+            grams = ngrams(name)
+            self.sizes.append(len(grams))
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(i)
+
+    def matches(self, target: str, threshold: float = 0.0) -> List[Tuple[str, float]]:
+        """(name, similarity) of indexed names above the threshold, most similar first"""
+        table = ontology_neighbours()
+        if self._all_known is None:
+            self._all_known = all(name in table for name in self.names)
+        known = table.get(target) if self._all_known else None
+        if known is not None and len(known) < len(self.names):
+            # Ontology skills only: walk the target's precomputed neighbours instead of the postings
+            scored = [(self.positions[name], score) for name, score in known.items() if name in self.positions]
+        else:
+            grams = ngrams(target)
+            shared: Dict[int, int] = {}
+            for gram in grams:
+                for i in self.postings.get(gram, ()):
+                    shared[i] = shared.get(i, 0) + 1
+            scored = [(i, count / (len(grams) + self.sizes[i] - count)) for i, count in shared.items()]
+        scored = [(i, score) for i, score in scored if score > threshold and self.names[i] != target]
+        # Ties keep index order
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return [(self.names[i], score) for i, score in scored]
+
+    def best(self, target: str, threshold: float = SKILL_FUZZY_THRESHOLD) -> Optional[Tuple[str, float]]:
+        """The most similar indexed name above the threshold, None if there is none"""
+        found = self.matches(target, threshold)
+        return found[0] if found else None
+
+
+def ontology_neighbours() -> Dict[str, Dict[str, float]]:
+    """
+    Similarity table of canonical ontology skills: for every skill, every other
+    skill sharing an n-gram with it and their similarity. Built once, on first use.
+    """
+    global _neighbours
+    if _neighbours is None:
+        names = [skill.name for skill in ONTOLOGY.skills]
+        index = FuzzySkillIndex(names)
+        table: Dict[str, Dict[str, float]] = {}
+        for name in names:
+            grams = ngrams(name)
+            shared: Dict[int, int] = {}
+            for gram in grams:
+                for i in index.postings.get(gram, ()):
+                    shared[i] = shared.get(i, 0) + 1
+            table[name] = {
+                index.names[i]: count / (len(grams) + index.sizes[i] - count)
+                for i, count in shared.items() if index.names[i] != name
+            }
+        _neighbours = table
+    return _neighbours
@@ -0,0 +1,829 @@
+import fcntl
+import json
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from functools import cached_property
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from .skill_ontology import ONTOLOGY
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+DATA_PATH = os.path.join(BASE_DIR, "jobs_dataset.csv")
+JOB_CATALOG_PATH = os.getenv("JOB_CATALOG_PATH", os.path.join(BASE_DIR, "jobs_catalog"))
+
+CATALOG_FORMAT_VERSION = 2
+
+# How often a worker checks whether another process saved a newer snapshot
+JOB_CATALOG_RECHECK_SECONDS = float(os.getenv("JOB_CATALOG_RECHECK_SECONDS", "5"))
+
+# A catalog directory holds versioned snapshot directories and a "current"
+# symlink naming the live one
+_CURRENT = "current"
+
+# A skill is "rare" when it appears in fewer than this share of all jobs
+RARE_SKILL_SHARE = 0.15
+
+# Columns of a compiled catalog, one .npy file each
+_ARRAYS = (
+    "indptr", "indices", "multiplicity",          # job -> skill columns (CSR, sorted per row)
+    "postings_indptr", "postings_indices",        # skill column -> jobs (inverted index)
+    "skill_counts",                               # listed occurrences per skill column
+    "salaries", "required_exp", "max_tfidf", "critical_required",
+    "experience_order",                           # rows sorted by required experience
+    "role_codes", "role_names", "role_first_row", "role_listed_skills",
+    "salary_order", "salary_sorted",              # rows sorted by salary, for range filters
+    # Filterable categories: sorted normalized names, per-row codes, rows grouped by code
+    "family_names", "family_codes", "family_rows", "family_offsets",
+    "location_names", "location_codes", "location_rows", "location_offsets"
+)
+
+_catalog: Optional["JobCatalog"] = None
+# Serializes snapshot builds; readers never take it
+_build_lock = threading.RLock()
+_state = {"generation": 0, "loaded_at": None, "building": False, "last_error": None, "checked_at": 0.0}
+
+
+class JobCatalog:
+    """
+    The job dataset compiled into flat numpy columns.
+
+    Skills are stored pre-tokenized as column ids in CSR layout, plus the
+    transposed postings (skill -> jobs) used as an inverted index. Columns are
+    the distinct canonical skill names of the catalog: ontology skills first in
+    id order, then unknown names sorted, which is exactly the order matched /
+    missing skills are reported in. Per-job sizes, IDF normalizers and
+    critical-skill counts are precomputed, so scoring a candidate only reads
+    the postings of the candidate's skills.
+
+    A compiled catalog is a directory of .npy files opened with mmap: every
+    worker maps the same pages and opening costs nothing per row. `path` is
+    the catalog directory it was opened from, `directory` the snapshot
+    directory actually mapped and `version` that snapshot's name.
+    """
+
+    def __init__(self, meta: Dict, arrays: Dict[str, np.ndarray], path: Optional[str] = None,
+                 directory: Optional[str] = None):
+        self.meta = meta
+        self.path = path
+        self.directory = directory or path
+        self.version = os.path.basename(directory) if directory and directory != path else None
+        self.size = int(meta["size"])
+        self.vocabulary: List[str] = list(meta["vocabulary"])
+        self.columns: Dict[str, int] = {name: i for i, name in enumerate(self.vocabulary)}
+        for name in _ARRAYS:
+            setattr(self, name, arrays[name])
+
+        # Per-skill columns are small (vocabulary-sized) and derived on load
+        counts = np.asarray(self.skill_counts, dtype=np.float64)
+        self.idf = np.log(self.size / np.maximum(counts, 1)) if self.size else counts
+        self.rare = (counts < self.size * RARE_SKILL_SHARE).astype(np.float64)
+        self.critical = _critical_columns(self.vocabulary)
+
+        # Jobs grouped by required experience; a job sharing no skill with the
+        # candidate scores on experience fit alone, so these groups rank them
+        self.experience_groups = list(zip(meta["experience_values"], meta["experience_offsets"][:-1],
+                                          meta["experience_offsets"][1:]))
+        # Memo for structures other modules derive from this snapshot (keyed by the caller)
+        self.derived: Dict = {}
+
+    # ---- building, saving, opening ----
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> "JobCatalog":
+        """Compile a DataFrame with role, skills, salary_lpa (and optionally experience_required) columns"""
+        return cls(*_append_rows(None, frame))
+
+    @classmethod
+    def from_csv(cls, path: str = DATA_PATH) -> "JobCatalog":
+        return cls.from_frame(pd.read_csv(path))
+
+    @classmethod
+    def open(cls, path: str = JOB_CATALOG_PATH) -> "JobCatalog":
+        """Memory-map the current snapshot of a compiled catalog directory"""
+        # Resolve the pointer once so every file comes from the same snapshot
+        version = current_version(path)
+        directory = os.path.join(path, version) if version else path
+        with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("format") != CATALOG_FORMAT_VERSION:
+            raise ValueError(f"Unsupported job catalog format {meta.get('format')}")
+        if meta.get("ontology_version") != ONTOLOGY.version:
+            raise ValueError(
+                f"Job catalog was compiled against skill ontology v{meta.get('ontology_version')}, "
+                f"current is v{ONTOLOGY.version}"
+            )
+        arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r") for name in _ARRAYS}
+        return cls(meta, arrays, path, directory)
+
+    def append(self, frame: pd.DataFrame) -> "JobCatalog":
+        """A new in-memory snapshot with the rows of `frame` added; self is left untouched"""
+        return JobCatalog(*_append_rows(self, frame))
+
+    def save(self, path: str = JOB_CATALOG_PATH):
+        """
+        Write the catalog as a new snapshot directory inside `path` and point
+        the "current" symlink at it with one atomic rename. Readers opening
+        the catalog meanwhile see the old or the new snapshot, never neither;
+        processes still mapping older files keep reading them. The previous
+        snapshot is kept for readers that resolved it just before the swap.
+        """
+        os.makedirs(path, exist_ok=True)
+        previous = current_version(path)
+        version = f"v{time.time_ns()}-{os.getpid()}"
+        staging = os.path.join(path, f".{version}.tmp")
+        os.makedirs(staging)
+        for name in _ARRAYS:
+            np.save(os.path.join(staging, f"{name}.npy"), np.asarray(getattr(self, name)))
+        with open(os.path.join(staging, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(self.meta, f)
+        os.replace(staging, os.path.join(path, version))
+
+        pointer = os.path.join(path, f".{_CURRENT}-{os.getpid()}")
+        if os.path.lexists(pointer):
+            os.remove(pointer)
+        os.symlink(version, pointer)
+        os.replace(pointer, os.path.join(path, _CURRENT))
+        _prune_snapshots(path, keep={version, previous})
+
+    # ---- rows ----
+
+    def role(self, row: int) -> str:
+        return str(self.role_names[self.role_codes[row]])
+
+    def salary(self, row: int):
+        return self.salaries[row].item()
+
+    def role_skills(self, role: str) -> List[str]:
+        """Skills listed (as written) for the first job with this role, [] if unknown"""
+        position = int(np.searchsorted(self.role_names, role))
+        if position >= len(self.role_names) or self.role_names[position] != role:
+            return []
+        listed = str(self.role_listed_skills[position])
+        return [s.strip() for s in listed.split(",")] if listed else []
+
+    def job_sizes(self, rows: np.ndarray) -> np.ndarray:
+        return (self.indptr[rows + 1] - self.indptr[rows]).astype(np.float64)
+
+    def skill_split(self, row: int, candidate: np.ndarray) -> Tuple[List[str], List[str]]:
+        """(matched, missing) skill names of one job, in ontology-then-alphabetical order"""
+        matched, missing = [], []
+        for column in self.indices[self.indptr[row]:self.indptr[row + 1]].tolist():
+            (matched if candidate[column] else missing).append(self.vocabulary[column])
+        return matched, missing
+
+    # ---- scoring ----
+
+    def candidate_vector(self, skills: List[str]) -> np.ndarray:
+        """0/1 vector over catalog columns; candidate skills absent from every job are dropped"""
+        vector = np.zeros(len(self.vocabulary))
+        for skill in skills:
+            column = self.columns.get(ONTOLOGY.canonical(skill))
+            if column is not None:
+                vector[column] = 1.0
+        return vector
+
+    def experience_match(self, experience_years: int, required_exp) -> np.ndarray:
+        return np.where(
+            required_exp == 0, 1.0, np.maximum(1.0 - np.abs(experience_years - required_exp) * 0.1, 0.5)
+        )
+
+    def score(self, candidate: np.ndarray, experience_years: int = 0,
+              rows: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        The five match factors plus the composite score, one entry per row of
+        the returned "rows". Without `rows` these are the jobs sharing at least
+        one skill with the candidate; with `rows` (sorted) exactly those jobs.
+
+        Per-job sums of matched skills, IDF, critical and rare skills are
+        bincounts over either the postings of the candidate's skills or the
+        skill lists of the given rows, whichever touches fewer entries.
+        """
+        columns = np.flatnonzero(candidate)
+        starts, ends = self.postings_indptr[columns], self.postings_indptr[columns + 1]
+        if rows is None:
+            rows, sums = self._posting_sums(columns, starts, ends)
+        else:
+            rows = np.asarray(rows, dtype=np.int64)
+            row_entries = int((self.indptr[rows + 1] - self.indptr[rows]).sum())
+            if row_entries <= int((ends - starts).sum()):
+                sums = self._row_sums(candidate, rows)
+            else:
+                touched, touched_sums = self._posting_sums(columns, starts, ends)
+                position = np.minimum(np.searchsorted(touched, rows), max(len(touched) - 1, 0))
+                hit = (touched[position] == rows) if len(touched) else np.zeros(len(rows), dtype=bool)
+                sums = np.zeros((4, len(rows)))
+                sums[:, hit] = touched_sums[:, position[hit]]
+        return self.factors(rows, sums, experience_years)
+
+    def _posting_sums(self, columns, starts, ends) -> Tuple[np.ndarray, np.ndarray]:
+        """(touched rows, 4 x rows sums) from the postings of the candidate's skill columns"""
+        if columns.size:
+            hits = np.concatenate([self.postings_indices[start:end] for start, end in zip(starts, ends)])
+        else:
+            hits = np.zeros(0, dtype=np.int64)
+        hit_columns = np.repeat(columns, ends - starts)
+        rows, inverse = np.unique(hits, return_inverse=True)
+        weights = (np.ones(len(self.vocabulary)), self.idf, self.critical, self.rare)
+        return rows, np.array([
+            np.bincount(inverse, weights=weight[hit_columns], minlength=len(rows)) for weight in weights
+        ]).reshape(4, len(rows))
+
+    def _row_sums(self, candidate: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """4 x rows sums read from the skill lists of the given rows"""
+        starts = self.indptr[rows]
+        lengths = self.indptr[rows + 1] - starts
+        owner = np.repeat(np.arange(len(rows)), lengths)
+        # Entry positions: each row's start plus 0..length-1
+        offsets = np.arange(int(lengths.sum())) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        entry_columns = self.indices[np.repeat(starts, lengths) + offsets]
+        shared = candidate[entry_columns]
+        weights = (shared, shared * self.idf[entry_columns], shared * self.critical[entry_columns],
+                   shared * self.rare[entry_columns])
+        return np.array([
+            np.bincount(owner, weights=weight, minlength=len(rows)) for weight in weights
+        ]).reshape(4, len(rows))
+
+    @cached_property
+    def skill_jobs(self) -> sparse.csr_matrix:
+        """Skill column x job 0/1 matrix over the postings, built once per snapshot"""
+        return sparse.csr_matrix(
+            (np.ones(len(self.postings_indices)), np.asarray(self.postings_indices), np.asarray(self.postings_indptr)),
+            shape=(len(self.vocabulary), self.size)
+        )
+
+    def factors(self, rows: np.ndarray, sums: np.ndarray, experience_years) -> Dict[str, np.ndarray]:
+        """
+        The match factors and composite score of `rows` from their 4 x rows
+        sums (shared skills, IDF, critical and rare skills). experience_years
+        is one value or one per row.
+        """
+        matched, tfidf, critical, rare = sums
+        job_sizes, max_tfidf = self.job_sizes(rows), np.asarray(self.max_tfidf[rows])
+        critical_required = np.asarray(self.critical_required[rows])
+        zeros = np.zeros(len(rows))
+
+        skill_overlap = np.divide(matched, job_sizes, out=zeros.copy(), where=job_sizes > 0)
+        tfidf_score = np.divide(tfidf, max_tfidf, out=zeros.copy(), where=max_tfidf > 0)
+        skill_importance = np.where(critical_required > 0, critical / np.maximum(critical_required, 1), skill_overlap)
+        experience_match = self.experience_match(experience_years, np.asarray(self.required_exp[rows]))
+        rarity_bonus = np.minimum(rare * 0.15, 0.5)
+
+        final = (
+            skill_overlap * 0.30 +
+            tfidf_score * 0.25 +
+            skill_importance * 0.20 +
+            experience_match * 0.15 +
+            rarity_bonus * 0.10
+        )
+        return {
+            "rows": rows,
+            "skill_overlap": skill_overlap,
+            "tfidf_score": tfidf_score,
+            "skill_importance": skill_importance,
+            "experience_match": experience_match,
+            "rarity_bonus": rarity_bonus,
+            "final": final
+        }
+
+    # ---- filters ----
+
+    def filter_rows(self, filters: Dict) -> Optional[np.ndarray]:
+        """
+        Sorted rows passing every filter, None if no filter is set.
+
+        Supported: min_salary / max_salary, min_experience / max_experience
+        (required experience), role_families and locations (any of, case
+        insensitive). The most selective filter is read from its index and
+        the others are checked against the columns of just those rows.
+        """
+        predicates = []
+        low, high = filters.get("min_salary"), filters.get("max_salary")
+        if low is not None or high is not None:
+            start = int(np.searchsorted(self.salary_sorted, low, "left")) if low is not None else 0
+            end = int(np.searchsorted(self.salary_sorted, high, "right")) if high is not None else self.size
+            predicates.append((max(end - start, 0), lambda: self.salary_order[start:end],
+                               lambda rows: _within(np.asarray(self.salaries[rows], dtype=np.float64), low, high)))
+
+        low_exp, high_exp = filters.get("min_experience"), filters.get("max_experience")
+        if low_exp is not None or high_exp is not None:
+            groups = [(start, end) for value, start, end in self.experience_groups
+                      if (low_exp is None or value >= low_exp) and (high_exp is None or value <= high_exp)]
+            predicates.append((sum(end - start for start, end in groups),
+                               lambda: _concat([self.experience_order[start:end] for start, end in groups]),
+                               lambda rows: _within(np.asarray(self.required_exp[rows]), low_exp, high_exp)))
+
+        for key, kind in (("role_families", "family"), ("locations", "location")):
+            if filters.get(key):
+                names, codes_column = getattr(self, f"{kind}_names"), getattr(self, f"{kind}_codes")
+                if kind == "location" and len(names) == 1 and names[0] == "":
+                    raise ValueError("The job catalog has no location data")
+                codes = _lookup_codes(names, filters[key])
+                index_rows, offsets = getattr(self, f"{kind}_rows"), getattr(self, f"{kind}_offsets")
+                predicates.append((
+                    int(sum(offsets[code + 1] - offsets[code] for code in codes)),
+                    lambda codes=codes, index_rows=index_rows, offsets=offsets:
+                        _concat([index_rows[offsets[code]:offsets[code + 1]] for code in codes]),
+                    lambda rows, codes=codes, codes_column=codes_column:
+                        np.isin(np.asarray(codes_column[rows]), codes)
+                ))
+
+        if not predicates:
+            return None
+        predicates.sort(key=lambda predicate: predicate[0])
+        rows = np.sort(np.asarray(predicates[0][1](), dtype=np.int64))
+        for _, _, keep in predicates[1:]:
+            if not len(rows):
+                break
+            rows = rows[keep(rows)]
+        return rows
+
+    def untouched_rows(self, experience_years: int, touched: np.ndarray,
+                       limit: Optional[int] = None) -> Iterator[Tuple[int, float]]:
+        """
+        (row, experience fit) of jobs sharing no skill with the candidate, best
+        fit first. With a limit, stops once `limit` rows are out and the next
+        group fits strictly worse, so ties across groups are still all offered.
+        """
+        touched_mask = np.zeros(self.size, dtype=bool)
+        touched_mask[touched] = True
+        groups = sorted(
+            ((float(self.experience_match(experience_years, value)), start, end)
+             for value, start, end in self.experience_groups),
+            key=lambda group: -group[0]
+        )
+        produced, last_fit = 0, None
+        for fit, start, end in groups:
+            if limit is not None and produced >= limit and (last_fit is None or fit < last_fit):
+                return
+            rows = self.experience_order[start:end]
+            rows = rows[~touched_mask[rows]]
+            # Unlimited callers take the whole group; limited ones the first `limit`
+            if limit is not None:
+                rows = rows[:limit]
+            for row in rows.tolist():
+                yield row, fit
+            produced += len(rows)
+            last_fit = fit
+
+
+def _within(values: np.ndarray, low, high) -> np.ndarray:
+    keep = np.ones(len(values), dtype=bool)
+    if low is not None:
+        keep &= values >= low
+    if high is not None:
+        keep &= values <= high
+    return keep
+
+
+def _concat(parts: List[np.ndarray]) -> np.ndarray:
+    return np.concatenate(parts) if parts else np.zeros(0, dtype=np.int64)
+
+
+def _lookup_codes(names: np.ndarray, values: List[str]) -> np.ndarray:
+    """Codes of the values present in a sorted name table"""
+    codes = []
+    for value in values:
+        value = _normalize_category(value)
+        position = int(np.searchsorted(names, value))
+        if position < len(names) and names[position] == value:
+            codes.append(position)
+    return np.array(sorted(set(codes)), dtype=np.int64)
+
+
+def _critical_columns(vocabulary: List[str]) -> np.ndarray:
+    critical_mask = ONTOLOGY.flag_mask("match_critical")
+    ids = [ONTOLOGY.skill_id(name) for name in vocabulary]
+    return np.array([float(i is not None and bool(critical_mask >> i & 1)) for i in ids])
+
+
+def _normalize_category(value) -> str:
+    return " ".join(value.lower().split()) if isinstance(value, str) else ""
+
+
+def _merge_codes(old_names, old_codes, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Sorted name table and per-row codes for the old rows followed by `values`"""
+    if old_names is None:
+        names, codes = np.unique(values, return_inverse=True)
+        return names, codes.astype(np.int32)
+    old_names = np.asarray(old_names)
+    names = np.union1d(old_names, values)
+    codes = np.concatenate([np.searchsorted(names, old_names)[old_codes], np.searchsorted(names, values)])
+    return names, codes.astype(np.int32)
+
+
+def _merge_groups(old_rows, old_offsets, remap: np.ndarray, new_codes: np.ndarray,
+                  new_rows: np.ndarray, count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rows grouped by code after an append, and the offsets of each group. Each
+    group is its old rows (old codes renumbered by `remap`) followed by the
+    new rows with that code, so rows stay ascending within a group. Only the
+    new rows are sorted; the old groups are moved as they are.
+    """
+    old_rows, old_offsets = np.asarray(old_rows), np.asarray(old_offsets, dtype=np.int64)
+    old_lengths = np.zeros(count, dtype=np.int64)
+    old_lengths[remap] = np.diff(old_offsets)
+    offsets = np.zeros(count + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(old_lengths + np.bincount(new_codes, minlength=count))
+
+    rows = np.empty(int(offsets[-1]), dtype=np.int32)
+    shift = offsets[:-1][remap] - old_offsets[:-1]
+    rows[np.arange(len(old_rows)) + np.repeat(shift, np.diff(old_offsets))] = old_rows
+    order = np.argsort(new_codes, kind="stable")
+    codes = new_codes[order]
+    rank = np.arange(len(codes)) - np.searchsorted(codes, codes)
+    rows[offsets[codes] + old_lengths[codes] + rank] = new_rows[order]
+    return rows, offsets
+
+
+def _merge_order(old_order, old_sorted: np.ndarray, new_values: np.ndarray,
+                 offset: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Stable sort order (and sorted values) of the old rows followed by new
+    rows numbered from `offset`: the new rows are sorted and inserted after
+    equal old values, as a stable argsort of all rows would place them.
+    """
+    order = np.argsort(new_values, kind="stable")
+    values = new_values[order]
+    positions = np.searchsorted(old_sorted, values, side="right")
+    return (np.insert(np.asarray(old_order, dtype=np.int32), positions, order + offset),
+            np.insert(old_sorted, positions, values))
+
+
+def _reweighted_max_tfidf(base: JobCatalog, remap: np.ndarray, skill_counts: np.ndarray, size: int) -> np.ndarray:
+    """
+    max_tfidf of the old rows under the IDF after an append. IDF is
+    ln(jobs / count): the larger catalog shifts every listed occurrence by
+    ln(size / old size), and only the postings of skills whose count changed
+    need a per-entry correction. Postings count each job once, so skills
+    listed more than once by a job (rare) are corrected separately.
+    """
+    old_counts = np.maximum(np.asarray(base.skill_counts, dtype=np.float64), 1)
+    counts = np.maximum(skill_counts[remap].astype(np.float64), 1)
+    shift = np.log(counts) - np.log(old_counts)
+    repeated = np.flatnonzero(np.asarray(base.multiplicity) > 1)
+    repeated_rows = np.searchsorted(base.indptr, repeated, side="right") - 1
+    repeated_extra = np.asarray(base.multiplicity)[repeated] - 1
+
+    occurrences = np.diff(base.indptr) + np.bincount(repeated_rows, weights=repeated_extra, minlength=base.size)
+    max_tfidf = np.asarray(base.max_tfidf) + occurrences * np.log(size / base.size)
+
+    changed = np.flatnonzero(shift)
+    if changed.size:
+        starts, ends = base.postings_indptr[changed], base.postings_indptr[changed + 1]
+        rows = np.concatenate([base.postings_indices[start:end] for start, end in zip(starts, ends)])
+        max_tfidf -= np.bincount(rows, weights=np.repeat(shift[changed], ends - starts), minlength=base.size)
+        max_tfidf -= np.bincount(repeated_rows, weights=repeated_extra * shift[base.indices[repeated]],
+                                 minlength=base.size)
+    return max_tfidf
+
+
+def _ordered_vocabulary(names) -> List[str]:
+    """Ontology skills in id order, then unknown names sorted"""
+    known = sorted((name for name in names if ONTOLOGY.skill_id(name) is not None), key=ONTOLOGY.skill_id)
+    return known + sorted(name for name in names if ONTOLOGY.skill_id(name) is None)
+
+
+def _append_rows(base: Optional[JobCatalog], frame: pd.DataFrame) -> Tuple[Dict, Dict[str, np.ndarray]]:
+    """
+    Columns of `base` (None for an empty catalog) followed by the rows of `frame`.
+
+    Only the new rows are split, canonicalized and sorted. Skill counts (and
+    so IDF) are the old counts plus the new occurrences, the old rows'
+    max_tfidf is reweighted along the postings of the skills that changed,
+    and the postings, category indexes and sort orders are merged: old
+    entries are moved in bulk (column ids remapped monotonically, since new
+    names slot into the same ordering) and the new ones inserted.
+    """
+    old_size = base.size if base is not None else 0
+    size = old_size + len(frame)
+    listed = frame["skills"].tolist()
+    job_skills = [[ONTOLOGY.canonical(s) for s in str(skills).split(",")] for skills in listed]
+
+    # Occurrences (not distinct jobs), as the per-request Counter used to count them
+    added: Dict[str, int] = {}
+    for skills in job_skills:
+        for skill in skills:
+            added[skill] = added.get(skill, 0) + 1
+    old_vocabulary = base.vocabulary if base is not None else []
+    vocabulary = _ordered_vocabulary(set(old_vocabulary) | set(added))
+    columns = {name: i for i, name in enumerate(vocabulary)}
+    remap = np.array([columns[name] for name in old_vocabulary], dtype=np.int32)
+
+    skill_counts = np.zeros(len(vocabulary), dtype=np.int64)
+    if base is not None:
+        skill_counts[remap] = base.skill_counts
+    for name, count in added.items():
+        skill_counts[columns[name]] += count
+
+    new_indptr = np.zeros(len(frame) + 1, dtype=np.int64)
+    new_indices, new_multiplicity = [], []
+    for row, skills in enumerate(job_skills):
+        per_row: Dict[int, int] = {}
+        for skill in skills:
+            per_row[columns[skill]] = per_row.get(columns[skill], 0) + 1
+        row_columns = sorted(per_row)
+        new_indices.extend(row_columns)
+        new_multiplicity.extend(per_row[column] for column in row_columns)
+        new_indptr[row + 1] = len(new_indices)
+    new_indices = np.array(new_indices, dtype=np.int32)
+    new_multiplicity = np.array(new_multiplicity, dtype=np.int32)
+
+    if "experience_required" in frame:
+        new_required_exp = frame["experience_required"].fillna(0).to_numpy(dtype=np.float64)
+    else:
+        new_required_exp = np.zeros(len(frame))
+    new_salaries = frame["salary_lpa"].to_numpy()
+    new_roles = np.array([str(role) for role in frame["role"].tolist()], dtype=str)
+    # Role family defaults to the role itself; location is optional
+    families = frame["role_family"].tolist() if "role_family" in frame else frame["role"].tolist()
+    new_families = np.array([_normalize_category(value) for value in families], dtype=str)
+    locations = frame["location"].tolist() if "location" in frame else [""] * len(frame)
+    new_locations = np.array([_normalize_category(value) for value in locations], dtype=str)
+    new_listed = np.array([skills if isinstance(skills, str) else "" for skills in listed], dtype=str)
+
+    # Per-job columns of the new rows, as bincounts over their CSR entries
+    idf = np.log(size / np.maximum(skill_counts, 1)) if size else np.zeros(len(vocabulary))
+    critical = _critical_columns(vocabulary)
+    new_entry_rows = np.repeat(np.arange(len(frame), dtype=np.int32), np.diff(new_indptr))
+    new_max_tfidf = np.bincount(new_entry_rows, weights=new_multiplicity * idf[new_indices], minlength=len(frame))
+    new_critical_required = np.bincount(new_entry_rows, weights=critical[new_indices], minlength=len(frame))
+
+    if base is not None:
+        indptr = np.concatenate([base.indptr, base.indptr[-1] + new_indptr[1:]])
+        indices = np.concatenate([remap[base.indices], new_indices])
+        multiplicity = np.concatenate([base.multiplicity, new_multiplicity])
+        salaries = np.concatenate([base.salaries, new_salaries])
+        required_exp = np.concatenate([base.required_exp, new_required_exp])
+        old_max_tfidf = _reweighted_max_tfidf(base, remap, skill_counts, size) if old_size else np.zeros(0)
+        max_tfidf = np.concatenate([old_max_tfidf, new_max_tfidf])
+        critical_required = np.concatenate([base.critical_required, new_critical_required])
+        role_names, role_codes = _merge_codes(base.role_names, base.role_codes, new_roles)
+        family_names, family_codes = _merge_codes(base.family_names, base.family_codes, new_families)
+        location_names, location_codes = _merge_codes(base.location_names, base.location_codes, new_locations)
+        old_roles = np.asarray(base.role_names)
+        role_first_row = np.full(len(role_names), size, dtype=np.int64)
+        role_listed_skills = np.zeros(len(role_names), dtype=np.result_type(base.role_listed_skills, new_listed))
+        old_positions = np.searchsorted(role_names, old_roles)
+        role_first_row[old_positions] = base.role_first_row
+        role_listed_skills[old_positions] = base.role_listed_skills
+        old_experience = np.repeat(np.asarray(base.meta["experience_values"], dtype=np.float64),
+                                   np.diff(base.meta["experience_offsets"]))
+        old = {
+            "postings": (base.postings_indices, base.postings_indptr),
+            "family": (base.family_rows, base.family_offsets, np.searchsorted(family_names, base.family_names)),
+            "location": (base.location_rows, base.location_offsets,
+                         np.searchsorted(location_names, base.location_names)),
+            "experience": (base.experience_order, old_experience),
+            "salary": (base.salary_order, np.asarray(base.salary_sorted, dtype=np.float64))
+        }
+    else:
+        indptr, indices, multiplicity = new_indptr, new_indices, new_multiplicity
+        salaries, required_exp = new_salaries, new_required_exp
+        max_tfidf, critical_required = new_max_tfidf, new_critical_required
+        role_names, role_codes = _merge_codes(None, None, new_roles)
+        family_names, family_codes = _merge_codes(None, None, new_families)
+        location_names, location_codes = _merge_codes(None, None, new_locations)
+        role_first_row = np.full(len(role_names), size, dtype=np.int64)
+        role_listed_skills = np.zeros(len(role_names), dtype=new_listed.dtype)
+        no_groups = (np.zeros(0, dtype=np.int32), np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int64))
+        no_order = (np.zeros(0, dtype=np.int32), np.zeros(0))
+        old = {"postings": no_groups[:2], "family": no_groups, "location": no_groups,
+               "experience": no_order, "salary": no_order}
+
+    # Roles first seen in the new rows point at their first new row
+    new_codes = role_codes[old_size:]
+    first_new = np.full(len(role_names), size, dtype=np.int64)
+    np.minimum.at(first_new, new_codes, np.arange(old_size, size))
+    fresh = (role_first_row == size) & (first_new < size)
+    role_first_row[fresh] = first_new[fresh]
+    role_listed_skills[fresh] = new_listed[first_new[fresh] - old_size]
+
+    # Postings: each skill's old jobs, then the new jobs listing it
+    postings_indices, postings_indptr = _merge_groups(
+        *old["postings"], remap, new_indices, new_entry_rows + old_size, len(vocabulary)
+    )
+    new_rows = np.arange(old_size, size, dtype=np.int32)
+    family_rows, family_offsets = _merge_groups(
+        *old["family"], family_codes[old_size:], new_rows, len(family_names)
+    )
+    location_rows, location_offsets = _merge_groups(
+        *old["location"], location_codes[old_size:], new_rows, len(location_names)
+    )
+    experience_order, experience_sorted = _merge_order(*old["experience"], new_required_exp, old_size)
+    salary_order, salary_sorted = _merge_order(*old["salary"], new_salaries.astype(np.float64), old_size)
+    starts = np.flatnonzero(np.diff(experience_sorted, prepend=np.nan) != 0)
+
+    meta = {
+        "format": CATALOG_FORMAT_VERSION,
+        "ontology_version": ONTOLOGY.version,
+        "size": size,
+        "vocabulary": vocabulary,
+        "experience_values": experience_sorted[starts].tolist(),
+        "experience_offsets": starts.tolist() + [size]
+    }
+    arrays = {
+        "indptr": indptr,
+        "indices": indices,
+        "multiplicity": multiplicity,
+        "postings_indptr": postings_indptr,
+        "postings_indices": postings_indices,
+        "skill_counts": skill_counts,
+        "salaries": salaries,
+        "required_exp": required_exp,
+        "max_tfidf": max_tfidf,
+        "critical_required": critical_required,
+        "experience_order": experience_order,
+        "role_codes": role_codes,
+        "role_names": role_names,
+        "role_first_row": role_first_row,
+        "role_listed_skills": role_listed_skills,
+        "salary_order": salary_order,
+        "salary_sorted": salary_sorted,
+        "family_names": family_names,
+        "family_codes": family_codes,
+        "family_rows": family_rows,
+        "family_offsets": family_offsets,
+        "location_names": location_names,
+        "location_codes": location_codes,
+        "location_rows": location_rows,
+        "location_offsets": location_offsets
+    }
+    return meta, arrays
+
+
+def current_version(path: str) -> Optional[str]:
+    """Name of the snapshot the catalog directory points at (None for a flat directory)"""
+    try:
+        return os.readlink(os.path.join(path, _CURRENT))
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def _prune_snapshots(path: str, keep):
+    """Remove snapshots older than the kept ones, and flat-layout files once a snapshot replaced them"""
+    for entry in os.scandir(path):
+        if entry.is_dir(follow_symlinks=False) and entry.name.startswith("v") and entry.name not in keep:
+            shutil.rmtree(entry.path, ignore_errors=True)
+        elif None not in keep and entry.is_file(follow_symlinks=False) and (
+                entry.name == "meta.json" or entry.name.endswith(".npy")):
+            os.remove(entry.path)
+
+
+@contextmanager
+def _directory_lock(path: str):
+    """Serializes appends to one catalog directory across worker processes"""
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, ".lock"), "w") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def load_catalog() -> JobCatalog:
+    """The compiled catalog at JOB_CATALOG_PATH if present and current, else compiled from the CSV"""
+    if current_version(JOB_CATALOG_PATH) or os.path.exists(os.path.join(JOB_CATALOG_PATH, "meta.json")):
+        try:
+            catalog = JobCatalog.open(JOB_CATALOG_PATH)
+            print(f"[JobCatalog] Mapped {catalog.size} jobs from {JOB_CATALOG_PATH}")
+            return catalog
+        except (ValueError, OSError) as e:
+            print(f"[JobCatalog] ⚠ Ignoring compiled catalog ({e}); compiling {os.path.basename(DATA_PATH)}")
+    return JobCatalog.from_csv(DATA_PATH)
+
+
+def get_catalog() -> JobCatalog:
+    """
+    The current snapshot; grab it once per request and use it throughout.
+
+    A memory-mapped catalog is re-checked at most every
+    JOB_CATALOG_RECHECK_SECONDS, so a snapshot saved by another worker
+    process (an append it served) is picked up without a restart.
+    """
+    catalog = _catalog
+    if catalog is None:
+        with _build_lock:
+            if _catalog is None:
+                _install(load_catalog())
+        catalog = _catalog
+    elif catalog.path and time.monotonic() - _state["checked_at"] >= JOB_CATALOG_RECHECK_SECONDS:
+        catalog = _refresh(catalog)
+    return catalog
+
+
+def _refresh(catalog: JobCatalog) -> JobCatalog:
+    _state["checked_at"] = time.monotonic()
+    try:
+        version = current_version(catalog.path)
+    except OSError:
+        return catalog
+    # Never wait here: a build in progress installs its own snapshot
+    if version == catalog.version or not _build_lock.acquire(blocking=False):
+        return catalog
+    try:
+        if _catalog is not catalog:
+            return _catalog
+        fresh = JobCatalog.open(catalog.path)
+        _install(fresh)
+        print(f"[JobCatalog] Snapshot {_state['generation']}: mapped {fresh.version} ({fresh.size} jobs) saved by another process")
+        return fresh
+    except (ValueError, OSError) as e:
+        print(f"[JobCatalog] ⚠ Keeping the current snapshot ({e})")
+        return catalog
+    finally:
+        _build_lock.release()
+
+
+def set_catalog(catalog: Optional[JobCatalog]):
+    """Install a catalog (None reloads from disk on next use)"""
+    global _catalog
+    _catalog = catalog
+
+
+def _install(catalog: JobCatalog):
+    # A single reference assignment: requests see either the old or the new snapshot
+    set_catalog(catalog)
+    _state["generation"] += 1
+    _state["loaded_at"] = time.time()
+
+
+def reload_catalog() -> JobCatalog:
+    """Rebuild the snapshot from disk (compiled catalog or CSV) and swap it in"""
+    return _build(load_catalog)
+
+
+def append_jobs(frame: pd.DataFrame) -> JobCatalog:
+    """
+    Add jobs to the current snapshot and swap the result in. A memory-mapped
+    catalog is written back to its directory and remapped, so appends survive
+    restarts; a catalog compiled from the CSV keeps them in memory only.
+    """
+    frame = _checked_jobs(frame)
+
+    def build():
+        base = get_catalog()
+        if not base.path:
+            return base.append(frame)
+        # Append to the newest saved snapshot, which another worker may have written
+        with _directory_lock(base.path):
+            if current_version(base.path) != base.version:
+                base = JobCatalog.open(base.path)
+            base.append(frame).save(base.path)
+        return JobCatalog.open(base.path)
+
+    return _build(build)
+
+
+def _checked_jobs(frame: pd.DataFrame) -> pd.DataFrame:
+    """The frame with numeric columns coerced; ValueError names the first bad field"""
+    missing = {"role", "skills", "salary_lpa"} - set(frame.columns)
+    if missing:
+        raise ValueError(f"Jobs are missing fields: {', '.join(sorted(missing))}")
+    frame = frame.copy()
+    for column, required in (("salary_lpa", True), ("experience_required", False)):
+        if column not in frame:
+            continue
+        values = pd.to_numeric(frame[column], errors="coerce")
+        bad = values.isna() & (frame[column].notna() | required) | ~np.isfinite(values.fillna(0))
+        if bad.any():
+            row = int(np.flatnonzero(bad)[0])
+            raise ValueError(f"Job {row}: {column} must be a number, got {frame[column].iloc[row]!r}")
+        frame[column] = values
+    return frame
+
+
+def _build(builder) -> JobCatalog:
+    with _build_lock:
+        _state["building"] = True
+        try:
+            catalog = builder()
+        except Exception as e:
+            _state["last_error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _state["building"] = False
+        _state["last_error"] = None
+        _install(catalog)
+        print(f"[JobCatalog] Snapshot {_state['generation']}: {catalog.size} jobs, {len(catalog.vocabulary)} skills")
+        return catalog
+
+
+def catalog_status() -> Dict:
+    catalog = get_catalog()
+    return {
+        "generation": _state["generation"],
+        "jobs": catalog.size,
+        "skills": len(catalog.vocabulary),
+        "memory_mapped": catalog.path is not None,
+        "loaded_at": _state["loaded_at"],
+        "building": _state["building"],
+        "last_error": _state["last_error"]
+    }
@@ -1,16 +1,16 @@
-import pandas as pd
-import os
-from typing import List, Dict
+from typing import List, Dict, Optional
 from collections import Counter
+import heapq
 import math
 
-BASE_DIR = os.path.dirname(os.path.dirname(__file__))
-DATA_PATH = os.path.join(BASE_DIR, "jobs_dataset.csv")
+import numpy as np
 
-df = pd.read_csv(DATA_PATH)
+from .job_catalog import JobCatalog, get_catalog
+from .semantic_index import JOB_MATCH_SEMANTIC_CANDIDATES, blend, semantic_query
+from .skill_ontology import ONTOLOGY
 
 
-def match_jobs(candidate_skills: List[str], experience_years: int = 0) -> List[Dict]:
+def match_jobs(candidate_skills: List[str], experience_years: int = 0, top_k: Optional[int] = None) -> List[Dict]:
     """
     Advanced job matching algorithm using multi-factor scoring.
     
@@ -20,61 +20,110 @@ def match_jobs(candidate_skills: List[str], experience_years: int = 0) -> List[D
     3. Experience level alignment
     4. Rarity bonus for specialized skills
     5. Composite scoring with normalized weights
+
+    Only jobs sharing a skill with the candidate (found through the inverted
+    index) are scored, in one vectorized pass; every other job scores on
+    experience fit alone. With top_k, the best k are picked with a bounded
+    heap and result dicts are built for those only. The order is the same
+    as sorting all jobs by match_score (ties keep catalog order).
+
+    When skill embeddings are installed, semantic similarity is blended in
+    as one more factor (see semantic_index).
     """
     
-    # Build skill frequency map across all jobs (for TF-IDF)
-    all_job_skills = []
-    for _, row in df.iterrows():
-        job_skills = [s.strip().lower() for s in str(row["skills"]).split(",")]
-        all_job_skills.extend(job_skills)
-    
-    skill_frequency = Counter(all_job_skills)
-    total_jobs = len(df)
+    catalog = get_catalog()
+    candidate = catalog.candidate_vector(candidate_skills)
+    scores = catalog.score(candidate, experience_years)
+    semantic = semantic_query(catalog, candidate_skills)
+    return rank_matches(catalog, candidate, experience_years, scores, semantic, top_k)
+
+
+def rank_matches(catalog: JobCatalog, candidate, experience_years: int, scores: Dict, semantic,
+                 top_k: Optional[int]) -> List[Dict]:
+    """
+    match_jobs results from the factors of the skill-sharing jobs (`scores`,
+    as returned by JobCatalog.score) and the optional semantic query.
+    """
+    touched, finals = scores["rows"], scores["final"]
+    similarities = None
+    if semantic is not None:
+        index, query = semantic
+        similarities = np.maximum(index.similarities(query, touched), 0.0)
+        finals = blend(finals, similarities)
+    positions = np.arange(len(touched))
+    if top_k is not None and 0 < top_k < len(touched):
+        # Ranking rounds to 0.01 points, so only jobs within 2e-4 of the k-th best can make the top k
+        kth = np.partition(finals, len(finals) - top_k)[len(finals) - top_k]
+        positions = np.flatnonzero(finals >= kth - 2e-4)
     
-    # Normalize candidate skills
-    candidate_skills_norm = [s.strip().lower() for s in candidate_skills]
+    # (row, final score, position in `scores` or None for jobs without shared skills, semantic similarity)
+    pool = [
+        (int(touched[i]), float(finals[i]), i, float(similarities[i]) if similarities is not None else None)
+        for i in positions.tolist()
+    ]
+    others = list(catalog.untouched_rows(experience_years, touched, top_k))
+    if semantic is None:
+        pool.extend((row, fit * 0.15, None, None) for row, fit in others)
+    else:
+        pool.extend(_with_semantic(catalog, experience_years, semantic, touched, others, top_k))
     
-    results = []
+    def rank(entry):
+        return round(entry[1] * 100, 2), -entry[0]
     
-    for _, row in df.iterrows():
-        job_skills = [s.strip().lower() for s in str(row["skills"]).split(",")]
-        
-        # Calculate multiple scoring factors
-        scores = calculate_match_scores(
-            candidate_skills_norm,
-            job_skills,
-            skill_frequency,
-            total_jobs,
-            experience_years,
-            row.get("experience_required", 0)
-        )
-        
-        # Composite final score (weighted average)
-        final_score = (
-            scores["skill_overlap"] * 0.30 +
-            scores["tfidf_score"] * 0.25 +
-            scores["skill_importance"] * 0.20 +
-            scores["experience_match"] * 0.15 +
-            scores["rarity_bonus"] * 0.10
-        )
-        
-        results.append({
-            "role": row["role"],
-            "match_score": round(final_score * 100, 2),
-            "salary": row["salary_lpa"],
-            "score_breakdown": {
-                "skill_overlap": round(scores["skill_overlap"] * 100, 1),
-                "tfidf_weighted": round(scores["tfidf_score"] * 100, 1),
-                "skill_importance": round(scores["skill_importance"] * 100, 1),
-                "experience_fit": round(scores["experience_match"] * 100, 1),
-                "rarity_bonus": round(scores["rarity_bonus"] * 100, 1)
-            },
-            "matched_skills": scores["matched_skills"],
-            "missing_skills": scores["missing_skills"],
-            "fit_level": classify_fit(final_score)
-        })
-    
-    return sorted(results, key=lambda x: x["match_score"], reverse=True)
+    winners = heapq.nlargest(top_k, pool, key=rank) if top_k is not None else sorted(pool, key=rank, reverse=True)
+    return [_job_result(catalog, candidate, experience_years, scores, entry) for entry in winners]
+
+
+def _with_semantic(catalog: JobCatalog, experience_years: int, semantic, touched: np.ndarray,
+                   others: List, top_k: Optional[int]) -> List:
+    """
+    Pool entries for jobs sharing no skill, with semantic similarity blended
+    in. With top_k, the jobs nearest the candidate in embedding space join
+    them (e.g. "deep learning" roles for a "pytorch" candidate); without it
+    every job is already there.
+    """
+    index, query = semantic
+    if top_k is not None:
+        pooled = set(touched.tolist()) | {row for row, _ in others}
+        neighbours, _ = index.search(query, max(top_k, JOB_MATCH_SEMANTIC_CANDIDATES))
+        extra = np.array([row for row in neighbours.tolist() if row not in pooled], dtype=np.int64)
+        if len(extra):
+            fits = catalog.experience_match(experience_years, np.asarray(catalog.required_exp[extra]))
+            others = others + list(zip(extra.tolist(), fits.tolist()))
+    rows = np.array([row for row, _ in others], dtype=np.int64)
+    similarities = np.maximum(index.similarities(query, rows), 0.0).tolist()
+    finals = blend(np.array([fit * 0.15 for _, fit in others]), np.array(similarities)).tolist()
+    return [(row, final, None, similarity) for (row, _), final, similarity in zip(others, finals, similarities)]
+
+
+def _job_result(catalog: JobCatalog, candidate, experience_years: int, scores: Dict, entry) -> Dict:
+    row, final_score, position, semantic_match = entry
+    matched_skills, missing_skills = catalog.skill_split(row, candidate)
+    if position is None:
+        experience_match = float(catalog.experience_match(experience_years, catalog.required_exp[row]))
+        factors = {"skill_overlap": 0.0, "tfidf_score": 0.0, "skill_importance": 0.0,
+                   "experience_match": experience_match, "rarity_bonus": 0.0}
+    else:
+        factors = {name: float(scores[name][position]) for name in
+                   ("skill_overlap", "tfidf_score", "skill_importance", "experience_match", "rarity_bonus")}
+    result = {
+        "role": catalog.role(row),
+        "match_score": round(final_score * 100, 2),
+        "salary": catalog.salary(row),
+        "score_breakdown": {
+            "skill_overlap": round(factors["skill_overlap"] * 100, 1),
+            "tfidf_weighted": round(factors["tfidf_score"] * 100, 1),
+            "skill_importance": round(factors["skill_importance"] * 100, 1),
+            "experience_fit": round(factors["experience_match"] * 100, 1),
+            "rarity_bonus": round(factors["rarity_bonus"] * 100, 1)
+        },
+        "matched_skills": matched_skills,
+        "missing_skills": missing_skills,
+        "fit_level": classify_fit(final_score)
+    }
+    if semantic_match is not None:
+        result["score_breakdown"]["semantic_match"] = round(semantic_match * 100, 1)
+    return result
 
 
 def calculate_match_scores(
@@ -87,14 +136,16 @@ def calculate_match_scores(
 ) -> Dict:
     """Calculate multiple matching scores using different algorithms"""
     
-    # 1. Basic skill overlap (Jaccard similarity)
-    candidate_set = set(candidate_skills)
-    job_set = set(job_skills)
+    # 1. Basic skill overlap (Jaccard similarity) on ontology bitsets
+    candidate_bits, candidate_unknown = ONTOLOGY.to_bitset(candidate_skills)
+    job_bits, job_unknown = ONTOLOGY.to_bitset(job_skills)
     
-    matched_skills = list(candidate_set.intersection(job_set))
-    missing_skills = list(job_set.difference(candidate_set))
+    matched_bits = candidate_bits & job_bits
+    matched_skills = ONTOLOGY.names(matched_bits) + sorted(candidate_unknown & job_unknown)
+    missing_skills = ONTOLOGY.names(job_bits & ~candidate_bits) + sorted(job_unknown - candidate_unknown)
     
-    skill_overlap = len(matched_skills) / len(job_set) if job_set else 0
+    job_size = job_bits.bit_count() + len(job_unknown)
+    skill_overlap = len(matched_skills) / job_size if job_size else 0
     
     # 2. TF-IDF weighted matching
     # Skills that are rare across jobs should count more
@@ -114,13 +165,10 @@ def calculate_match_scores(
     
     # 3. Skill importance scoring
     # Give more weight to critical skills (programming languages, frameworks)
-    critical_skills = {
-        "python", "java", "javascript", "react", "node.js", "sql", 
-        "aws", "docker", "kubernetes", "machine learning", "typescript"
-    }
+    critical_mask = ONTOLOGY.flag_mask("match_critical")
     
-    critical_matched = sum(1 for s in matched_skills if s in critical_skills)
-    critical_required = sum(1 for s in job_skills if s in critical_skills)
+    critical_matched = (matched_bits & critical_mask).bit_count()
+    critical_required = (job_bits & critical_mask).bit_count()
     
     skill_importance = critical_matched / max(critical_required, 1) if critical_required > 0 else skill_overlap
     
@@ -176,32 +224,62 @@ def rank_jobs_by_multiple_criteria(
     Filters can include:
     - min_salary: Minimum salary requirement
     - max_salary: Maximum salary (to avoid over-qualified)
-    - location: Preferred location
-    - remote: Remote work preference
-    - company_size: Startup vs Enterprise
+    - min_experience / max_experience: Required experience window
+    - role_families: Acceptable role families
+    - locations: Preferred locations
     """
+    return rank_jobs_page(candidate_skills, filters)["results"]
+
+
+def rank_jobs_page(candidate_skills: List[str], filters: Dict, offset: int = 0,
+                   limit: Optional[int] = None) -> Dict:
+    """
+    One page of rank_jobs_by_multiple_criteria plus the total number of jobs
+    passing the filters.
+
+    Filters are evaluated first against the catalog's indexes, so only the
+    surviving jobs are scored; result dicts are built for the page only.
+    """
+    catalog = get_catalog()
+    experience_years = filters.get("experience_years", 0)
+    candidate = catalog.candidate_vector(candidate_skills)
+    rows = catalog.filter_rows(filters)
+    if rows is None:
+        rows = np.arange(catalog.size)
+    scores = catalog.score(candidate, experience_years, rows)
+    finals, similarities = scores["final"], None
+    semantic = semantic_query(catalog, candidate_skills)
+    if semantic is not None:
+        index, query = semantic
+        similarities = np.maximum(index.similarities(query, rows), 0.0)
+        finals = blend(finals, similarities)
+    
+    match_scores = np.array([round(value * 100, 2) for value in finals.tolist()])
+    preference_scores = _preference_scores(np.asarray(catalog.salaries[rows], dtype=np.float64), filters)
+    final_scores = (match_scores * 0.7) + (preference_scores * 0.3)
     
-    jobs = match_jobs(candidate_skills, filters.get("experience_years", 0))
-    
-    # Apply filters
-    filtered_jobs = []
-    for job in jobs:
-        # Salary filter
-        if "min_salary" in filters:
-            if job["salary"] < filters["min_salary"]:
-                continue
-        
-        if "max_salary" in filters:
-            if job["salary"] > filters["max_salary"]:
-                continue
-        
-        # Add preference score
-        job["preference_score"] = calculate_preference_score(job, filters)
-        job["final_score"] = (job["match_score"] * 0.7) + (job["preference_score"] * 0.3)
-        
-        filtered_jobs.append(job)
-    
-    return sorted(filtered_jobs, key=lambda x: x["final_score"], reverse=True)
+    # Best final score first; ties keep match_jobs order (match score, then catalog order)
+    order = np.lexsort((rows, -match_scores, -final_scores))
+    page = order[offset:offset + limit] if limit is not None else order[offset:]
+    
+    results = []
+    for position in page.tolist():
+        job = _job_result(catalog, candidate, experience_years, scores,
+                          (int(rows[position]), float(finals[position]), position,
+                           float(similarities[position]) if similarities is not None else None))
+        job["preference_score"] = float(preference_scores[position])
+        job["final_score"] = float(final_scores[position])
+        results.append(job)
+    return {"total": len(rows), "offset": offset, "results": results}
+
+
+def _preference_scores(salaries: np.ndarray, filters: Dict) -> np.ndarray:
+    """calculate_preference_score for a whole column of salaries"""
+    scores = np.full(len(salaries), 50.0)
+    if filters.get("min_salary") is not None and filters.get("max_salary") is not None:
+        mid_salary = (filters["min_salary"] + filters["max_salary"]) / 2
+        scores += np.maximum(0, 30 - np.abs(salaries - mid_salary) * 0.1)
+    return np.minimum(scores, 100.0)
 
 
 def calculate_preference_score(job: Dict, filters: Dict) -> float:
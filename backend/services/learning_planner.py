@@ -0,0 +1,307 @@
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .job_catalog import JobCatalog, get_catalog
+from .skill_gap import generate_learning_path
+from .skill_graph import SKILL_GRAPH
+from .skill_ontology import ONTOLOGY
+
+# Match score (0-100) a plan has to reach by default ("Strong Fit")
+LEARNING_PLAN_THRESHOLD = float(os.getenv("LEARNING_PLAN_THRESHOLD", "65"))
+# Jobs missing more skills than this are planned greedily instead of exhaustively (2^n subsets)
+LEARNING_PLAN_MAX_MISSING = int(os.getenv("LEARNING_PLAN_MAX_MISSING", "12"))
+# Distinct missing-skill sets searched per plan before settling for the best plan found
+LEARNING_PLAN_MAX_SKILL_SETS = int(os.getenv("LEARNING_PLAN_MAX_SKILL_SETS", "256"))
+
+# Same pace as skill_gap.estimate_learning_time
+_HOURS_PER_WEEK = 10
+
+
+class RoleRequirements:
+    """
+    The distinct requirement profiles (skill set, required experience) of one
+    catalog role, with each skill's weight in the match score precomputed.
+
+    match_jobs' composite score is linear in the skills a candidate has,
+    except for the capped rarity bonus: per profile, `linear` holds what each
+    of the role's skill columns adds (overlap, TF-IDF and importance terms)
+    and `rare` whether it counts toward the rarity bonus.
+    """
+
+    def __init__(self, catalog: JobCatalog, code: int):
+        rows = np.flatnonzero(np.asarray(catalog.role_codes) == code)
+        profiles: Dict[Tuple, int] = {}
+        for row in rows.tolist():
+            columns = tuple(catalog.indices[catalog.indptr[row]:catalog.indptr[row + 1]].tolist())
+            key = (columns, float(catalog.required_exp[row]), float(catalog.max_tfidf[row]),
+                   float(catalog.critical_required[row]))
+            profiles.setdefault(key, row)
+
+        self.rows = np.array(list(profiles.values()), dtype=np.int64)
+        self.required_exp = np.asarray(catalog.required_exp[self.rows], dtype=np.float64)
+        self.columns = np.array(sorted(set().union(*(key[0] for key in profiles))), dtype=np.int64)
+        positions = {column: i for i, column in enumerate(self.columns.tolist())}
+
+        self.linear = np.zeros((len(self.rows), len(self.columns)))
+        self.rare = np.zeros((len(self.rows), len(self.columns)))
+        for p, (columns, _, max_tfidf, critical_required) in enumerate(profiles):
+            size = len(columns)
+            for column in columns:
+                weight = 0.30 / size
+                if max_tfidf > 0:
+                    weight += 0.25 * catalog.idf[column] / max_tfidf
+                weight += 0.20 * (catalog.critical[column] / critical_required if critical_required > 0 else 1 / size)
+                self.linear[p, positions[column]] = weight
+                self.rare[p, positions[column]] = catalog.rare[column]
+
+    def scores(self, catalog: JobCatalog, have: np.ndarray, experience_years: int) -> np.ndarray:
+        """Composite score per profile for a 0/1 vector over self.columns"""
+        linear = self.linear @ have
+        rare = self.rare @ have
+        experience = 0.15 * catalog.experience_match(experience_years, self.required_exp)
+        return linear + experience + 0.10 * np.minimum(rare * 0.15, 0.5)
+
+
+def plan_learning(candidate_skills: List[str], target_roles: Sequence[str], experience_years: int = 0,
+                  threshold: Optional[float] = None) -> Dict:
+    """
+    Cheapest set of skills to learn (in ontology learning hours, prerequisites
+    included) for the candidate to reach `threshold` match score on a job of
+    any of the target roles.
+
+    Every distinct requirement profile of the roles gets a lower bound on its
+    cost (fractional knapsack over its missing skills), and profiles are then
+    solved exactly in bound order, enumerating subsets of their missing
+    skills with the prerequisite closure of each, until no remaining bound
+    can beat the best plan ("optimal" is false when the search budget or
+    the greedy fallback for very large gaps cut it short). Scores are match_jobs' composite score without
+    semantic matching.
+    """
+    threshold = LEARNING_PLAN_THRESHOLD if threshold is None else float(threshold)
+    catalog = get_catalog()
+    requirements = [(role, role_requirements(catalog, role)) for role in _resolve_roles(catalog, target_roles)]
+    candidate = catalog.candidate_vector(candidate_skills)
+    known_bits, _ = ONTOLOGY.to_bitset(candidate_skills)
+    hours, skill_ids = _column_skills(catalog)
+    target = threshold / 100 - 1e-9
+
+    # Lower bounds of every profile; profiles are taken in bound order, and
+    # all profiles of the role missing the same skills share one search
+    bounds, missing, keys, owners = [], [], [], []
+    before = 0.0
+    for r, (role, reqs) in enumerate(requirements):
+        have = candidate[reqs.columns]
+        base = reqs.scores(catalog, have, experience_years)
+        before = max(before, float(base.max()))
+        missing.append((reqs.linear > 0) & (have == 0))
+        # One comparable value per profile for its missing-skill mask
+        packed = np.ascontiguousarray(np.packbits(missing[r], axis=1))
+        keys.append(packed.view(np.dtype((np.void, packed.shape[1]))).ravel() if packed.shape[1] else np.zeros(len(base)))
+        bounds.append(_lower_bounds(reqs, missing[r], hours[reqs.columns], base, target))
+        owners.append(np.stack([np.full(len(base), r), np.arange(len(base))], axis=1))
+    bounds, owners = np.concatenate(bounds), np.concatenate(owners)
+    covered = [np.zeros(len(reqs.rows), dtype=bool) for _, reqs in requirements]
+
+    best = None
+    optimal = True
+    solved = 0
+    for i in np.argsort(bounds, kind="stable").tolist():
+        r, p = owners[i].tolist()
+        if not np.isfinite(bounds[i]) or (best is not None and bounds[i] >= best[0] - 1e-9):
+            break
+        if covered[r][p]:
+            continue
+        if solved >= LEARNING_PLAN_MAX_SKILL_SETS:
+            optimal = False
+            break
+        role, reqs = requirements[r]
+        profiles = np.flatnonzero((keys[r] == keys[r][p]) & ~covered[r])
+        covered[r][profiles] = True
+        plan = _solve_group(catalog, reqs, profiles, reqs.columns[missing[r][p]].tolist(), candidate,
+                            known_bits, skill_ids, experience_years, target)
+        solved += 1
+        optimal = optimal and plan[3]
+        if np.isfinite(plan[0]) and (best is None or (plan[0], -plan[1]) < (best[0], -best[1])):
+            best = plan[:3] + (role,)
+
+    result = {
+        "threshold": threshold,
+        "match_score_before": round(before * 100, 2),
+        "reachable": best is not None,
+        "optimal": optimal,
+        "role": None,
+        "match_score": None,
+        "skills_to_learn": [],
+        "learning_path": [],
+        "total_hours": 0,
+        "estimated_time_weeks": 0
+    }
+    if best is not None:
+        cost, score, targets, role = best
+        path = generate_learning_path(targets, candidate_skills)
+        result.update({
+            "role": role,
+            "match_score": round(score * 100, 2),
+            "skills_to_learn": [entry["skill"] for entry in path],
+            "learning_path": path,
+            "total_hours": int(round(cost)),
+            "estimated_time_weeks": max(round(cost / _HOURS_PER_WEEK), 1) if cost else 0
+        })
+    return result
+
+
+def role_requirements(catalog: JobCatalog, role: str) -> RoleRequirements:
+    """Requirement profiles of a role, built once per catalog snapshot"""
+    cache = catalog.derived.setdefault("role_requirements", {})
+    reqs = cache.get(role)
+    if reqs is None:
+        code = int(np.searchsorted(catalog.role_names, role))
+        reqs = cache[role] = RoleRequirements(catalog, code)
+    return reqs
+
+
+def _resolve_roles(catalog: JobCatalog, target_roles: Sequence[str]) -> List[str]:
+    """Catalog role names for the requested roles (case-insensitive); unknown roles are an error"""
+    names = {str(name).lower(): str(name) for name in catalog.role_names.tolist()}
+    resolved, unknown = [], []
+    for role in target_roles:
+        name = names.get(role.strip().lower())
+        if name is None:
+            unknown.append(role)
+        elif name not in resolved:
+            resolved.append(name)
+    if unknown:
+        raise ValueError(f"Unknown role(s): {', '.join(unknown)}")
+    if not resolved:
+        raise ValueError("At least one target role is required")
+    return resolved
+
+
+def _column_skills(catalog: JobCatalog) -> Tuple[np.ndarray, List[Optional[int]]]:
+    """Learning hours and ontology id (None for unknown skills) per catalog column"""
+    cached = catalog.derived.get("column_skills")
+    if cached is None:
+        skill_ids = [ONTOLOGY.skill_id(name) for name in catalog.vocabulary]
+        hours = np.array([
+            ONTOLOGY.skills[skill_id].learning_hours if skill_id is not None else ONTOLOGY.default_learning_hours
+            for skill_id in skill_ids
+        ], dtype=np.float64)
+        cached = catalog.derived["column_skills"] = (hours, skill_ids)
+    return cached
+
+
+def _lower_bounds(reqs: RoleRequirements, missing: np.ndarray, hours: np.ndarray, base: np.ndarray,
+                  target: float) -> np.ndarray:
+    """
+    Per profile, a lower bound on the hours needed to reach `target`: the
+    fractional knapsack over its missing skills, each at its own hours and at
+    most its linear weight plus full rarity credit. inf when even every
+    missing skill is not enough.
+    """
+    deficit = target - base
+    gains = np.where(missing, reqs.linear + 0.015 * reqs.rare, 0.0)
+    costs = np.where(missing, hours, 0.0)
+    order = np.argsort(np.divide(costs, gains, out=np.full(gains.shape, np.inf), where=gains > 0), axis=1)
+    gains, costs = np.take_along_axis(gains, order, 1), np.take_along_axis(costs, order, 1)
+    cumulative = np.cumsum(gains, axis=1)
+    if not cumulative.shape[1]:
+        return np.where(deficit <= 0, 0.0, np.inf)
+    reached = np.argmax(cumulative >= deficit[:, None], axis=1)
+    picked = np.arange(len(base))
+    spent = np.cumsum(costs, axis=1)[picked, reached] - costs[picked, reached]
+    short = deficit - (cumulative[picked, reached] - gains[picked, reached])
+    fraction = np.divide(short, gains[picked, reached], out=np.zeros(len(base)), where=gains[picked, reached] > 0)
+    bounds = spent + fraction * costs[picked, reached]
+    bounds[deficit <= 0] = 0.0
+    # The bound's rarity credit is uncapped, so this only drops profiles that cannot make it
+    bounds[cumulative[:, -1] < deficit] = np.inf
+    return bounds
+
+
+def _solve_group(catalog: JobCatalog, reqs: RoleRequirements, profiles: np.ndarray, missing: List[int],
+                 candidate: np.ndarray, known_bits: int, skill_ids: List[Optional[int]], experience_years: int,
+                 target: float) -> Tuple[float, float, List[str], bool]:
+    """
+    (hours, score, skills to learn, exact) of the cheapest plan reaching
+    `target` on any of the given profiles, which all miss the same catalog
+    columns; (inf, 0, [], exact) when none does. Learning a skill means
+    learning its missing prerequisites too, and those may be required by
+    the job as well.
+    """
+    positions = {column: i for i, column in enumerate(reqs.columns.tolist())}
+
+    # Items: the missing columns plus the prerequisites they pull in
+    items: Dict[str, int] = {}
+    needs = []
+    for column in missing:
+        names = [catalog.vocabulary[column]]
+        if skill_ids[column] is not None:
+            names += ONTOLOGY.names(SKILL_GRAPH.closure[skill_ids[column]] & ~known_bits)
+        for name in names:
+            items.setdefault(name, len(items))
+        needs.append([items[name] for name in names])
+    names = list(items)
+    needed = np.zeros((len(missing), len(names)))
+    for i, indices in enumerate(needs):
+        needed[i, indices] = 1.0
+
+    item_hours = np.zeros(len(names))
+    # Per profile, what each item adds to the score (0 for prerequisites the job does not list)
+    item_linear = np.zeros((len(profiles), len(names)))
+    item_rare = np.zeros((len(profiles), len(names)))
+    for i, name in enumerate(names):
+        entry = ONTOLOGY.get(name)
+        item_hours[i] = entry.learning_hours if entry else ONTOLOGY.default_learning_hours
+        position = positions.get(catalog.columns.get(name, -1))
+        if position is not None:
+            item_linear[:, i] = reqs.linear[profiles, position]
+            item_rare[:, i] = reqs.rare[profiles, position]
+
+    have = candidate[reqs.columns]
+    base_linear = reqs.linear[profiles] @ have
+    base_rare = reqs.rare[profiles] @ have
+    experience = 0.15 * catalog.experience_match(experience_years, reqs.required_exp[profiles])
+
+    def score(learned: np.ndarray) -> np.ndarray:
+        """Scores of every profile (last axis) for learned item vectors"""
+        linear = base_linear + learned @ item_linear.T
+        rare = base_rare + learned @ item_rare.T
+        return linear + experience + 0.10 * np.minimum(rare * 0.15, 0.5)
+
+    if len(missing) > LEARNING_PLAN_MAX_MISSING:
+        plans = [_greedy(needed, item_hours, lambda learned, p=p: score(learned)[..., p], names, target)
+                 for p in range(len(profiles))]
+        return min(plans, key=lambda plan: (plan[0], -plan[1])) + (False,)
+
+    subsets = (np.arange(1 << len(missing))[:, None] >> np.arange(len(missing)) & 1).astype(np.float64)
+    learned = (subsets @ needed > 0).astype(np.float64)
+    costs = learned @ item_hours
+    scores = score(learned)
+    subset, profile = np.nonzero(scores >= target)
+    if not len(subset):
+        return float("inf"), 0.0, [], True
+    # Cheapest, then highest score, then fewest skills
+    best = np.lexsort((learned[subset].sum(axis=1), -scores[subset, profile], costs[subset]))[0]
+    chosen = subset[best]
+    return (float(costs[chosen]), float(scores[chosen, profile[best]]),
+            [names[i] for i in np.flatnonzero(learned[chosen])], True)
+
+
+def _greedy(needed: np.ndarray, hours: np.ndarray, score, names: List[str],
+            target: float) -> Tuple[float, float, List[str]]:
+    """Add the missing skill with the best score gain per extra hour until the target is reached"""
+    learned = np.zeros(needed.shape[1])
+    current = float(score(learned))
+    while current < target:
+        options = np.maximum(learned, needed)
+        gains = score(options) - current
+        extra = (options - learned) @ hours
+        useful = np.flatnonzero(gains > 1e-12)
+        if not len(useful):
+            return float("inf"), current, []
+        pick = useful[np.argmax(gains[useful] / np.maximum(extra[useful], 1e-9))]
+        learned = options[pick]
+        current = float(score(learned))
+    return float(learned @ hours), current, [names[i] for i in np.flatnonzero(learned)]
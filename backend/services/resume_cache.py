@@ -0,0 +1,219 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+from typing import Dict, List, Optional
+
+from . import resume_parser
+from .execution import run_cpu, run_io
+from .lru_cache import LRUCache
+from .skill_ontology import ONTOLOGY
+
+# Bump whenever extraction, skill matching or contact/experience parsing changes
+# so stale artifacts are never served after a deploy (ontology edits are keyed
+# by the ontology version).
+PARSER_VERSION = "2"
+
+RESUME_CACHE_MAX_ENTRIES = int(os.getenv("RESUME_CACHE_MAX_ENTRIES", "512"))
+RESUME_CACHE_MAX_BYTES = int(os.getenv("RESUME_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+RESUME_CACHE_DIR = os.getenv("RESUME_CACHE_DIR", "")
+RESUME_CACHE_DISK_MAX_BYTES = int(os.getenv("RESUME_CACHE_DISK_MAX_BYTES", str(512 * 1024 * 1024)))
+
+_HASH_CHUNK = 1024 * 1024
+
+
+def _artifact_size(parsed: Dict) -> int:
+    return sys.getsizeof(parsed["text"]) + sum(sys.getsizeof(s) for s in parsed["skills"]) + 512
+
+
+_memory_cache = LRUCache(
+    max_entries=RESUME_CACHE_MAX_ENTRIES,
+    max_bytes=RESUME_CACHE_MAX_BYTES,
+    sizeof=_artifact_size
+)
+_disk_lock = threading.Lock()
+
+
+def content_key(file) -> str:
+    """Hash an upload (streamed in chunks) together with the parser version and limits"""
+    digest = hashlib.sha256()
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "rb") as f:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+                digest.update(chunk)
+    else:
+        file.seek(0)
+        for chunk in iter(lambda: file.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+        file.seek(0)
+    limits = f"{resume_parser.PDF_MAX_PAGES}:{resume_parser.PDF_MAX_CHARS}"
+    return f"{digest.hexdigest()}-v{PARSER_VERSION}-o{ONTOLOGY.version}-{limits}"
+
+
+def parse_resume(file) -> Dict:
+    """
+    Extract text, skills, contact info and experience from a resume upload.
+
+    Results are content-addressed: an in-memory LRU tier is checked first,
+    then the optional on-disk tier (RESUME_CACHE_DIR), and only on a miss is
+    the PDF actually parsed.
+    """
+    key = content_key(file)
+    cached = _lookup(key)
+    if cached is not None:
+        return cached
+
+    parsed = parse_uncached(file)
+    _store(key, parsed)
+    return {**parsed, "cache": "miss"}
+
+
+async def parse_resume_async(path: str) -> Dict:
+    """
+    Non-blocking parse_resume for a spooled upload. Hashing and cache lookups
+    run on the I/O threads and a miss is parsed on the process pool.
+    """
+    key = await run_io("io", content_key, path)
+    cached = await run_io("io", _lookup, key)
+    if cached is not None:
+        return cached
+
+    # Workers cannot spawn their own pool, so page-parallelism is off inside them
+    parsed = await run_cpu("parse", parse_uncached, path, False)
+    await run_io("io", _store, key, parsed)
+    return {**parsed, "cache": "miss"}
+
+
+def parse_resumes(paths: List[str]) -> List[Dict]:
+    """
+    Parse many resumes at once. Cache hits are served directly and misses are
+    fanned out to the process pool, one file per task.
+    """
+    results: List[Optional[Dict]] = [None] * len(paths)
+    pending = {}
+    pool = resume_parser.get_pdf_pool()
+
+    for i, path in enumerate(paths):
+        key = content_key(path)
+        cached = _lookup(key)
+        if cached is not None:
+            results[i] = cached
+        else:
+            # Workers cannot spawn their own pool, so page-parallelism is off inside them
+            pending[i] = (key, pool.submit(parse_uncached, path, False))
+
+    for i, (key, future) in pending.items():
+        try:
+            parsed = future.result()
+        except Exception as e:
+            print(f"[Resume Cache] Failed to parse {paths[i]}: {e}")
+            parsed = {"text": "", "skills": [], "contact_info": {}, "experience_years": 0.0}
+        _store(key, parsed)
+        results[i] = {**parsed, "cache": "miss"}
+
+    return results
+
+
+def parse_uncached(file, parallel: Optional[bool] = None) -> Dict:
+    """Run the full parsing pipeline without consulting the cache"""
+    text = resume_parser.extract_pages(file, parallel=parallel)["text"]
+    return {
+        "text": text,
+        "skills": resume_parser.extract_skills(text) if text else [],
+        "contact_info": resume_parser.extract_contact_info(text) if text else {},
+        "experience_years": resume_parser.extract_experience_years(text) if text else 0.0
+    }
+
+
+def _lookup(key: str) -> Optional[Dict]:
+    parsed = _memory_cache.get(key)
+    if parsed is not None:
+        return {**parsed, "cache": "memory"}
+
+    parsed = _read_disk(key)
+    if parsed is not None:
+        _memory_cache.set(key, parsed)
+        return {**parsed, "cache": "disk"}
+    return None
+
+
+def _store(key: str, parsed: Dict):
+    # Failed extractions are not cached so a retry can succeed
+    if parsed["text"]:
+        _memory_cache.set(key, parsed)
+        _write_disk(key, parsed)
+
+
+def cache_stats() -> Dict:
+    """Hit/miss counters for the memory tier plus disk usage"""
+    stats = {"memory": _memory_cache.stats(), "parser_version": PARSER_VERSION}
+    if RESUME_CACHE_DIR:
+        stats["disk"] = {"dir": RESUME_CACHE_DIR, "bytes": _disk_usage()[0]}
+    return stats
+
+
+def clear_cache():
+    _memory_cache.clear()
+
+
+def _disk_path(key: str) -> str:
+    return os.path.join(RESUME_CACHE_DIR, f"{key}.json")
+
+
+def _read_disk(key: str) -> Optional[Dict]:
+    if not RESUME_CACHE_DIR:
+        return None
+    path = _disk_path(key)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            parsed = json.load(f)
+        os.utime(path)  # mtime doubles as the LRU clock for disk eviction
+        return parsed
+    except (OSError, ValueError):
+        return None
+
+
+def _write_disk(key: str, parsed: Dict):
+    if not RESUME_CACHE_DIR:
+        return
+    try:
+        os.makedirs(RESUME_CACHE_DIR, exist_ok=True)
+        tmp_path = _disk_path(key) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(parsed, f)
+        os.replace(tmp_path, _disk_path(key))
+        _evict_disk()
+    except OSError as e:
+        print(f"[Resume Cache] Failed to write disk entry: {e}")
+
+
+def _disk_usage():
+    entries = []
+    total = 0
+    try:
+        with os.scandir(RESUME_CACHE_DIR) as it:
+            for entry in it:
+                if entry.name.endswith(".json"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+    except OSError:
+        pass
+    return total, entries
+
+
+def _evict_disk():
+    """Remove least recently used files until the disk tier fits its budget"""
+    with _disk_lock:
+        total, entries = _disk_usage()
+        if total <= RESUME_CACHE_DISK_MAX_BYTES:
+            return
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            if total <= RESUME_CACHE_DISK_MAX_BYTES:
+                break
@@ -0,0 +1,152 @@
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+from .skill_ontology import ONTOLOGY
+from .text_scanner import TextSignals, scan_text
+
+# Same token pattern as sklearn's TfidfVectorizer, so term counts built here
+# are exactly what the ATS vectorizer would have produced.
+_TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+# Critical ATS keywords (skills, technologies, qualifications), matched as substrings
+TECH_KEYWORDS = ONTOLOGY.tech_keywords
+DEGREE_KEYWORDS = ONTOLOGY.degree_keywords
+ACTION_VERB_KEYWORDS = ONTOLOGY.action_verb_keywords
+CRITICAL_KEYWORDS = tuple(dict.fromkeys(TECH_KEYWORDS + DEGREE_KEYWORDS + ACTION_VERB_KEYWORDS))
+
+# Header line -> canonical section name
+SECTION_HEADERS = {
+    "summary": "summary", "professional summary": "summary", "profile": "summary",
+    "objective": "summary", "about me": "summary",
+    "experience": "experience", "work experience": "experience",
+    "professional experience": "experience", "employment": "experience",
+    "employment history": "experience", "work history": "experience",
+    "education": "education", "academic background": "education",
+    "skills": "skills", "technical skills": "skills", "core skills": "skills",
+    "key skills": "skills", "technologies": "skills",
+    "projects": "projects", "personal projects": "projects", "key projects": "projects",
+    "certifications": "certifications", "certificates": "certifications",
+    "achievements": "achievements", "awards": "achievements",
+    "publications": "publications", "languages": "languages", "interests": "interests"
+}
+HEADER_SECTION = "header"
+
+
+@dataclass(frozen=True, eq=False)
+class ResumeDocument:
+    """
+    Immutable, request-scoped view of a resume (or job description).
+
+    Every value the ATS engine, career advisor and skill-gap analysis derive
+    from raw text is computed once here and shared, instead of each consumer
+    lowercasing, tokenizing and rescanning the same string.
+    """
+    text: str
+    text_lower: str
+    tokens: Tuple[str, ...]
+    term_counts: Mapping[str, int]
+    keywords: FrozenSet[str]
+    keyword_list: Tuple[str, ...]
+    skills: Tuple[str, ...]
+    sections: Mapping[str, str]
+    signals: TextSignals
+    # Memo for values derived later (e.g. TF-IDF weights under a given IDF model)
+    derived: Dict = field(default_factory=dict, repr=False)
+
+    def __reduce__(self):
+        # Mapping proxies cannot be pickled and the memo is keyed by in-process
+        # models, so a document crosses to another process without its memo
+        return _restore_document, (
+            self.text, self.text_lower, self.tokens, dict(self.term_counts), self.keywords,
+            self.keyword_list, self.skills, dict(self.sections), self.signals
+        )
+
+
+def _restore_document(text, text_lower, tokens, counts, keywords, keyword_list, skills, sections, signals):
+    return ResumeDocument(
+        text=text,
+        text_lower=text_lower,
+        tokens=tokens,
+        term_counts=MappingProxyType(counts),
+        keywords=keywords,
+        keyword_list=keyword_list,
+        skills=skills,
+        sections=MappingProxyType(sections),
+        signals=signals
+    )
+
+
+def build_document(text: str, skills: Optional[List[str]] = None) -> ResumeDocument:
+    """Normalize text once and derive tokens, terms, keywords, sections and format signals"""
+    text = text or ""
+    text_lower = text.lower()
+    tokens = tokenize(text_lower)
+    keyword_list = extract_keywords(text_lower)
+
+    if skills is None:
+        from .resume_parser import extract_skills
+        skills = extract_skills(text)
+
+    return ResumeDocument(
+        text=text,
+        text_lower=text_lower,
+        tokens=tokens,
+        term_counts=MappingProxyType(term_counts(tokens)),
+        keywords=frozenset(keyword_list),
+        keyword_list=keyword_list,
+        skills=tuple(skills),
+        sections=MappingProxyType(split_sections(text)),
+        signals=scan_text(text)
+    )
+
+
+def as_document(value) -> ResumeDocument:
+    """Accept either raw text or an existing document"""
+    return value if isinstance(value, ResumeDocument) else build_document(value)
+
+
+def tokenize(text_lower: str) -> Tuple[str, ...]:
+    """Word tokens of already-lowercased text (TfidfVectorizer token pattern)"""
+    return tuple(_TOKEN_PATTERN.findall(text_lower))
+
+
+def content_tokens(tokens) -> List[str]:
+    """Tokens left after english stop-word removal"""
+    return [token for token in tokens if token not in ENGLISH_STOP_WORDS]
+
+
+def term_counts(tokens) -> Counter:
+    """Unigram + bigram counts after english stop-word removal (TfidfVectorizer semantics)"""
+    filtered = content_tokens(tokens)
+    counts = Counter(filtered)
+    counts.update(f"{a} {b}" for a, b in zip(filtered, filtered[1:]))
+    return counts
+
+
+def extract_keywords(text_lower: str) -> Tuple[str, ...]:
+    """Critical keywords present in already-lowercased text, in vocabulary order"""
+    return tuple(keyword for keyword in CRITICAL_KEYWORDS if keyword in text_lower)
+
+
+def split_sections(text: str) -> Dict[str, str]:
+    """Split a resume into sections keyed by canonical header name"""
+    sections: Dict[str, List[str]] = {HEADER_SECTION: []}
+    current = HEADER_SECTION
+    for line in text.splitlines():
+        section = section_header(line)
+        if section:
+            current = section
+            sections.setdefault(current, [])
+        else:
+            sections[current].append(line)
+    return {name: "\n".join(lines) for name, lines in sections.items()}
+
+
+def section_header(line: str) -> Optional[str]:
+    """Canonical section name if the line is a section header, else None"""
+    return SECTION_HEADERS.get(line.strip().strip(":").strip().lower())
@@ -1,129 +1,273 @@
 import pdfplumber
-import spacy
-import re
-from typing import List, Dict
+import logging
+import os
+import math
+import time
+import mmap
+import shutil
+import tempfile
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from typing import List, Dict, Optional
 
-nlp = spacy.load("en_core_web_sm")
+from .skill_automaton import SkillAutomaton
+from .skill_ontology import ONTOLOGY
+from .text_scanner import scan_text
 
-# Comprehensive skills database
-SKILLS_DB = [
-    # Programming Languages
-    "python", "java", "javascript", "typescript", "c", "c++", "c#", "ruby", "php", "swift", "kotlin", "go", "rust", "scala", "r",
-    
-    # Web Technologies
-    "html", "css", "react", "angular", "vue", "node.js", "express", "django", "flask", "fastapi", "spring", "asp.net", "jquery", 
-    "bootstrap", "tailwind", "next.js", "nuxt", "svelte", "webpack", "vite",
-    
-    # Databases
-    "sql", "mysql", "postgresql", "mongodb", "redis", "cassandra", "dynamodb", "oracle", "sqlite", "elasticsearch", "neo4j",
-    
-    # Cloud & DevOps
-    "aws", "azure", "gcp", "docker", "kubernetes", "jenkins", "gitlab", "github actions", "terraform", "ansible", "ci/cd", 
-    "linux", "unix", "bash", "nginx", "apache",
-    
-    # Data Science & AI
-    "machine learning", "deep learning", "nlp", "computer vision", "tensorflow", "pytorch", "keras", "scikit-learn", "pandas", 
-    "numpy", "matplotlib", "seaborn", "jupyter", "statistics", "data analysis", "data visualization", "ml", "dl", "ai",
-    
-    # Mobile Development
-    "android", "ios", "react native", "flutter", "xamarin", "mobile development",
-    
-    # Testing & Quality
-    "testing", "unit testing", "integration testing", "jest", "pytest", "selenium", "cypress", "testing",
-    
-    # Other Technologies
-    "git", "rest api", "graphql", "microservices", "agile", "scrum", "jira", "api", "json", "xml",
-    "security", "authentication", "oauth", "jwt", "encryption"
-]
+# spaCy is loaded on first use. Only the tokenizer is needed, so every trained
+# component is excluded to keep load time and per-worker memory down.
+SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+SPACY_BLANK_TOKENIZER = os.getenv("SPACY_BLANK_TOKENIZER", "false").lower() in ("1", "true", "yes")
+SPACY_EXCLUDE = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "ner", "senter"]
+SPACY_BATCH_SIZE = int(os.getenv("SPACY_BATCH_SIZE", "8"))
+
+_nlp_pipelines: Dict[bool, object] = {}
+
+# Surface forms matched in resume text (defined in the skill ontology)
+SKILLS_DB = list(ONTOLOGY.extraction_terms)
+
+# Compiled once at import; matching cost no longer grows with the vocabulary
+SKILL_AUTOMATON = SkillAutomaton(SKILLS_DB)
+
+# PDF extraction limits (pages beyond the cutoff are never opened)
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "50"))
+PDF_MAX_CHARS = int(os.getenv("PDF_MAX_CHARS", "100000"))
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(os.cpu_count() or 1)))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "4"))
+PDF_TIME_BUDGET_SECONDS = float(os.getenv("PDF_TIME_BUDGET_SECONDS", "20"))
+
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+
+logger = logging.getLogger(__name__)
 
-def extract_text(file):
+
+def get_pdf_pool() -> ProcessPoolExecutor:
+    """Lazily create the process pool used for page-parallel extraction"""
+    global _pdf_pool
+    if _pdf_pool is None:
+        _pdf_pool = ProcessPoolExecutor(max_workers=PDF_WORKERS)
+    return _pdf_pool
+
+
+@contextmanager
+def _open_pdf(path):
+    """Open a PDF through a read-only memory map so the file is paged in on demand"""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        with pdfplumber.open(buffer) as pdf:
+            yield pdf
+
+
+def _extract_page(page) -> tuple:
+    """Extract one page and drop its cached layout objects right away"""
+    page_start = time.perf_counter()
+    page_text = page.extract_text() or ""
+    page.close()
+    return page_text, round((time.perf_counter() - page_start) * 1000, 2)
+
+
+def _extract_page_range(source, start: int, stop: int) -> List[tuple]:
+    """Extract pages [start, stop) from a PDF path. Runs inside a pool worker."""
+    with _open_pdf(source) as pdf:
+        return [_extract_page(page) for page in pdf.pages[start:stop]]
+
+
+def extract_text(file, max_pages: Optional[int] = None, max_chars: Optional[int] = None) -> str:
     """Extract text from PDF file"""
-    text = ""
+    return extract_pages(file, max_pages=max_pages, max_chars=max_chars)["text"]
+
+
+def extract_pages(
+    file,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None,
+    parallel: Optional[bool] = None,
+    workers: Optional[int] = None
+) -> Dict:
+    """
+    Extract text page by page with early termination.
+
+    Pages are split into contiguous chunks and extracted on a process pool
+    when the document is long enough to benefit. At most `workers` chunks of
+    this document run at once on the shared pool (which itself has
+    PDF_WORKERS processes). Chunks are consumed in page order and no more are
+    started once max_chars is reached, so latency is bounded by the cutoff
+    rather than the page count. The file is read through a memory map and
+    PDF_TIME_BUDGET_SECONDS caps wall-clock time. Extraction errors are
+    logged and yield an empty result.
+    """
+    max_pages = PDF_MAX_PAGES if max_pages is None else max_pages
+    max_chars = PDF_MAX_CHARS if max_chars is None else max_chars
+    workers = PDF_WORKERS if workers is None else workers
+
+    started = time.perf_counter()
+    deadline = started + PDF_TIME_BUDGET_SECONDS
+    result = {
+        "text": "",
+        "pages": [],
+        "page_count": 0,
+        "pages_extracted": 0,
+        "truncated": False,
+        "mode": "serial",
+        "timings": {}
+    }
+
+    temp_path = None
     try:
-        with pdfplumber.open(file) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-    except Exception as e:
-        print(f"Error extracting PDF text: {e}")
-    return text
+        # Workers need something they can reopen, so spill file objects to disk
+        if isinstance(file, (str, os.PathLike)):
+            source = file
+        else:
+            if hasattr(file, "seek"):
+                file.seek(0)
+            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+                shutil.copyfileobj(file, tmp)
+                temp_path = tmp.name
+            source = temp_path
+
+        open_start = time.perf_counter()
+        with _open_pdf(source) as pdf:
+            page_count = len(pdf.pages)
+            to_read = min(page_count, max_pages) if max_pages > 0 else page_count
+            result["page_count"] = page_count
+            result["timings"]["open_ms"] = round((time.perf_counter() - open_start) * 1000, 2)
+
+            use_pool = parallel if parallel is not None else (
+                workers > 1 and to_read >= PDF_PARALLEL_MIN_PAGES
+            )
+
+            extract_start = time.perf_counter()
+            if use_pool:
+                result["mode"] = "parallel"
+                pages, page_ms = _extract_parallel(source, to_read, max_chars, workers, deadline)
+            else:
+                pages, page_ms = [], []
+                chars = 0
+                for page in pdf.pages[:to_read]:
+                    page_text, ms = _extract_page(page)
+                    page_ms.append(ms)
+                    pages.append(page_text)
+                    chars += len(page_text)
+                    if (max_chars and chars >= max_chars) or time.perf_counter() > deadline:
+                        break
+            result["timings"]["extract_ms"] = round((time.perf_counter() - extract_start) * 1000, 2)
+
+        text = "".join(page_text + "\n" for page_text in pages if page_text)
+        if max_chars and len(text) > max_chars:
+            text = text[:max_chars]
+        result["text"] = text
+        result["pages"] = pages
+        result["pages_extracted"] = len(pages)
+        result["truncated"] = len(pages) < page_count or len(text) >= max_chars > 0
+        result["timings"]["page_ms"] = page_ms
+    except Exception:
+        logger.exception("Error extracting PDF text")
+    finally:
+        if temp_path:
+            os.unlink(temp_path)
+
+    result["timings"]["total_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return result
+
+
+def _extract_parallel(source, to_read: int, max_chars: int, workers: int, deadline: float) -> tuple:
+    """
+    Fan page chunks out to the pool, at most `workers` in flight, and collect
+    them in page order until the cutoff
+    """
+    # Two chunks per worker keeps the pool busy while still allowing early exit
+    workers = max(workers, 1)
+    chunk_size = max(1, math.ceil(to_read / (workers * 2)))
+    pool = get_pdf_pool()
+    starts = iter(range(0, to_read, chunk_size))
+    window = deque()
+
+    def submit_next():
+        start = next(starts, None)
+        if start is not None:
+            window.append(pool.submit(_extract_page_range, source, start, min(start + chunk_size, to_read)))
+
+    pages, page_ms = [], []
+    chars = 0
+    try:
+        for _ in range(workers):
+            submit_next()
+        while window:
+            try:
+                chunk = window[0].result(timeout=max(deadline - time.perf_counter(), 0))
+            except FutureTimeout:
+                logger.warning("PDF extraction time budget exhausted, returning partial text")
+                break
+            window.popleft()
+            for page_text, ms in chunk:
+                pages.append(page_text)
+                page_ms.append(ms)
+                chars += len(page_text)
+                if max_chars and chars >= max_chars:
+                    return pages, page_ms
+            submit_next()
+    finally:
+        for future in window:
+            future.cancel()
+    return pages, page_ms
 
 
 def extract_skills(text: str) -> List[str]:
-    """Extract skills from text using NLP and pattern matching"""
-    text_lower = text.lower()
-    found_skills = set()
-    
-    # Method 1: Direct keyword matching
-    for skill in SKILLS_DB:
-        if skill in text_lower:
-            found_skills.add(skill)
-    
-    # Method 2: NLP entity extraction
-    doc = nlp(text_lower)
-    for token in doc:
-        if token.text in SKILLS_DB:
-            found_skills.add(token.text)
-    
-    return sorted(list(found_skills))
+    """Extract skills from text in a single pass of the compiled skill automaton"""
+    return sorted(SKILL_AUTOMATON.find_all(text.lower()))
+
+
+def get_nlp(force_blank: Optional[bool] = None):
+    """Return the shared spaCy pipeline, loading it on first use"""
+    blank = SPACY_BLANK_TOKENIZER if force_blank is None else force_blank
+    nlp = _nlp_pipelines.get(blank)
+    if nlp is None:
+        import spacy
+
+        if blank:
+            nlp = spacy.blank("en")
+        else:
+            try:
+                nlp = spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDE)
+            except OSError as e:
+                logger.warning("spaCy model '%s' unavailable (%s). Using blank tokenizer.", SPACY_MODEL, e)
+                nlp = spacy.blank("en")
+        _nlp_pipelines[blank] = nlp
+    return nlp
+
+
+def tokenize_documents(texts: List[str], force_blank: Optional[bool] = None) -> List[List[str]]:
+    """Tokenize every document of a request in one nlp.pipe batch"""
+    if not texts:
+        return []
+    nlp = get_nlp(force_blank)
+    return [
+        [token.text for token in doc if not token.is_space]
+        for doc in nlp.pipe(texts, batch_size=SPACY_BATCH_SIZE)
+    ]
 
 
 def extract_contact_info(text: str) -> Dict[str, str]:
     """Extract contact information from resume"""
-    contact_info = {
-        "email": "",
-        "phone": "",
-        "linkedin": "",
-        "github": ""
+    signals = scan_text(text)
+    return {
+        "email": signals.email,
+        "phone": signals.phone,
+        "linkedin": signals.linkedin,
+        "github": signals.github
     }
-    
-    # Extract email
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    emails = re.findall(email_pattern, text)
-    if emails:
-        contact_info["email"] = emails[0]
-    
-    # Extract phone
-    phone_pattern = r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-    phones = re.findall(phone_pattern, text)
-    if phones:
-        contact_info["phone"] = phones[0] if isinstance(phones[0], str) else phones[0][0]
-    
-    # Extract LinkedIn
-    linkedin_pattern = r'linkedin\.com/in/([\w-]+)'
-    linkedin = re.search(linkedin_pattern, text, re.IGNORECASE)
-    if linkedin:
-        contact_info["linkedin"] = f"linkedin.com/in/{linkedin.group(1)}"
-    
-    # Extract GitHub
-    github_pattern = r'github\.com/([\w-]+)'
-    github = re.search(github_pattern, text, re.IGNORECASE)
-    if github:
-        contact_info["github"] = f"github.com/{github.group(1)}"
-    
-    return contact_info
 
 
 def extract_experience_years(text: str) -> float:
     """Estimate years of experience from resume"""
-    # Look for date patterns
-    year_patterns = r'(20\d{2})|(19\d{2})'
-    years = re.findall(year_patterns, text)
-    
-    unique_years = set()
-    for year_tuple in years:
-        for year in year_tuple:
-            if year:
-                unique_years.add(int(year))
+    signals = scan_text(text)
     
-    if len(unique_years) >= 2:
-        return max(unique_years) - min(unique_years)
+    # Span between the earliest and latest year mentioned
+    if len(signals.years) >= 2:
+        return max(signals.years) - min(signals.years)
     
     # Look for explicit experience mentions
-    exp_pattern = r'(\d+)\+?\s*years?\s*(of)?\s*experience'
-    exp_match = re.search(exp_pattern, text, re.IGNORECASE)
-    if exp_match:
-        return float(exp_match.group(1))
+    if signals.stated_experience_years is not None:
+        return float(signals.stated_experience_years)
     
     return 0.0
@@ -1,4 +1,5 @@
 from .ai_service import ai_service
+from .skill_ontology import ONTOLOGY
 from typing import Dict
 import statistics
 
@@ -105,14 +106,10 @@ def _calculate_skill_premium(skills: list) -> str:
     if not skills:
         return "0%"
     
-    high_demand_skills = {
-        "python", "react", "aws", "kubernetes", "docker", "machine learning", 
-        "deep learning", "tensorflow", "pytorch", "node.js", "typescript",
-        "sql", "nosql", "microservices", "system design", "devops", "ci/cd",
-        "nlp", "computer vision", "llm", "gpt", "langchain", "ai"
-    }
+    high_demand = ONTOLOGY.flag_mask("high_demand")
+    skill_ids = (ONTOLOGY.skill_id(skill) for skill in skills)
     
-    matching = sum(1 for skill in skills if any(hd in skill.lower() for hd in high_demand_skills))
+    matching = sum(1 for skill_id in skill_ids if skill_id is not None and high_demand >> skill_id & 1)
     percentage = (matching / len(skills)) * 100 if skills else 0
     
     return f"{int(percentage)}%"
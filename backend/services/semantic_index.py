@@ -0,0 +1,251 @@
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from .skill_ontology import ONTOLOGY
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+
+# Skill embeddings are fitted offline (models/train_skill_embeddings.py); without
+# the file the semantic factor is off and match scores are purely skill-overlap
+SKILL_EMBEDDINGS_PATH = os.getenv("SKILL_EMBEDDINGS_PATH", os.path.join(BASE_DIR, "models", "skill_embeddings.npz"))
+# exact: brute-force inner products; ivf: probe the nearest clusters of int8-quantized vectors
+SEMANTIC_INDEX_MODE = os.getenv("SEMANTIC_INDEX_MODE", "exact").lower()
+SEMANTIC_IVF_NPROBE = int(os.getenv("SEMANTIC_IVF_NPROBE", "8"))
+# Share of the job match score given to semantic similarity, and how many
+# nearest jobs are retrieved per query on top of the skill-sharing ones
+JOB_MATCH_SEMANTIC_WEIGHT = float(os.getenv("JOB_MATCH_SEMANTIC_WEIGHT", "0.10"))
+JOB_MATCH_SEMANTIC_CANDIDATES = int(os.getenv("JOB_MATCH_SEMANTIC_CANDIDATES", "50"))
+
+EMBEDDINGS_FORMAT_VERSION = 1
+
+_embeddings = None
+_embeddings_loaded = False
+_embeddings_lock = threading.Lock()
+
+
+class SkillEmbeddings:
+    """
+    Dense LSA vectors for skill names, L2-normalized float32 rows.
+
+    A skill set (a candidate or a job) is embedded as the normalized sum of its
+    skills' vectors, so jobs added later need no refit.
+    """
+
+    def __init__(self, names: Sequence[str], vectors: np.ndarray, ontology_version: str):
+        self.names = list(names)
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        self.ontology_version = ontology_version
+        self.dims = self.vectors.shape[1]
+        self._rows = {name: i for i, name in enumerate(self.names)}
+
+    def vector(self, name: str) -> Optional[np.ndarray]:
+        row = self._rows.get(ONTOLOGY.canonical(name))
+        return self.vectors[row] if row is not None else None
+
+    def embed(self, skills: Sequence[str]) -> Optional[np.ndarray]:
+        """Normalized mean direction of the known skills, None if none are known"""
+        rows = {self._rows.get(ONTOLOGY.canonical(skill)) for skill in skills} - {None}
+        if not rows:
+            return None
+        return _normalize(self.vectors[sorted(rows)].sum(axis=0))
+
+    def aligned(self, vocabulary: Sequence[str]) -> np.ndarray:
+        """vocabulary x dims matrix, zero rows for names without a vector"""
+        matrix = np.zeros((len(vocabulary), self.dims), dtype=np.float32)
+        for column, name in enumerate(vocabulary):
+            row = self._rows.get(name)
+            if row is not None:
+                matrix[column] = self.vectors[row]
+        return matrix
+
+
+class SemanticIndex:
+    """
+    Nearest-neighbour search over L2-normalized float32 vectors (inner product).
+
+    Exact search is one matrix-vector product. The IVF option clusters the
+    vectors with k-means, keeps them as int8 codes grouped by cluster, scans
+    only the `nprobe` clusters closest to the query and re-ranks the best
+    candidates with the float vectors.
+    """
+
+    def __init__(self, vectors: np.ndarray):
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        self.centroids = None
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def build_ivf(self, n_lists: Optional[int] = None, seed: int = 0) -> "SemanticIndex":
+        from sklearn.cluster import MiniBatchKMeans
+
+        n_lists = min(n_lists or max(int(np.sqrt(len(self.vectors))), 1), len(self.vectors))
+        kmeans = MiniBatchKMeans(n_clusters=n_lists, random_state=seed, n_init=3,
+                                 batch_size=max(1024, n_lists * 4)).fit(self.vectors)
+        assignments = kmeans.labels_
+        self.centroids = kmeans.cluster_centers_.astype(np.float32)
+        self.list_rows = np.argsort(assignments, kind="stable").astype(np.int64)
+        self.list_offsets = np.zeros(n_lists + 1, dtype=np.int64)
+        self.list_offsets[1:] = np.cumsum(np.bincount(assignments, minlength=n_lists))
+        # Symmetric int8 quantization per dimension, stored in list order for contiguous scans
+        self.scale = np.maximum(np.abs(self.vectors).max(axis=0), 1e-12) / 127.0
+        self.codes = np.round(self.vectors[self.list_rows] / self.scale).astype(np.int8)
+        return self
+
+    def similarities(self, query: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Exact inner products with the query, for all rows or the given ones"""
+        vectors = self.vectors if rows is None else self.vectors[rows]
+        return vectors @ query
+
+    def search(self, query: np.ndarray, k: int = 10, mode: str = SEMANTIC_INDEX_MODE,
+               nprobe: int = SEMANTIC_IVF_NPROBE) -> Tuple[np.ndarray, np.ndarray]:
+        """(rows, similarities) of the k nearest vectors, best first"""
+        k = min(k, len(self.vectors))
+        if k <= 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        if mode == "ivf" and self.centroids is not None:
+            probes = _top(self.centroids @ query, nprobe)
+            spans = [(self.list_offsets[p], self.list_offsets[p + 1]) for p in probes]
+            positions = np.concatenate([np.arange(start, end) for start, end in spans])
+            approximate = self.codes[positions].astype(np.float32) @ (query * self.scale)
+            # Re-rank a few times k approximate hits with the exact vectors
+            shortlist = self.list_rows[positions[_top(approximate, k * 4)]]
+            exact = self.vectors[shortlist] @ query
+            best = _top(exact, k)
+            return shortlist[best], exact[best]
+        scores = self.vectors @ query
+        best = _top(scores, k)
+        return best, scores[best]
+
+
+def _top(scores: np.ndarray, k: int) -> np.ndarray:
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0).astype(np.float32)
+
+
+def fit_skill_embeddings(skill_lists: Sequence[Sequence[str]], dims: int = 32, seed: int = 0) -> SkillEmbeddings:
+    """
+    LSA over skill co-occurrence: TF-IDF weight a (document x skill) matrix and
+    keep the top singular directions. Documents are the given skill lists (job
+    postings) plus pseudo-documents from the ontology, one per category and one
+    per skill with its prerequisites, so skills no posting lists yet still get
+    a position near related ones.
+    """
+    from sklearn.decomposition import TruncatedSVD
+
+    documents = [[ONTOLOGY.canonical(s) for s in skills] for skills in skill_lists]
+    categories: Dict[str, List[str]] = {}
+    for skill in ONTOLOGY.skills:
+        categories.setdefault(skill.category, []).append(skill.name)
+        if skill.prerequisites:
+            documents.append([skill.name] + [ONTOLOGY.canonical(p) for p in skill.prerequisites])
+    documents.extend(categories.values())
+
+    names = sorted({name for document in documents for name in document if name})
+    columns = {name: i for i, name in enumerate(names)}
+    rows, cols = [], []
+    for row, document in enumerate(documents):
+        for column in sorted({columns[name] for name in document if name}):
+            rows.append(row)
+            cols.append(column)
+    matrix = sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(len(documents), len(names)))
+
+    df = np.bincount(cols, minlength=len(names))
+    matrix = matrix @ sparse.diags(np.log((1 + len(documents)) / (1 + df)) + 1.0)
+    dims = max(1, min(dims, len(names) - 1, len(documents) - 1))
+    svd = TruncatedSVD(n_components=dims, random_state=seed).fit(matrix)
+    vectors = _normalize((svd.components_.T * svd.singular_values_).astype(np.float32))
+    return SkillEmbeddings(names, vectors, ONTOLOGY.version)
+
+
+def save_skill_embeddings(embeddings: SkillEmbeddings, path: str = SKILL_EMBEDDINGS_PATH):
+    np.savez_compressed(
+        path,
+        version=EMBEDDINGS_FORMAT_VERSION,
+        ontology_version=embeddings.ontology_version,
+        names=np.array(embeddings.names, dtype=str),
+        vectors=embeddings.vectors
+    )
+
+
+def load_skill_embeddings(path: str = SKILL_EMBEDDINGS_PATH) -> SkillEmbeddings:
+    with np.load(path) as data:
+        if int(data["version"]) != EMBEDDINGS_FORMAT_VERSION:
+            raise ValueError(f"Unsupported skill embeddings version {data['version']}")
+        return SkillEmbeddings(data["names"].tolist(), data["vectors"], str(data["ontology_version"]))
+
+
+def get_skill_embeddings() -> Optional[SkillEmbeddings]:
+    """The process-wide embeddings, loaded once; None disables semantic matching"""
+    global _embeddings, _embeddings_loaded
+    if _embeddings_loaded:
+        return _embeddings
+    with _embeddings_lock:
+        if not _embeddings_loaded:
+            if os.path.exists(SKILL_EMBEDDINGS_PATH):
+                try:
+                    _embeddings = load_skill_embeddings(SKILL_EMBEDDINGS_PATH)
+                    print(f"[Semantic] Loaded {len(_embeddings.names)} skill embeddings ({_embeddings.dims} dims)")
+                    if _embeddings.ontology_version != ONTOLOGY.version:
+                        print(f"[Warning] Skill embeddings were fitted on ontology v{_embeddings.ontology_version}")
+                except Exception as e:
+                    print(f"[Warning] Could not load skill embeddings ({e}). Semantic matching is off.")
+                    _embeddings = None
+            _embeddings_loaded = True
+    return _embeddings
+
+
+def set_skill_embeddings(embeddings: Optional[SkillEmbeddings]):
+    """Swap the active embeddings (tests, benchmarks, hot reload)"""
+    global _embeddings, _embeddings_loaded
+    with _embeddings_lock:
+        _embeddings = embeddings
+        _embeddings_loaded = True
+
+
+def job_index(catalog, embeddings: SkillEmbeddings) -> SemanticIndex:
+    """
+    The semantic index of a catalog snapshot, built once per (snapshot,
+    embeddings) pair: each job is the normalized sum of its skills' vectors.
+    """
+    cached = catalog.derived.get("semantic_index")
+    if cached is not None and cached[0] is embeddings:
+        return cached[1]
+    aligned = embeddings.aligned(catalog.vocabulary)
+    incidence = sparse.csr_matrix(
+        (np.ones(len(catalog.indices), dtype=np.float32), np.asarray(catalog.indices), np.asarray(catalog.indptr)),
+        shape=(catalog.size, len(catalog.vocabulary))
+    )
+    index = SemanticIndex(_normalize(incidence @ aligned))
+    if SEMANTIC_INDEX_MODE == "ivf" and len(index) > 1:
+        index.build_ivf()
+    catalog.derived["semantic_index"] = (embeddings, index)
+    return index
+
+
+def semantic_query(catalog, skills: Sequence[str]) -> Optional[Tuple[SemanticIndex, np.ndarray]]:
+    """(job index, candidate vector) when semantic matching is on, else None"""
+    embeddings = get_skill_embeddings()
+    if embeddings is None or JOB_MATCH_SEMANTIC_WEIGHT <= 0 or not catalog.size:
+        return None
+    query = embeddings.embed(skills)
+    if query is None:
+        query = np.zeros(embeddings.dims, dtype=np.float32)
+    return job_index(catalog, embeddings), query
+
+
+def blend(base, similarity):
+    """Composite score with the semantic factor; negative similarity counts as none"""
+    return base * (1 - JOB_MATCH_SEMANTIC_WEIGHT) + np.maximum(similarity, 0.0) * JOB_MATCH_SEMANTIC_WEIGHT
@@ -0,0 +1,98 @@
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+# Characters that continue a token. "+" and "#" are included so that "c" never
+# matches inside "c++" or "c#".
+_EXTRA_WORD_CHARS = frozenset("_+#")
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch in _EXTRA_WORD_CHARS
+
+
+class SkillAutomaton:
+    """
+    Aho-Corasick automaton over a skill vocabulary.
+
+    The trie and failure links are compiled once, after which every skill is
+    found in a single left-to-right pass over the text, independent of the
+    vocabulary size. Matches are only reported on word boundaries, so short
+    skills like "r", "c" or "go" do not fire inside other words.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+
+        seen = set()
+        for pattern in patterns:
+            pattern = pattern.strip().lower()
+            if pattern and pattern not in seen:
+                seen.add(pattern)
+                self._insert(pattern)
+        self._build_failure_links()
+
+        # Boundary checks only apply where the pattern itself starts/ends on a word char
+        self._check_left = [_is_word_char(p[0]) for p in self.patterns]
+        self._check_right = [_is_word_char(p[-1]) for p in self.patterns]
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def _insert(self, pattern: str):
+        state = 0
+        for ch in pattern:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = next_state
+        self._out[state] = self._out[state] + (len(self.patterns),)
+        self.patterns.append(pattern)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                # Inherit matches that end at the same position via the suffix link
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """Yield (start, end, pattern) for every boundary-respecting match in lowercased text"""
+        goto, fail, out = self._goto, self._fail, self._out
+        patterns = self.patterns
+        check_left, check_right = self._check_left, self._check_right
+        text_len = len(text)
+        state = 0
+
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+
+            end = i + 1
+            for idx in out[state]:
+                start = end - len(patterns[idx])
+                if check_left[idx] and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if check_right[idx] and end < text_len and _is_word_char(text[end]):
+                    continue
+                yield start, end, patterns[idx]
+
+    def find_all(self, text: str) -> Set[str]:
+        """Return the set of distinct patterns present in lowercased text"""
+        return {pattern for _, _, pattern in self.finditer(text)}
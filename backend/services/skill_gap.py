@@ -1,13 +1,33 @@
-from typing import List, Dict, Tuple
-from collections import Counter
-import re
+import os
+from types import MappingProxyType
+from typing import FrozenSet, List, Dict, Mapping, Optional, Union
 
-def find_gap(candidate: List[str], required: List[str]) -> List[str]:
+from .fuzzy_skills import SKILL_FUZZY_THRESHOLD, FuzzySkillIndex, similarity
+from .lru_cache import LRUCache
+from .resume_document import ResumeDocument
+from .skill_graph import SKILL_GRAPH
+from .skill_ontology import ONTOLOGY
+
+SkillSource = Union[List[str], ResumeDocument]
+
+# Many users share a role's requirements, so gap analyses are cached per canonical skill-set pair
+SKILL_GAP_CACHE_SIZE = int(os.getenv("SKILL_GAP_CACHE_SIZE", "4096"))
+
+_gap_cache = LRUCache(max_entries=SKILL_GAP_CACHE_SIZE)
+_gap_cache_version = None
+
+
+def _skill_list(source: SkillSource) -> List[str]:
+    """Skills of a document, or the list itself"""
+    return list(source.skills) if isinstance(source, ResumeDocument) else source
+
+
+def find_gap(candidate: SkillSource, required: SkillSource) -> List[str]:
     """Find missing skills using fuzzy matching and categorization"""
     return analyze_skill_gap(candidate, required)["critical_missing"]
 
 
-def analyze_skill_gap(candidate_skills: List[str], required_skills: List[str]) -> Dict:
+def analyze_skill_gap(candidate_skills: SkillSource, required_skills: SkillSource) -> Dict:
     """
     Advanced skill gap analysis with categorization, priority scoring, and learning paths.
     
@@ -16,45 +36,57 @@ def analyze_skill_gap(candidate_skills: List[str], required_skills: List[str]) -
     - Skill categorization (core vs nice-to-have)
     - Priority scoring based on frequency in job market
     - Learning path generation with prerequisites
+
+    The analysis itself only depends on the canonical skill sets, so it is
+    memoized per (candidate, required) set pair; each call just lays the
+    cached result out in its own order and spelling.
     """
     
-    # Normalize skills for comparison
+    candidate_skills = _skill_list(candidate_skills)
+    required_skills = _skill_list(required_skills)
+    
     candidate_normalized = {normalize_skill(s): s for s in candidate_skills}
     required_normalized = {normalize_skill(s): s for s in required_skills}
+    gap = _canonical_gap(frozenset(candidate_normalized), frozenset(required_normalized))
     
-    # Step 1: Exact matches
+    # Steps 1-3: exact matches, fuzzy matches, missing skills by priority
     exact_matches = []
-    for req_norm, req_orig in required_normalized.items():
-        if req_norm in candidate_normalized:
-            exact_matches.append(req_orig)
-    
-    # Step 2: Fuzzy matches (skills that are similar)
     fuzzy_matches = []
-    fuzzy_missing = []
-    
+    skill_categories = {"critical": [], "nice_to_have": []}
+    # Canonical name -> input spelling of the critical missing skills, for the learning path
+    labels = {}
     for req_norm, req_orig in required_normalized.items():
-        if req_norm not in candidate_normalized:
-            # Check if candidate has similar skill
-            similar = find_similar_skill(req_norm, list(candidate_normalized.keys()))
-            if similar:
-                fuzzy_matches.append({
-                    "required": req_orig,
-                    "candidate_has": candidate_normalized[similar],
-                    "similarity": 0.8
-                })
-            else:
-                fuzzy_missing.append(req_orig)
-    
-    # Step 3: Categorize missing skills by priority
-    skill_categories = categorize_skills(fuzzy_missing)
+        if req_norm in gap["exact"]:
+            exact_matches.append(req_orig)
+        elif req_norm in gap["fuzzy"]:
+            similar, similarity = gap["fuzzy"][req_norm]
+            fuzzy_matches.append({
+                "required": req_orig,
+                "candidate_has": candidate_normalized[similar],
+                "similarity": similarity
+            })
+        elif req_norm in gap["critical"]:
+            skill_categories["critical"].append(req_orig)
+            labels[req_norm] = req_orig
+        else:
+            skill_categories["nice_to_have"].append(req_orig)
     
     # Step 4: Calculate gap severity score (0-100)
     total_required = len(required_skills)
     matched = len(exact_matches) + len(fuzzy_matches)
     gap_score = round((1 - matched / max(total_required, 1)) * 100, 1)
     
-    # Step 5: Generate learning path with prerequisites
-    learning_path = generate_learning_path(skill_categories["critical"])
+    # Step 5: Learning path with prerequisites, labelled like the input
+    learning_path = [
+        {
+            **entry,
+            "skill": labels.get(entry["skill"], entry["skill"]),
+            "prerequisites": list(entry["prerequisites"]),
+            "resources": list(entry["resources"]),
+            "required_for": [label for name, label in labels.items() if name in entry["required_for"]]
+        }
+        for entry in gap["learning_path"]
+    ]
     
     # Step 6: Estimate time to close gap
     time_estimate = estimate_learning_time(skill_categories)
@@ -72,88 +104,101 @@ def analyze_skill_gap(candidate_skills: List[str], required_skills: List[str]) -
             "total_required": total_required,
             "fully_matched": len(exact_matches),
             "partially_matched": len(fuzzy_matches),
-            "missing": len(fuzzy_missing)
+            "missing": len(skill_categories["critical"]) + len(skill_categories["nice_to_have"])
         }
     }
 
 
+def _canonical_gap(candidate: FrozenSet[str], required: FrozenSet[str]) -> Mapping:
+    """
+    The gap between two canonical skill sets: exactly matched required skills,
+    fuzzy matches ({required: (candidate skill, similarity)}), critical missing
+    skills and the learning path over them. Cached until the ontology changes.
+    """
+    global _gap_cache_version
+    version = (ONTOLOGY.version, SKILL_GRAPH.version)
+    if version != _gap_cache_version:
+        _gap_cache.clear()
+        _gap_cache_version = version
+    key = (candidate, required)
+    gap = _gap_cache.get(key)
+    if gap is not None:
+        return gap
+    
+    # Resolve skills to ontology bitsets (unknown skills compared by normalized name)
+    candidate_bits, candidate_unknown = ONTOLOGY.to_bitset(candidate)
+    exact, fuzzy, missing = set(), {}, []
+    # One n-gram index over the candidate's skills serves every lookup; sorted,
+    # so equally similar skills break ties the same way for every input order
+    candidate_index = FuzzySkillIndex(sorted(candidate))
+    for req_norm in sorted(required):
+        skill_id = ONTOLOGY.skill_id(req_norm)
+        if (skill_id is not None and candidate_bits >> skill_id & 1) or req_norm in candidate_unknown:
+            exact.add(req_norm)
+            continue
+        similar = candidate_index.best(req_norm, SKILL_FUZZY_THRESHOLD)
+        if similar:
+            fuzzy[req_norm] = (similar[0], round(similar[1], 2))
+        else:
+            missing.append(req_norm)
+    
+    critical = categorize_skills(missing)["critical"]
+    # Shared by every caller with the same skill sets, so stored read-only
+    learning_path = tuple(
+        MappingProxyType({key: tuple(value) if isinstance(value, list) else value for key, value in entry.items()})
+        for entry in generate_learning_path(critical, sorted(candidate))
+    )
+    gap = MappingProxyType({
+        "exact": frozenset(exact),
+        "fuzzy": MappingProxyType(fuzzy),
+        "critical": frozenset(critical),
+        "learning_path": learning_path
+    })
+    _gap_cache.set(key, gap)
+    return gap
+
+
+def gap_cache_stats() -> Dict:
+    """Hit/miss/eviction counters of the skill gap cache"""
+    return _gap_cache.stats()
+
+
+def clear_gap_cache():
+    _gap_cache.clear()
+
+
 def normalize_skill(skill: str) -> str:
-    """Normalize skill names for comparison"""
-    # Convert to lowercase and remove special characters
-    normalized = skill.lower().strip()
-    
-    # Handle common variations
-    replacements = {
-        "reactjs": "react",
-        "react.js": "react",
-        "nodejs": "node.js",
-        "node": "node.js",
-        "javascript": "js",
-        "typescript": "ts",
-        "postgresql": "postgres",
-        "amazon web services": "aws",
-        "artificial intelligence": "ai",
-        "machine learning": "ml",
-        "deep learning": "dl",
-        "natural language processing": "nlp",
-        "continuous integration": "ci/cd",
-        "kubernetes": "k8s"
-    }
-    
-    return replacements.get(normalized, normalized)
+    """Normalize skill names for comparison (synonyms map to the canonical ontology name)"""
+    return ONTOLOGY.canonical(skill)
 
 
-def find_similar_skill(target: str, candidate_skills: List[str], threshold: float = 0.7) -> str:
-    """Find similar skill using string similarity (Levenshtein distance approximation)"""
-    
-    best_match = None
-    best_score = 0
-    
-    for candidate in candidate_skills:
-        # Simple similarity: count matching characters
-        similarity = calculate_similarity(target, candidate)
-        
-        if similarity > threshold and similarity > best_score:
-            best_score = similarity
-            best_match = candidate
-    
-    return best_match
+def find_similar_skill(target: str, candidate_skills: List[str], threshold: Optional[float] = None) -> Optional[str]:
+    """Most similar candidate skill by character n-gram similarity, None below the threshold"""
+    threshold = SKILL_FUZZY_THRESHOLD if threshold is None else threshold
+    similar = FuzzySkillIndex(candidate_skills).best(target, threshold)
+    return similar[0] if similar else None
 
 
 def calculate_similarity(s1: str, s2: str) -> float:
-    """Calculate string similarity (0-1) using character overlap"""
+    """Calculate string similarity (0-1) as Jaccard similarity of character n-grams"""
     if not s1 or not s2:
         return 0.0
-    
-    # Convert to sets of characters
-    set1 = set(s1.lower())
-    set2 = set(s2.lower())
-    
-    # Calculate Jaccard similarity
-    intersection = len(set1.intersection(set2))
-    union = len(set1.union(set2))
-    
-    return intersection / union if union > 0 else 0.0
+    return similarity(s1.lower(), s2.lower())
 
 
 def categorize_skills(missing_skills: List[str]) -> Dict[str, List[str]]:
     """Categorize missing skills by priority (critical vs nice-to-have)"""
     
     # Skills that are fundamental and high-priority in job market
-    critical_skills_db = {
-        "python", "java", "javascript", "react", "node.js", "sql", "aws",
-        "docker", "kubernetes", "git", "rest api", "machine learning",
-        "typescript", "django", "flask", "fastapi", "postgresql", "mongodb",
-        "redis", "ci/cd", "microservices", "agile", "scrum", "testing"
-    }
+    critical_mask = ONTOLOGY.flag_mask("gap_critical")
     
     critical = []
     nice_to_have = []
     
     for skill in missing_skills:
-        skill_normalized = normalize_skill(skill)
+        skill_id = ONTOLOGY.skill_id(skill)
         
-        if skill_normalized in critical_skills_db:
+        if skill_id is not None and critical_mask >> skill_id & 1:
             critical.append(skill)
         else:
             nice_to_have.append(skill)
@@ -164,78 +209,59 @@ def categorize_skills(missing_skills: List[str]) -> Dict[str, List[str]]:
     }
 
 
-def generate_learning_path(missing_skills: List[str]) -> List[Dict]:
-    """Generate learning path with prerequisites and recommended order"""
-    
-    # Skill dependency graph: {skill: [prerequisites]}
-    skill_dependencies = {
-        "react": ["javascript", "html", "css"],
-        "node.js": ["javascript"],
-        "django": ["python"],
-        "flask": ["python"],
-        "fastapi": ["python"],
-        "machine learning": ["python", "statistics"],
-        "deep learning": ["machine learning", "python"],
-        "nlp": ["machine learning"],
-        "docker": ["linux"],
-        "kubernetes": ["docker"],
-        "aws": [],
-        "typescript": ["javascript"],
-        "postgresql": ["sql"],
-        "mongodb": [],
-        "microservices": ["rest api", "docker"],
-        "ci/cd": ["git"]
-    }
+def generate_learning_path(missing_skills: List[str], candidate_skills: Optional[List[str]] = None) -> List[Dict]:
+    """
+    Generate learning path with prerequisites and recommended order.
+
+    The path holds the missing skills plus every transitive prerequisite the
+    candidate lacks, in dependency order from the compiled prerequisite graph.
+    Skills outside the ontology come last, in input order.
+    """
+    
+    labels = {}
+    unknown = []
+    missing_bits = 0
+    for skill in missing_skills:
+        skill_id = ONTOLOGY.skill_id(skill)
+        if skill_id is None:
+            unknown.append(skill)
+        else:
+            labels.setdefault(skill_id, skill)
+            missing_bits |= 1 << skill_id
+    known_bits = ONTOLOGY.to_bitset(candidate_skills)[0] if candidate_skills else 0
+    foundational = ONTOLOGY.flag_mask("foundational")
+    targets = list(labels)
     
     learning_path = []
+    for skill_id in SKILL_GRAPH.learning_order(missing_bits, known_bits):
+        # Prerequisites, hours and resources come from the skill ontology
+        entry = ONTOLOGY.skills[skill_id]
+        learning_path.append({
+            "skill": labels.get(skill_id, entry.name),
+            "prerequisites": list(entry.prerequisites),
+            "estimated_hours": entry.learning_hours,
+            "resources": list(entry.resources),
+            "priority": "high" if foundational >> skill_id & 1 else "medium",
+            "required_for": [labels[target] for target in SKILL_GRAPH.required_for(skill_id, targets)]
+        })
     
-    for skill in missing_skills:
-        skill_norm = normalize_skill(skill)
-        prerequisites = skill_dependencies.get(skill_norm, [])
-        
-        # Estimate learning time (in hours)
-        time_estimates = {
-            "javascript": 40,
-            "python": 40,
-            "react": 30,
-            "node.js": 25,
-            "sql": 20,
-            "docker": 15,
-            "kubernetes": 25,
-            "machine learning": 60,
-            "deep learning": 80,
-            "aws": 30
-        }
-        
+    for skill in unknown:
         learning_path.append({
             "skill": skill,
-            "prerequisites": prerequisites,
-            "estimated_hours": time_estimates.get(skill_norm, 20),
-            "resources": get_learning_resources(skill_norm),
-            "priority": "high" if skill_norm in ["python", "javascript", "sql", "git"] else "medium"
+            "prerequisites": [],
+            "estimated_hours": ONTOLOGY.default_learning_hours,
+            "resources": get_learning_resources(skill),
+            "priority": "medium",
+            "required_for": []
         })
     
-    # Sort by priority and prerequisites
-    learning_path.sort(key=lambda x: (x["priority"] != "high", len(x["prerequisites"])))
-    
     return learning_path
 
 
 def get_learning_resources(skill: str) -> List[str]:
     """Get recommended learning resources for a skill"""
-    
-    resources_db = {
-        "python": ["Python.org Tutorial", "Automate the Boring Stuff", "Real Python"],
-        "javascript": ["MDN Web Docs", "JavaScript.info", "freeCodeCamp"],
-        "react": ["React Official Docs", "React for Beginners", "Scrimba React Course"],
-        "machine learning": ["Coursera ML by Andrew Ng", "Fast.ai", "Kaggle Learn"],
-        "docker": ["Docker Official Tutorial", "Docker Mastery Udemy", "Play with Docker"],
-        "sql": ["SQLZoo", "Mode Analytics SQL Tutorial", "W3Schools SQL"],
-        "aws": ["AWS Free Tier", "AWS Cloud Practitioner", "A Cloud Guru"],
-        "git": ["Git Official Tutorial", "Atlassian Git Tutorial", "Learn Git Branching"]
-    }
-    
-    return resources_db.get(skill, ["Google Search", "YouTube Tutorials", "Official Documentation"])
+    entry = ONTOLOGY.get(skill)
+    return list(entry.resources if entry else ONTOLOGY.default_resources)
 
 
 def estimate_learning_time(skill_categories: Dict[str, List[str]]) -> int:
@@ -0,0 +1,108 @@
+import heapq
+import os
+from typing import Dict, Iterable, List, Tuple
+
+from .lru_cache import LRUCache
+from .skill_ontology import ONTOLOGY, SkillOntology, iter_bits
+
+# Memoized learning-path orders, keyed by (missing skills, relevant known skills)
+LEARNING_PATH_CACHE_SIZE = int(os.getenv("LEARNING_PATH_CACHE_SIZE", "4096"))
+
+
+class SkillGraph:
+    """
+    The ontology's prerequisite graph, compiled once.
+
+    Direct and transitive prerequisites are kept as skill bitsets, and every
+    skill gets a rank in one fixed topological order (prerequisites first;
+    among skills that are free to go next, foundational skills, then fewer
+    prerequisites, then ontology order). Any subset sorted by rank is
+    therefore also in dependency order.
+    """
+
+    def __init__(self, ontology: SkillOntology):
+        self.ontology = ontology
+        self.version = ontology.version
+        count = len(ontology.skills)
+        foundational = ontology.flag_mask("foundational")
+
+        self.direct = [0] * count
+        for skill in ontology.skills:
+            for name in skill.prerequisites:
+                prerequisite = ontology.skill_id(name)
+                if prerequisite is None:
+                    print(f"[SkillGraph] ⚠ Unknown prerequisite '{name}' of '{skill.name}' ignored")
+                    continue
+                self.direct[skill.id] |= 1 << prerequisite
+
+        # Kahn's algorithm with the priority tie-break
+        dependents = [[] for _ in range(count)]
+        waiting = [bits.bit_count() for bits in self.direct]
+        for skill_id, bits in enumerate(self.direct):
+            for prerequisite in iter_bits(bits):
+                dependents[prerequisite].append(skill_id)
+
+        def key(skill_id: int) -> Tuple[bool, int, int]:
+            return not foundational >> skill_id & 1, self.direct[skill_id].bit_count(), skill_id
+
+        ready = [key(skill_id) for skill_id in range(count) if not waiting[skill_id]]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            skill_id = heapq.heappop(ready)[2]
+            order.append(skill_id)
+            for dependent in dependents[skill_id]:
+                waiting[dependent] -= 1
+                if not waiting[dependent]:
+                    heapq.heappush(ready, key(dependent))
+        if len(order) < count:
+            cyclic = [ontology.skills[skill_id].name for skill_id in range(count) if waiting[skill_id]]
+            raise ValueError(f"Prerequisite cycle among: {', '.join(cyclic)}")
+
+        self.order = order
+        self.rank = [0] * count
+        for position, skill_id in enumerate(order):
+            self.rank[skill_id] = position
+        # Prerequisites come first in `order`, so their closures are complete when read
+        self.closure = [0] * count
+        for skill_id in order:
+            closure = self.direct[skill_id]
+            for prerequisite in iter_bits(self.direct[skill_id]):
+                closure |= self.closure[prerequisite]
+            self.closure[skill_id] = closure
+
+        self._paths = LRUCache(max_entries=LEARNING_PATH_CACHE_SIZE)
+
+    def prerequisites(self, bits: int) -> int:
+        """Transitive prerequisites of every skill in a bitset"""
+        closure = 0
+        for skill_id in iter_bits(bits):
+            closure |= self.closure[skill_id]
+        return closure
+
+    def learning_order(self, missing: int, known: int = 0) -> Tuple[int, ...]:
+        """
+        Skill ids to learn, in dependency order: the missing skills plus every
+        transitive prerequisite of them not in `known`. Memoized per (missing,
+        known prerequisites) pair.
+        """
+        prerequisites = self.prerequisites(missing)
+        key = (missing, known & prerequisites)
+        order = self._paths.get(key)
+        if order is None:
+            needed = missing | (prerequisites & ~known)
+            order = tuple(sorted(iter_bits(needed), key=self.rank.__getitem__))
+            self._paths.set(key, order)
+        return order
+
+    def required_for(self, skill_id: int, targets: Iterable[int]) -> List[int]:
+        """The targets that need `skill_id`, directly or transitively"""
+        return [target for target in targets if self.closure[target] >> skill_id & 1]
+
+    def cache_stats(self) -> Dict:
+        """Hit/miss/eviction counters of the learning-path cache"""
+        return self._paths.stats()
+
+
+# Compiled once at import, next to the ontology it is built from
+SKILL_GRAPH = SkillGraph(ONTOLOGY)
@@ -0,0 +1,133 @@
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+SKILL_ONTOLOGY_PATH = os.getenv("SKILL_ONTOLOGY_PATH", os.path.join(BASE_DIR, "skill_ontology.json"))
+
+
+@dataclass(frozen=True)
+class Skill:
+    """One canonical skill; its id is also its bit position in skill bitsets"""
+    id: int
+    name: str
+    category: str
+    synonyms: Tuple[str, ...]
+    flags: Tuple[str, ...]
+    prerequisites: Tuple[str, ...]
+    learning_hours: int
+    resources: Tuple[str, ...]
+
+
+class SkillOntology:
+    """
+    Every skill vocabulary of the app, loaded from one versioned JSON file.
+
+    Skill names and synonyms resolve to integer IDs, and sets of skills are
+    Python ints used as bitsets: overlap is `a & b`, its size `.bit_count()`,
+    and flag or category membership is a precomputed mask.
+    """
+
+    def __init__(self, data: Dict):
+        self.version = str(data["version"])
+        self.default_learning_hours = int(data.get("default_learning_hours", 20))
+        self.default_resources = tuple(data.get("default_resources", ()))
+
+        self.skills: List[Skill] = []
+        self._ids: Dict[str, int] = {}
+        self._flag_masks: Dict[str, int] = {}
+        self._category_masks: Dict[str, int] = {}
+        for position, entry in enumerate(data["skills"]):
+            if entry["id"] != position:
+                raise ValueError(f"Skill ids must be dense and ordered (got {entry['id']} at {position})")
+            skill = Skill(
+                id=entry["id"],
+                name=entry["name"],
+                category=entry.get("category", "other"),
+                synonyms=tuple(entry.get("synonyms", ())),
+                flags=tuple(entry.get("flags", ())),
+                prerequisites=tuple(entry.get("prerequisites", ())),
+                learning_hours=int(entry.get("learning_hours", self.default_learning_hours)),
+                resources=tuple(entry.get("resources", self.default_resources))
+            )
+            self.skills.append(skill)
+            for name in (skill.name,) + skill.synonyms:
+                key = normalize_name(name)
+                if key in self._ids:
+                    raise ValueError(f"'{name}' resolves to more than one skill")
+                self._ids[key] = skill.id
+            for flag in skill.flags:
+                self._flag_masks[flag] = self._flag_masks.get(flag, 0) | (1 << skill.id)
+            self._category_masks[skill.category] = self._category_masks.get(skill.category, 0) | (1 << skill.id)
+
+        self.extraction_terms = tuple(data.get("extraction_terms", ()))
+        keywords = data.get("ats_keywords", {})
+        self.tech_keywords = tuple(keywords.get("technical", ()))
+        self.degree_keywords = tuple(keywords.get("degrees", ()))
+        self.action_verb_keywords = tuple(keywords.get("action_verbs", ()))
+
+    def skill_id(self, name: str) -> Optional[int]:
+        """Canonical id of a skill name or synonym, None if unknown"""
+        return self._ids.get(normalize_name(name))
+
+    def canonical(self, name: str) -> str:
+        """Canonical name of a skill, or the normalized input for unknown skills"""
+        skill_id = self.skill_id(name)
+        return self.skills[skill_id].name if skill_id is not None else normalize_name(name)
+
+    def to_bitset(self, names: Iterable[str]) -> Tuple[int, Set[str]]:
+        """Bitset of the known skills plus the normalized names that are not in the ontology"""
+        bits = 0
+        unknown = set()
+        for name in names:
+            skill_id = self._ids.get(normalize_name(name))
+            if skill_id is None:
+                unknown.add(normalize_name(name))
+            else:
+                bits |= 1 << skill_id
+        return bits, unknown
+
+    def names(self, bits: int) -> List[str]:
+        """Canonical names of the skills in a bitset, in id order"""
+        return [self.skills[skill_id].name for skill_id in iter_bits(bits)]
+
+    def flag_mask(self, flag: str) -> int:
+        return self._flag_masks.get(flag, 0)
+
+    def category_mask(self, category: str) -> int:
+        return self._category_masks.get(category, 0)
+
+    def has_flag(self, name: str, flag: str) -> bool:
+        skill_id = self.skill_id(name)
+        return skill_id is not None and bool(self.flag_mask(flag) >> skill_id & 1)
+
+    def get(self, name: str) -> Optional[Skill]:
+        skill_id = self.skill_id(name)
+        return self.skills[skill_id] if skill_id is not None else None
+
+
+def normalize_name(name: str) -> str:
+    return " ".join(str(name).lower().split())
+
+
+def iter_bits(bits: int) -> Iterable[int]:
+    """Positions of the set bits, lowest first"""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+def jaccard(a: int, b: int) -> float:
+    union = (a | b).bit_count()
+    return (a & b).bit_count() / union if union else 0.0
+
+
+def load_ontology(path: str = SKILL_ONTOLOGY_PATH) -> SkillOntology:
+    with open(path, encoding="utf-8") as f:
+        return SkillOntology(json.load(f))
+
+
+# Loaded once at import; every module shares this instance
+ONTOLOGY = load_ontology()
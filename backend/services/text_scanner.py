@@ -0,0 +1,135 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import FrozenSet, Iterable, Optional
+
+# Section headers and action verbs are plain substrings of the lowercased text
+SECTION_WORDS = ("experience", "education", "skills", "projects", "summary")
+FORMAT_ACTION_VERBS = ("developed", "built", "created", "designed", "implemented", "led", "managed")
+METRIC_WORDS = ("increased", "improved", "reduced")
+
+# One alternation covering every signal. Order matters: when two signals overlap
+# the earlier alternative wins, so the longest/most specific patterns come first.
+_SCANNER = re.compile(
+    r"(?P<email>(?<![\w.%+-])[\w.%+-]+@[\w.-]+\.\w+)"
+    r"|(?P<profile>(?i:(?P<site>linkedin\.com/in|github\.com)/(?P<handle>[\w-]+)))"
+    r"|(?P<phone>(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})"
+    r"|(?P<experience>(?i:(?P<exp_years>\d+)\+?\s*years?\s*(?:of)?\s*experience))"
+    r"|(?P<metric>\d+%|\$\d+|\d+\+)"
+    r"|(?P<year>(?:19|20)\d{2})"
+    r"|(?P<word>(?i:" + "|".join(SECTION_WORDS + METRIC_WORDS + FORMAT_ACTION_VERBS) + r"))"
+)
+
+# Narrower variants applied only to the (short) spans the scanner already found
+_CONTACT_EMAIL = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b")
+_FORMAT_EMAIL = re.compile(r"\b[\w\.-]+@[\w\.-]+\.\w+\b")
+_STRICT_PHONE = re.compile(r"\b\d{3}[-.]?\d{3}[-.]?\d{4}\b")
+
+
+@dataclass(frozen=True)
+class TextSignals:
+    """Every regex-derived signal of a resume, produced by a single scan"""
+    email: str
+    phone: str
+    linkedin: str
+    github: str
+    has_email: bool
+    has_phone: bool
+    years: FrozenSet[int]
+    stated_experience_years: Optional[int]
+    sections: FrozenSet[str]
+    action_verbs: FrozenSet[str]
+    has_metrics: bool
+    word_count: int
+
+
+@lru_cache(maxsize=128)
+def scan_text(text: str) -> TextSignals:
+    """
+    Walk the text once and collect contact, experience and format signals.
+
+    Results are memoized on the text itself, so the parser, the ATS engine and
+    the career advisor share one scan per resume.
+    """
+    email = phone = linkedin = github = ""
+    has_email = has_phone = has_metrics = False
+    years = set()
+    stated_experience: Optional[int] = None
+    words = set()
+
+    for match in _SCANNER.finditer(text):
+        kind = match.lastgroup
+        if kind == "email":
+            span = match.group()
+            if not email:
+                contact = _CONTACT_EMAIL.search(span)
+                email = contact.group() if contact else ""
+            has_email = has_email or bool(_FORMAT_EMAIL.search(span))
+        elif kind == "profile":
+            site = match.group("site").lower()
+            if site.startswith("linkedin") and not linkedin:
+                linkedin = f"linkedin.com/in/{match.group('handle')}"
+            elif site.startswith("github") and not github:
+                github = f"github.com/{match.group('handle')}"
+        elif kind == "phone":
+            span = match.group()
+            if not phone:
+                phone = span.strip()
+            has_phone = has_phone or bool(_STRICT_PHONE.search(span))
+        elif kind == "experience":
+            if stated_experience is None:
+                stated_experience = int(match.group("exp_years"))
+            # The consumed span still counts as a section header / "N+" metric
+            words.add("experience")
+            has_metrics = has_metrics or "+" in match.group()
+        elif kind == "metric":
+            has_metrics = True
+        elif kind == "year":
+            years.add(int(match.group()))
+        else:
+            words.add(match.group().lower())
+
+    return TextSignals(
+        email=email,
+        phone=phone,
+        linkedin=linkedin,
+        github=github,
+        has_email=has_email,
+        has_phone=has_phone,
+        years=frozenset(years),
+        stated_experience_years=stated_experience,
+        sections=frozenset(w for w in words if w in SECTION_WORDS),
+        action_verbs=frozenset(w for w in words if w in FORMAT_ACTION_VERBS),
+        has_metrics=has_metrics or any(w in METRIC_WORDS for w in words),
+        word_count=len(text.split())
+    )
+
+
+def merge_signals(parts: Iterable[TextSignals]) -> TextSignals:
+    """
+    Combine the signals of consecutive text segments (e.g. resume sections).
+
+    Matches that would span a segment boundary are not considered; "first"
+    values (email, phone, profiles, stated experience) come from the earliest
+    segment that has one.
+    """
+    parts = list(parts)
+
+    def first(attr):
+        return next((getattr(p, attr) for p in parts if getattr(p, attr)), "")
+
+    stated = next((p.stated_experience_years for p in parts if p.stated_experience_years is not None), None)
+    return TextSignals(
+        email=first("email"),
+        phone=first("phone"),
+        linkedin=first("linkedin"),
+        github=first("github"),
+        has_email=any(p.has_email for p in parts),
+        has_phone=any(p.has_phone for p in parts),
+        years=frozenset().union(*(p.years for p in parts)),
+        stated_experience_years=stated,
+        sections=frozenset().union(*(p.sections for p in parts)),
+        action_verbs=frozenset().union(*(p.action_verbs for p in parts)),
+        has_metrics=any(p.has_metrics for p in parts),
+        word_count=sum(p.word_count for p in parts)
+    )
@@ -0,0 +1,247 @@
+import mmap
+import os
+import re
+import tempfile
+import zlib
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, BinaryIO, Iterator, List, Tuple
+
+from .execution import run_io
+
+# Hard limits enforced before any PDF parsing happens
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_MAX_PAGES = int(os.getenv("UPLOAD_MAX_PAGES", "100"))
+UPLOAD_MAX_DECOMPRESSED_BYTES = int(os.getenv("UPLOAD_MAX_DECOMPRESSED_BYTES", str(100 * 1024 * 1024)))
+UPLOAD_SPOOL_DIR = os.getenv("UPLOAD_SPOOL_DIR") or None
+
+_COPY_CHUNK = 256 * 1024
+_INFLATE_CHUNK = 256 * 1024
+
+_PAGE_OBJECT = re.compile(rb"/Type\s*/Page(?![A-Za-z])")
+_PAGES_NODE = re.compile(rb"/Type\s*/Pages(?![A-Za-z])")
+_PAGE_COUNT = re.compile(rb"/Count\s+(\d+)")
+_NESTED_DICT = re.compile(rb"<<(?:(?!<<|>>).)*>>", re.DOTALL)
+# How far around a /Type /Pages key its dictionary is looked for
+_DICT_WINDOW = 4096
+# Bytes of the previous inflated chunk kept so keys split across chunks are still found
+_CHUNK_OVERLAP = 512
+_STREAM_START = re.compile(rb"(?<!end)stream\r?\n")
+_FONT = b"/Font"
+_IMAGE = b"/Image"
+
+
+class UploadRejected(ValueError):
+    """Raised when an upload violates a hard limit; carries the HTTP status to return"""
+
+    def __init__(self, message: str, status_code: int = 413):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@dataclass(frozen=True)
+class PDFProbe:
+    """Cheap structural facts about a PDF gathered without parsing it"""
+    size_bytes: int
+    page_count: int
+    decompressed_bytes: int
+    has_text_layer: bool
+    has_images: bool
+
+
+@dataclass(frozen=True)
+class IngestedUpload:
+    """A validated upload spooled to disk and ready for path-based parsing"""
+    filename: str
+    path: str
+    probe: PDFProbe
+
+
+def spool_upload(source: BinaryIO, path: str, max_bytes: int = UPLOAD_MAX_BYTES) -> int:
+    """Copy an upload stream to path in chunks, aborting as soon as max_bytes is exceeded"""
+    if hasattr(source, "seek"):
+        source.seek(0)
+    written = 0
+    with open(path, "wb") as out:
+        while True:
+            chunk = source.read(_COPY_CHUNK)
+            if not chunk:
+                break
+            written += len(chunk)
+            if written > max_bytes:
+                raise UploadRejected(f"File exceeds the {max_bytes // (1024 * 1024)} MB upload limit")
+            out.write(chunk)
+    return written
+
+
+def probe_pdf(path: str, max_bytes: int = UPLOAD_MAX_BYTES) -> PDFProbe:
+    """
+    Validate a spooled PDF through a memory-mapped view of the file.
+
+    Checks the header, counts pages, inflates every Flate stream under a total
+    output budget (so decompression bombs are caught before pdfplumber sees
+    them) and looks for a text layer. Image-only scans are rejected here
+    because text extraction would return nothing anyway.
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        raise UploadRejected("Uploaded file is empty", status_code=400)
+    if size > max_bytes:
+        raise UploadRejected(f"File exceeds the {max_bytes // (1024 * 1024)} MB upload limit")
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        if buffer.find(b"%PDF-", 0, 1024) < 0:
+            raise UploadRejected("Uploaded file is not a PDF", status_code=415)
+
+        page_objects = len(_PAGE_OBJECT.findall(buffer))
+        page_counts = _pages_counts(buffer)
+        has_fonts = buffer.find(_FONT) >= 0
+        has_images = buffer.find(_IMAGE) >= 0
+
+        decompressed = 0
+        for start, end in _flate_stream_spans(buffer):
+            inflater = zlib.decompressobj()
+            tail = b""
+            try:
+                for offset in range(start, end, _INFLATE_CHUNK):
+                    data = buffer[offset:min(offset + _INFLATE_CHUNK, end)]
+                    while data:
+                        out = inflater.decompress(data, _INFLATE_CHUNK)
+                        data = inflater.unconsumed_tail
+                        decompressed += len(out)
+                        if decompressed > UPLOAD_MAX_DECOMPRESSED_BYTES:
+                            raise UploadRejected("PDF content expands beyond the allowed size")
+                        # Object streams can hide page and font objects from the raw scan
+                        window = tail + out
+                        page_objects += sum(1 for m in _PAGE_OBJECT.finditer(window) if m.end() > len(tail))
+                        page_counts.extend(_pages_counts(window))
+                        has_fonts = has_fonts or _FONT in window
+                        has_images = has_images or _IMAGE in window
+                        tail = window[-_CHUNK_OVERLAP:]
+                        if not out:
+                            break
+            except zlib.error:
+                continue
+
+    page_count = max([page_objects] + page_counts)
+    if page_count > UPLOAD_MAX_PAGES:
+        raise UploadRejected(f"PDF has {page_count} pages (limit {UPLOAD_MAX_PAGES})")
+    if not has_fonts:
+        detail = "PDF appears to be a scanned image with no text layer" if has_images else "PDF has no text layer"
+        raise UploadRejected(f"{detail}. Please upload a text-based PDF", status_code=422)
+
+    return PDFProbe(
+        size_bytes=size,
+        page_count=page_count,
+        decompressed_bytes=decompressed,
+        has_text_layer=has_fonts,
+        has_images=has_images
+    )
+
+
+def _pages_counts(data) -> List[int]:
+    """
+    /Count values of the page tree nodes (/Type /Pages dictionaries) in data.
+    Other dictionaries use /Count too (outlines count bookmarks), so the key
+    is only read at the top level of a Pages dictionary.
+    """
+    counts = []
+    for match in _PAGES_NODE.finditer(data):
+        start = _dictionary_start(data, match.start())
+        end = data.find(b">>", match.end(), match.end() + _DICT_WINDOW)
+        if start < 0 or end < 0:
+            continue
+        # Extend past nested dictionaries (e.g. inherited /Resources) to the matching >>
+        body = data[start + 2:end]
+        while body.count(b"<<") > body.count(b">>"):
+            end = data.find(b">>", end + 2, match.end() + _DICT_WINDOW)
+            if end < 0:
+                break
+            body = data[start + 2:end]
+        if end < 0:
+            continue
+        previous = None
+        while previous != body:
+            previous, body = body, _NESTED_DICT.sub(b"", body)
+        counts.extend(int(n) for n in _PAGE_COUNT.findall(body))
+    return counts
+
+
+def _dictionary_start(data, position: int) -> int:
+    """Offset of the << opening the dictionary that contains position, -1 if not found nearby"""
+    depth = 0
+    low = max(0, position - _DICT_WINDOW)
+    while position > low:
+        opening = data.rfind(b"<<", low, position)
+        closing = data.rfind(b">>", low, position)
+        if opening < 0:
+            return -1
+        if closing > opening:
+            depth += 1
+            position = closing
+        elif depth:
+            depth -= 1
+            position = opening
+        else:
+            return opening
+    return -1
+
+
+def _flate_stream_spans(buffer) -> Iterator[Tuple[int, int]]:
+    """Yield (start, end) offsets of every FlateDecode stream payload"""
+    pos = 0
+    while True:
+        match = _STREAM_START.search(buffer, pos)
+        if not match:
+            return
+        end = buffer.find(b"endstream", match.end())
+        if end < 0:
+            return
+        # The stream dictionary sits right before the keyword
+        header = buffer[max(0, match.start() - 512):match.start()]
+        obj_start = header.rfind(b"obj")
+        if b"FlateDecode" in (header[obj_start:] if obj_start >= 0 else header):
+            yield match.end(), end
+        pos = end + len(b"endstream")
+
+
+@contextmanager
+def ingest_upload(upload, max_bytes: int = UPLOAD_MAX_BYTES) -> Iterator[IngestedUpload]:
+    """
+    Spool a FastAPI UploadFile to a temp file, enforce the hard limits and yield
+    the validated upload. The temp file is removed on exit.
+    """
+    path = _temp_path()
+    try:
+        yield _spool_and_probe(upload, path, max_bytes)
+    finally:
+        _remove(path)
+
+
+@asynccontextmanager
+async def ingest_upload_async(upload, max_bytes: int = UPLOAD_MAX_BYTES) -> AsyncIterator[IngestedUpload]:
+    """ingest_upload with spooling and probing moved off the event loop"""
+    path = _temp_path()
+    try:
+        yield await run_io("io", _spool_and_probe, upload, path, max_bytes)
+    finally:
+        _remove(path)
+
+
+def _spool_and_probe(upload, path: str, max_bytes: int) -> IngestedUpload:
+    filename = getattr(upload, "filename", None) or "upload.pdf"
+    spool_upload(upload.file, path, max_bytes)
+    return IngestedUpload(filename=filename, path=path, probe=probe_pdf(path, max_bytes))
+
+
+def _temp_path() -> str:
+    fd, path = tempfile.mkstemp(suffix=".pdf", dir=UPLOAD_SPOOL_DIR)
+    os.close(fd)
+    return path
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -1,8 +1,17 @@
 """Test script to verify enhanced algorithms work correctly"""
 
 from services.skill_gap import analyze_skill_gap
-from services.job_matcher import match_jobs
-from services.ats_engine import calculate_detailed_ats
+from services.job_matcher import match_jobs, calculate_match_scores, classify_fit, rank_jobs_page
+from services.ats_engine import calculate_ats, calculate_detailed_ats, prepare_job_description, job_cache_stats
+from services.skill_automaton import SkillAutomaton
+from services.ats_vectorizer import fit_idf_model, set_idf_model
+from services.ats_batch import score_matrix, top_k_jobs
+from services.skill_ontology import ONTOLOGY, jaccard
+from services.ats_session import create_session
+from services.semantic_index import SemanticIndex, fit_skill_embeddings, set_skill_embeddings
+from services.bulk_matcher import match_candidates
+from services.skill_gap import find_similar_skill, generate_learning_path, gap_cache_stats
+from services.learning_planner import plan_learning
 
 print("=" * 60)
 print("TESTING ENHANCED ALGORITHMS")
@@ -48,6 +57,371 @@ print(f"   ✓ Keyword Match: {result['breakdown']['keyword_match']}%")
 print(f"   ✓ Matched Keywords: {len(result['matched_keywords'])}")
 print(f"   ✓ Missing Keywords: {result['missing_keywords'][:3]}")
 
+# Test 4: Skill Automaton
+print("\n4. Testing Skill Automaton...")
+automaton = SkillAutomaton(["python", "c", "c++", "go", "java", "rest api", "node.js"])
+found = automaton.find_all("built rest apis in python, c++ and node.js; golang and javascript".lower())
+assert found == {"python", "c++", "node.js"}, found
+print(f"   ✓ Word-boundary matches: {sorted(found)}")
+
+# Test 5: ATS IDF model
+print("\n5. Testing ATS IDF Model...")
+pairwise_score = calculate_ats(resume, job_desc)
+# A model fitted on just the two documents reproduces the pairwise IDF exactly
+set_idf_model(fit_idf_model([resume, job_desc]))
+corpus_score = calculate_ats(resume, job_desc)
+assert abs(corpus_score - pairwise_score) < 0.01, (corpus_score, pairwise_score)
+set_idf_model(fit_idf_model([resume, job_desc], hashing=True))
+hashed_score = calculate_ats(resume, job_desc)
+set_idf_model(None)
+print(f"   ✓ Pairwise: {pairwise_score}, corpus-fitted: {corpus_score}, hashed: {hashed_score}")
+
+# Test 6: Job description cache
+print("\n6. Testing Job Description Cache...")
+posting = job_desc + "\nNice to have: Terraform."
+hits_before = job_cache_stats()["hits"]
+assert prepare_job_description(posting) is prepare_job_description("  " + posting.replace(" ", "   ") + "\n\n")
+assert job_cache_stats()["hits"] == hits_before + 1
+print(f"   ✓ Cache stats: {job_cache_stats()}")
+
+# Test 7: Batch ATS Engine
+print("\n7. Testing Batch ATS Engine...")
+resumes = [resume, resume + "\nLed a team of 5 engineers, reduced costs by 20%", "Marketing coordinator, SEO and content"]
+postings = [job_desc, posting, "Data analyst with SQL, Tableau and statistics"]
+matrix = score_matrix(resumes, postings)
+for i, r in enumerate(resumes):
+    for j, jd in enumerate(postings):
+        assert abs(matrix[i, j] - calculate_ats(r, jd)) < 0.01, (i, j)
+best = top_k_jobs(resumes, postings, k=2)
+assert [j for j, _ in best[0]] == list(matrix[0].argsort()[::-1][:2])
+print(f"   ✓ {matrix.shape[0]}x{matrix.shape[1]} matrix matches pairwise scores, top-2 for resume 0: {best[0]}")
+
+# Test 8: Skill Ontology
+print("\n8. Testing Skill Ontology...")
+assert ONTOLOGY.skill_id("K8s") == ONTOLOGY.skill_id("kubernetes")
+assert ONTOLOGY.canonical("ReactJS") == "react"
+left, _ = ONTOLOGY.to_bitset(["python", "ml", "docker"])
+right, _ = ONTOLOGY.to_bitset(["python", "machine learning", "aws", "sql"])
+assert ONTOLOGY.names(left & right) == ["python", "machine learning"]
+assert ONTOLOGY.has_flag("js", "gap_critical")
+print(f"   ✓ v{ONTOLOGY.version}: {len(ONTOLOGY.skills)} skills, Jaccard {jaccard(left, right):.2f}")
+
+# Test 9: Incremental ATS sessions
+print("\n9. Testing Incremental ATS Sessions...")
+session = create_session(resume + "\nExperience\nBuilt data pipelines in SQL", job_desc)
+session.apply([{"section": "experience", "text": "Experience\nLed Kubernetes migrations, cut costs by 30%"},
+               {"section": "projects", "text": "Projects\nReact dashboard"}])
+edited = "\n".join(session.section_text(name) for name in session.section_names)
+incremental = session.score()
+assert incremental["overall_score"] == calculate_detailed_ats(edited, job_desc)["overall_score"]
+print(f"   ✓ Revision {incremental['revision']} re-scored to {incremental['overall_score']} in {incremental['elapsed_ms']} ms")
+
+# Test 10: Vectorized job matcher agrees with the per-job reference scorer
+print("\n10. Testing Vectorized Job Matcher...")
+import os
+import tempfile
+import pandas as pd
+import numpy as np
+from collections import Counter
+from services.job_catalog import JobCatalog, get_catalog, set_catalog
+catalog_df = pd.DataFrame({
+    "role": ["Backend", "Data", "Infra", "Web"],
+    "skills": ["python,django,sql", "python,ml,Foo Tool,sql", "k8s,docker,aws,python", "react,js,css"],
+    "salary_lpa": [10, 14, 16, 8],
+    "experience_required": [2, 0, 5, 1]
+})
+saved_catalog = get_catalog()
+set_catalog(JobCatalog.from_frame(catalog_df))
+candidate = ["python", "machine learning", "foo tool", "kubernetes"]
+ranked = match_jobs(candidate, experience_years=3)
+assert match_jobs(candidate, experience_years=3, top_k=2) == ranked[:2]
+with tempfile.TemporaryDirectory() as catalog_dir:
+    get_catalog().save(catalog_dir)
+    set_catalog(JobCatalog.open(catalog_dir))
+    assert match_jobs(candidate, experience_years=3) == ranked
+    set_catalog(None)
+vectorized = {job["role"]: job for job in ranked}
+set_catalog(saved_catalog)
+row_skills = [[ONTOLOGY.canonical(s) for s in skills.split(",")] for skills in catalog_df["skills"]]
+frequency = Counter(skill for skills in row_skills for skill in skills)
+for role, skills, exp in zip(catalog_df["role"], row_skills, catalog_df["experience_required"]):
+    ref = calculate_match_scores([ONTOLOGY.canonical(s) for s in candidate], skills, frequency, len(catalog_df), 3, exp)
+    final = (ref["skill_overlap"] * 0.30 + ref["tfidf_score"] * 0.25 + ref["skill_importance"] * 0.20 +
+             ref["experience_match"] * 0.15 + ref["rarity_bonus"] * 0.10)
+    assert vectorized[role]["match_score"] == round(final * 100, 2), role
+    assert vectorized[role]["matched_skills"] == ref["matched_skills"], role
+    assert vectorized[role]["missing_skills"] == ref["missing_skills"], role
+    assert vectorized[role]["fit_level"] == classify_fit(final), role
+print(f"   ✓ {len(vectorized)} jobs match the reference scorer: {[(r, j['match_score']) for r, j in vectorized.items()]}")
+
+# Test 11: Incremental catalog appends match a full rebuild
+print("\n11. Testing Job Catalog Appends...")
+extra_jobs = pd.DataFrame({"role": ["Platform", "Data"], "skills": ["rust,k8s,Bar Tool", "python,spark"],
+                           "salary_lpa": [20, 15], "experience_required": [4, 2]})
+appended = JobCatalog.from_frame(catalog_df).append(extra_jobs)
+rebuilt = JobCatalog.from_frame(pd.concat([catalog_df, extra_jobs], ignore_index=True))
+assert appended.meta == rebuilt.meta
+assert (appended.postings_indices == rebuilt.postings_indices).all() and (appended.skill_counts == rebuilt.skill_counts).all()
+assert abs(appended.max_tfidf - rebuilt.max_tfidf).max() < 1e-12
+from services.job_catalog import append_jobs, current_version
+with tempfile.TemporaryDirectory() as catalog_dir:
+    JobCatalog.from_frame(catalog_df).save(catalog_dir)
+    set_catalog(JobCatalog.open(catalog_dir))
+    first_version = current_version(catalog_dir)
+    append_jobs(extra_jobs)
+    # Saved as a new snapshot behind the "current" pointer; the old one is kept for readers mid-open
+    assert get_catalog().version == current_version(catalog_dir) != first_version
+    assert JobCatalog.open(catalog_dir).size == appended.size and first_version in os.listdir(catalog_dir)
+    try:
+        append_jobs(extra_jobs.assign(salary_lpa=["abc", 15]))
+        raise AssertionError("non-numeric salary was accepted")
+    except ValueError as e:
+        assert "salary_lpa" in str(e) and get_catalog().size == appended.size
+    set_catalog(None)
+print(f"   ✓ {appended.size} jobs / {len(appended.vocabulary)} skills after append, identical to a rebuild")
+
+# Test 12: Filtered ranking only scores jobs passing the filters
+print("\n12. Testing Filtered Job Ranking...")
+set_catalog(appended)
+page = rank_jobs_page(candidate, {"min_salary": 12, "max_experience": 4, "experience_years": 3}, limit=2)
+assert page["total"] == 3 and [job["role"] for job in page["results"]] == ["Data", "Data"]
+assert all(job["salary"] >= 12 for job in page["results"])
+set_catalog(None)
+print(f"   ✓ {page['total']} jobs pass the filters, page: {[(j['role'], j['final_score']) for j in page['results']]}")
+
+# Test 13: Semantic matching credits related skills
+print("\n13. Testing Semantic Job Matching...")
+set_catalog(appended)
+without = {job["role"]: job["match_score"] for job in match_jobs(["pytorch"], top_k=3)}
+embeddings = fit_skill_embeddings([[s for s in skills.split(",")] for skills in catalog_df["skills"]], dims=8)
+assert embeddings.vector("pytorch") @ embeddings.vector("deep learning") > embeddings.vector("pytorch") @ embeddings.vector("react")
+set_skill_embeddings(embeddings)
+semantic = match_jobs(["pytorch"], top_k=3)
+set_skill_embeddings(None)
+set_catalog(None)
+assert all("semantic_match" in job["score_breakdown"] for job in semantic)
+assert semantic[0]["score_breakdown"]["semantic_match"] > 0
+index = SemanticIndex(embeddings.vectors).build_ivf(n_lists=4)
+query = embeddings.vector("python")
+# Probing every list, IVF re-ranking finds the exact neighbours (up to ties)
+assert np.allclose(index.search(query, 5, mode="ivf", nprobe=4)[1], index.search(query, 5, mode="exact")[1])
+print(f"   ✓ pytorch without embeddings: {without}")
+print(f"   ✓ with embeddings: {[(j['role'], j['match_score'], j['score_breakdown']['semantic_match']) for j in semantic]}")
+
+# Test 14: Bulk matching equals one match_jobs call per candidate
+print("\n14. Testing Bulk Candidate Matching...")
+set_catalog(appended)
+pool_candidates = [["python", "sql"], ["React", "js"], [], ["rust", "k8s", "unknown skill"]]
+bulk = list(match_candidates(pool_candidates, [3, 0, 1, 5], top_k=3, parallel=False))
+assert bulk == [match_jobs(skills, exp, top_k=3) for skills, exp in zip(pool_candidates, [3, 0, 1, 5])]
+# Closing a parallel stream early (client gone) removes its shared snapshot directory
+from services.bulk_matcher import BULK_MATCH_SHARED_DIR
+existing = set(os.listdir(BULK_MATCH_SHARED_DIR))
+stream = match_candidates(pool_candidates * 4, 2, top_k=3, parallel=True)
+assert next(stream) == match_jobs(pool_candidates[0], 2, top_k=3)
+shared = set(os.listdir(BULK_MATCH_SHARED_DIR)) - existing
+assert shared
+stream.close()
+assert not shared & set(os.listdir(BULK_MATCH_SHARED_DIR))
+set_catalog(None)
+print(f"   ✓ {len(bulk)} candidates, best roles: {[matches[0]['role'] for matches in bulk]}")
+
+# Test 15: Indexed fuzzy skill matching
+print("\n15. Testing Fuzzy Skill Matching...")
+assert find_similar_skill("kubernetes", ["java", "kubernets"]) == "kubernets"
+assert find_similar_skill("java", ["javascript"]) is None
+assert find_similar_skill("node", ["done"]) is None
+fuzzy = analyze_skill_gap(["python", "kubernets", "javascript"], ["python", "kubernetes", "java"])
+assert [m["candidate_has"] for m in fuzzy["fuzzy_matches"]] == ["kubernets"] and fuzzy["critical_missing"] == ["java"]
+print(f"   ✓ Fuzzy matches: {fuzzy['fuzzy_matches']}")
+
+# Test 16: Learning paths follow the prerequisite graph
+print("\n16. Testing Learning Path Order...")
+path = [entry["skill"] for entry in generate_learning_path(["kubernetes", "react"], ["html"])]
+assert "docker" in path and "linux" in path and "html" not in path
+assert path.index("linux") < path.index("docker") < path.index("kubernetes")
+assert path.index("javascript") < path.index("react")
+assert generate_learning_path(["kubernetes", "react"], ["html"])[0]["required_for"]
+print(f"   ✓ Path: {path}")
+
+# Test 17: Learning plans reach the threshold at the fewest hours
+print("\n17. Testing Learning Plan Solver...")
+plan = plan_learning(["python"], ["ML Engineer"], threshold=65)
+assert plan["reachable"] and plan["optimal"] and plan["match_score"] >= 65
+after = [job for job in match_jobs(["python"] + plan["skills_to_learn"]) if job["role"] == plan["role"]]
+assert after[0]["match_score"] == plan["match_score"]
+assert plan["total_hours"] == sum(entry["estimated_hours"] for entry in plan["learning_path"])
+assert not plan_learning(["python"], ["ml engineer"], threshold=100)["reachable"]
+print(f"   ✓ {plan['role']}: learn {plan['skills_to_learn']} ({plan['total_hours']}h) -> {plan['match_score']}")
+
+# Test 18: Gap analyses are memoized per canonical skill-set pair
+print("\n18. Testing Skill Gap Cache...")
+first = analyze_skill_gap(["Python", "kubernets", "ReactJS"], ["react", "Kubernetes", "go", "python"])
+hits = gap_cache_stats()["hits"]
+again = analyze_skill_gap(["reactjs", "python", "kubernets"], ["python", "go", "React", "Kubernetes"])
+assert gap_cache_stats()["hits"] == hits + 1
+assert again["exact_matches"] == ["python", "React"] and again["critical_missing"] == first["critical_missing"]
+assert again["fuzzy_matches"] == first["fuzzy_matches"] and again["learning_path"] == first["learning_path"]
+print(f"   ✓ Cache: {gap_cache_stats()}")
+
+# Test 19: Upload probes count pages from the page tree only
+print("\n19. Testing PDF Page Count Probe...")
+from services.upload_ingest import probe_pdf
+
+
+def _probe_pages(pages_dict: bytes) -> int:
+    body = (b"%PDF-1.4\n1 0 obj << /Type /Catalog /Pages 2 0 R /Outlines 4 0 R >> endobj\n"
+            b"2 0 obj " + pages_dict + b" endobj\n"
+            b"3 0 obj << /Type /Page /Parent 2 0 R /Resources << /Font << /F1 5 0 R >> >> >> endobj\n"
+            b"4 0 obj << /Type /Outlines /Count 500 >> endobj\n%%EOF")
+    with tempfile.NamedTemporaryFile(suffix=".pdf") as f:
+        f.write(body)
+        f.flush()
+        return probe_pdf(f.name).page_count
+
+
+# A 500-entry outline does not count as pages, nor does /Count in a nested dictionary
+assert _probe_pages(b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>") == 1
+assert _probe_pages(b"<< /Count 2 /Resources << /Count 900 >> /Kids [3 0 R] /Type /Pages >>") == 2
+print("   ✓ Outline and nested /Count entries ignored")
+
+# Test 20: Batch uploads are limited per file and counted before extraction
+print("\n20. Testing Batch Upload Limits...")
+import io
+import zipfile
+from types import SimpleNamespace
+from services import batch_screening
+
+archive_bytes = io.BytesIO()
+with zipfile.ZipFile(archive_bytes, "w") as archive:
+    for i in range(3):
+        archive.writestr(f"resume_{i}.pdf", b"%PDF-1.4 resume")
+limit = batch_screening.MAX_BATCH_FILES
+batch_screening.MAX_BATCH_FILES = 2
+with tempfile.TemporaryDirectory() as workdir:
+    try:
+        batch_screening.spool_batch_uploads([SimpleNamespace(filename="all.zip", file=io.BytesIO(archive_bytes.getvalue()))], workdir)
+        raise AssertionError("3 zipped resumes passed a limit of 2")
+    except ValueError as e:
+        assert "Too many resumes" in str(e)
+    # Rejected from the member list, before anything was extracted
+    assert os.listdir(workdir) == []
+batch_screening.MAX_BATCH_FILES = limit
+with tempfile.TemporaryDirectory() as workdir:
+    oversized = SimpleNamespace(filename="big.pdf", file=io.BytesIO(b"%PDF-" + b"0" * batch_screening.UPLOAD_MAX_BYTES))
+    try:
+        batch_screening.spool_batch_uploads([oversized], workdir)
+        raise AssertionError("an oversized resume passed the per-file limit")
+    except ValueError as e:
+        assert "upload limit" in str(e)
+print("   ✓ Zip member count checked before extraction; single files use the per-file limit")
+
+# Test 21: PDF extraction stops at max_chars; serial and parallel agree
+print("\n21. Testing PDF Page Extraction...")
+from services.resume_parser import extract_pages
+
+
+def _make_pdf(pages) -> bytes:
+    """A minimal text PDF with one line per page"""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        stream = b"BT /F1 12 Tf 50 750 Td (" + text.encode() + b") Tj ET"
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects))
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [" + b" ".join(kids) + b"] /Count %d >>" % len(pages)
+    out, offsets = bytearray(b"%PDF-1.4\n"), []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(len(out)); out += b"%d 0 obj\n" % i + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1) + b"".join(b"%010d 00000 n \n" % o for o in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+with tempfile.NamedTemporaryFile(suffix=".pdf") as f:
+    f.write(_make_pdf([f"Page {i} python developer" for i in range(8)]))
+    f.flush()
+    serial = extract_pages(f.name, parallel=False)
+    parallel = extract_pages(f.name, parallel=True, workers=2)
+    assert serial["page_count"] == 8 and serial["pages_extracted"] == 8 and "Page 7" in serial["text"]
+    assert parallel["mode"] == "parallel" and parallel["text"] == serial["text"]
+    for use_pool in (False, True):
+        early = extract_pages(f.name, parallel=use_pool, workers=2, max_chars=30)
+        assert early["truncated"] and early["pages_extracted"] < 8 and len(early["text"]) == 30
+print(f"   ✓ {serial['page_count']} pages, serial == parallel; max_chars stops after {early['pages_extracted']} pages")
+
+# Test 22: ATS scoring on the process pool matches in-process scoring
+print("\n22. Testing ATS Scoring Across Processes...")
+import pickle
+from services.ats_engine import job_tfidf_weights, score_resume
+from services.resume_document import build_document
+from services.resume_parser import get_pdf_pool
+
+copy = pickle.loads(pickle.dumps(build_document(resume, skills=["python", "docker"])))
+assert copy.term_counts == build_document(resume).term_counts and copy.skills == ("python", "docker")
+prepared = prepare_job_description(job_desc)
+hits = job_cache_stats()["hits"]
+pooled_doc, pooled = get_pdf_pool().submit(score_resume, resume, ["python"], prepared, job_tfidf_weights(prepared)).result()
+assert pooled == calculate_detailed_ats(build_document(resume, skills=["python"]), prepared)
+# The job side came from this process's cache; the worker never prepared it
+assert pooled_doc.text == resume and job_cache_stats()["hits"] == hits
+print(f"   ✓ Documents round-trip through pickle; pooled ATS score {pooled['overall_score']} matches")
+
+# Test 23: Live re-scoring over the session WebSocket
+print("\n23. Testing ATS Session WebSocket...")
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+from main import app
+
+with TestClient(app) as client:
+    started = client.post("/ats/sessions", data={"job_description": job_desc, "resume_text": resume}).json()
+    with client.websocket_connect(f"/ats/sessions/{started['session_id']}/ws") as socket:
+        assert socket.receive_json()["overall_score"] == started["overall_score"]
+        socket.send_json({"edits": [{"section": "projects", "text": "Projects\nReact and Kubernetes dashboard"}]})
+        live = socket.receive_json()
+        socket.send_json({"edits": [{"text": "no section"}]})
+        assert "error" in socket.receive_json()
+    assert live["revision"] == started["revision"] + 1
+    current = client.get(f"/ats/sessions/{started['session_id']}").json()
+    assert (current["revision"], current["overall_score"]) == (live["revision"], live["overall_score"])
+    try:
+        with client.websocket_connect("/ats/sessions/missing/ws") as socket:
+            socket.receive_json()
+        raise AssertionError("unknown session was not closed")
+    except WebSocketDisconnect as e:
+        assert e.code == 4404
+print(f"   ✓ Socket re-scored {started['overall_score']} -> {live['overall_score']}; unknown sessions close with 4404")
+
+# Test 24: Catalog appends reject malformed rows with 400
+print("\n24. Testing Catalog Append Validation...")
+with TestClient(app) as client:
+    size = client.get("/jobs/catalog").json()["jobs"]
+    for bad_job in ({"role": "QA", "skills": ["selenium"], "salary_lpa": "abc"},
+                    {"role": "QA", "skills": ["selenium"]},
+                    {"role": "QA", "skills": 7, "salary_lpa": 9}):
+        response = client.post("/jobs/catalog/append", json={"jobs": [bad_job]})
+        assert response.status_code == 400, response.text
+    assert client.get("/jobs/catalog").json()["jobs"] == size
+print(f"   ✓ Malformed jobs rejected with 400: {response.json()['detail']}")
+
+# Test 25: spaCy loads lazily, tokenizer only, batched over documents
+print("\n25. Testing Lazy spaCy Tokenization...")
+import subprocess
+import sys
+from services.resume_parser import SPACY_EXCLUDE, get_nlp, tokenize_documents
+
+lazy = subprocess.run([sys.executable, "-c", "import sys, services.resume_parser; print('spacy' in sys.modules)"],
+                      capture_output=True, text=True, check=True)
+assert lazy.stdout.strip() == "False"
+nlp, blank = get_nlp(), get_nlp(force_blank=True)
+assert not set(nlp.pipe_names) & set(SPACY_EXCLUDE) and blank.pipe_names == []
+assert get_nlp() is nlp and get_nlp(force_blank=True) is blank
+tokens = tokenize_documents(["Built  APIs in Python.\n", "", "k8s & AWS"], force_blank=True)
+assert tokens == [["Built", "APIs", "in", "Python", "."], [], ["k8s", "&", "AWS"]] and tokenize_documents([]) == []
+print(f"   ✓ Not imported until used; pipeline {nlp.pipe_names or 'tokenizer only'}; {sum(map(len, tokens))} tokens batched")
+
 print("\n" + "=" * 60)
 print("ALL ALGORITHMS WORKING! ✓")
 print("=" * 60)